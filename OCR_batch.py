@@ -0,0 +1,290 @@
+"""OCR 일괄 처리 실행 파일
+
+디렉토리/글롭 패턴/목록 파일(manifest)로 받은 모든 입력의 페이지를 하나의 전역 작업
+목록으로 펼친 뒤, 하나의 워커 풀에서 처리합니다. 큰 페이지부터 먼저 실행하여
+(LPT 스케줄링) 마지막에 큰 페이지 하나만 남아 코어가 노는 시간을 줄입니다.
+실행 매니페스트(src/tesseract/run_manifest.py)에 기록된 입력/설정이 그대로인 페이지는
+다시 처리하지 않고 이전 결과 파일을 참조합니다.
+"""
+import os
+import glob
+import json
+import argparse
+import multiprocessing
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pdf2image import convert_from_path, pdfinfo_from_path  # type: ignore
+from PIL import Image  # type: ignore
+from src.tesseract.run_tesseract import (
+    process_single_image, process_cached_result, warm_up_ocr_backend, LANGUAGE, OCR_BACKEND, PREPROCESS_PIPELINE,
+)
+from src.tesseract.ocr_cache import hash_file
+from src.tesseract.artifacts import get_artifact_writer
+from src.tesseract.metrics import get_metrics_recorder, reset_metrics_recorder
+from src.tesseract.run_manifest import RunManifest, RUN_MANIFEST_PATH
+import OCR_main
+from OCR_main import (
+    TESSERACT_OCR_MODE, PDF_TO_IMG_DPI, ADAPTIVE_BASE_DPI,
+    get_output_directory, is_pdf_file, is_image_file, report_page_result,
+    make_adaptive_refiner, make_cache_key, get_ocr_cache, run_config, write_run_metrics,
+)
+
+#################
+# 상수
+#################
+BATCH_INPUTS = [
+    './assets',
+]
+MANIFEST_EXTENSIONS = ('.txt', '.json')
+PDF_POINTS_PER_INCH = 72
+
+# 실행 매니페스트: 변경되지 않은 입력/페이지는 건너뛰고 이전 결과를 참조 (None이면 사용 안 함)
+BATCH_MANIFEST_PATH = RUN_MANIFEST_PATH
+
+# --------------------------------------------------
+
+
+def read_manifest(manifest_path):
+    """목록 파일에서 입력 경로 목록을 읽음 (.txt: 한 줄에 하나, .json: 문자열 배열)"""
+    base_dir = os.path.dirname(os.path.abspath(manifest_path))
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        if manifest_path.lower().endswith('.json'):
+            entries = json.load(f)
+        else:
+            entries = [line.strip() for line in f if line.strip() and not line.startswith('#')]
+    return [entry if os.path.isabs(entry) else os.path.join(base_dir, entry) for entry in entries]
+
+
+def expand_inputs(inputs):
+    """디렉토리, 글롭 패턴, 목록 파일을 지원 파일 경로 목록으로 펼침 (중복 제거, 순서 유지)"""
+    files = []
+    for entry in inputs:
+        if os.path.isdir(entry):
+            for root, _, names in os.walk(entry):
+                files.extend(os.path.join(root, name) for name in sorted(names))
+        elif os.path.isfile(entry) and entry.lower().endswith(MANIFEST_EXTENSIONS):
+            files.extend(expand_inputs(read_manifest(entry)))
+        elif os.path.isfile(entry):
+            files.append(entry)
+        else:
+            files.extend(sorted(glob.glob(entry, recursive=True)))
+
+    seen = set()
+    result = []
+    for path in files:
+        key = os.path.abspath(path)
+        if key in seen or not (is_pdf_file(path) or is_image_file(path)):
+            continue
+        seen.add(key)
+        result.append(path)
+    return result
+
+
+def estimate_pdf_page_pixels(info, dpi):
+    """pdfinfo의 'Page size'(pt)로 래스터화 후 픽셀 수를 추정"""
+    try:
+        width_pt, _, height_pt = info["Page size"].split()[:3]
+        return float(width_pt) * float(height_pt) * (dpi / PDF_POINTS_PER_INCH) ** 2
+    except (KeyError, ValueError):
+        # 크기를 모르면 A4로 가정
+        return 595 * 842 * (dpi / PDF_POINTS_PER_INCH) ** 2
+
+
+def manifest_params(item, ocr_mode):
+    """매니페스트에 함께 남길 페이지 처리 설정"""
+    return {
+        'ocr_mode': ocr_mode,
+        'dpi': item['dpi'],
+        'adaptive_dpi': item['adaptive'],
+        'language': LANGUAGE,
+        'ocr_backend': OCR_BACKEND,
+        'preprocess': PREPROCESS_PIPELINE.signature(),
+    }
+
+
+def build_work_items(files, ocr_mode, manifest=None):
+    """모든 입력의 페이지를 (예상 비용 포함) 작업 목록으로 펼침
+
+    manifest가 있으면 파일 해시를 매니페스트로 구하고 (변경되지 않은 파일은 다시 읽지 않음),
+    기록된 PDF 정보(페이지 수/크기)가 있으면 pdfinfo 조회도 생략합니다.
+    """
+    adaptive = OCR_main.ADAPTIVE_DPI and ocr_mode == "image_to_data"
+    dpi = ADAPTIVE_BASE_DPI if adaptive else PDF_TO_IMG_DPI
+    cache = get_ocr_cache()
+    items = []
+
+    for file_path in files:
+        output_dir = get_output_directory(file_path, path_hash=True)
+        if manifest is not None:
+            source = manifest.file_digest(file_path)
+        else:
+            source = hash_file(file_path) if cache is not None else None
+
+        if is_pdf_file(file_path):
+            info = manifest.pdf_info(file_path) if manifest is not None else None
+            if info is None:
+                try:
+                    info = pdfinfo_from_path(file_path)
+                except Exception as e:
+                    print(f"❌ PDF 정보 조회 오류: {file_path} ({e})")
+                    continue
+                if manifest is not None:
+                    manifest.set_pdf_info(file_path, info)
+            pixels = estimate_pdf_page_pixels(info, dpi)
+            for page_number in range(1, int(info["Pages"]) + 1):
+                items.append({
+                    'file_path': file_path, 'output_dir': output_dir, 'page_number': page_number,
+                    'page_info': f"{os.path.basename(file_path)} 페이지 {page_number}",
+                    'file_prefix': f"page_{page_number:03d}", 'dpi': dpi, 'adaptive': adaptive,
+                    'cost': pixels,
+                    'cache_key': make_cache_key(source, ocr_mode, dpi, page_number) if source else None,
+                })
+        else:
+            try:
+                with Image.open(file_path) as image:
+                    pixels = image.size[0] * image.size[1]  # 헤더만 읽음
+            except Exception:
+                pixels = 0
+            filename = os.path.splitext(os.path.basename(file_path))[0]
+            items.append({
+                'file_path': file_path, 'output_dir': output_dir, 'page_number': None,
+                'page_info': filename, 'file_prefix': filename, 'dpi': None, 'adaptive': False,
+                'cost': pixels,
+                'cache_key': make_cache_key(source, ocr_mode) if source else None,
+            })
+
+    # 큰 페이지부터 처리 (LPT 스케줄링으로 전체 완료 시간 단축)
+    items.sort(key=lambda item: item['cost'], reverse=True)
+    return items
+
+
+def process_work_item(item, ocr_mode, keep_result=False):
+    """전역 작업 하나 처리: 캐시 확인 → (PDF면) 해당 페이지만 래스터화 → OCR"""
+    cache = get_ocr_cache()
+    if cache is not None and item['cache_key']:
+        cached = cache.get(item['cache_key'])
+        if cached is not None:
+            return process_cached_result(
+                cached, item['output_dir'], ocr_mode, item['page_info'], item['file_prefix'], keep_result,
+            )
+
+    options = {'keep_result': keep_result}
+    if cache is not None and item['cache_key']:
+        options.update(cache=cache, cache_key=item['cache_key'])
+
+    if item['page_number'] is None:
+        image = item['file_path']
+    else:
+        with get_metrics_recorder().stage("rasterize"):
+            pages = convert_from_path(
+                item['file_path'], dpi=item['dpi'], fmt='RGB',
+                first_page=item['page_number'], last_page=item['page_number'],
+            )
+        if not pages:
+            raise ValueError(f"페이지를 변환할 수 없습니다: {item['page_info']}")
+        image = pages[0]
+        if item['adaptive']:
+            options['refine_data'] = make_adaptive_refiner(item['file_path'], item['page_number'], image.size)
+
+    return process_single_image(image, item['output_dir'], ocr_mode, item['page_info'], item['file_prefix'], **options)
+
+
+def reuse_manifest_items(items, manifest, file_results):
+    """매니페스트에 같은 키로 기록된 페이지는 이전 결과로 채우고 처리할 작업만 반환"""
+    pending = []
+    for item in items:
+        page = manifest.lookup(item['file_path'], item['page_number'], item['cache_key'])
+        if page is None:
+            pending.append(item)
+            continue
+        result = manifest.reuse_result(page, item['page_info'], item['output_dir'])
+        report_page_result(item['page_info'], result)
+        file_results[item['file_path']].append(result)
+
+    for file_path, results in file_results.items():
+        if results:
+            print(f"♻️ {file_path}: {len(results)}개 페이지는 변경이 없어 이전 결과 재사용")
+    return pending
+
+
+def run_batch(inputs, ocr_mode=TESSERACT_OCR_MODE, max_workers=None, manifest_path=BATCH_MANIFEST_PATH):
+    """입력 목록 전체를 하나의 워커 풀로 처리하고 파일별 결과를 반환"""
+    max_workers = max_workers or max(1, multiprocessing.cpu_count())
+    files = expand_inputs(inputs)
+    if not files:
+        print("❌ 처리할 파일이 없습니다.")
+        return {}
+
+    manifest = RunManifest(manifest_path) if manifest_path else None
+    items = build_work_items(files, ocr_mode, manifest)
+    file_results = {file_path: [] for file_path in files}
+    if manifest is not None:
+        items = reuse_manifest_items(items, manifest, file_results)
+    print(f"📚 {len(files)}개 파일, {len(items)}개 페이지를 하나의 작업 목록으로 처리 (최대 {max_workers} 스레드)")
+
+    with ThreadPoolExecutor(max_workers=max_workers, initializer=warm_up_ocr_backend) as executor:
+        future_to_item = {executor.submit(process_work_item, item, ocr_mode): item for item in items}
+        for future in as_completed(future_to_item):
+            item = future_to_item[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                result = {'success': False, 'error': str(e), 'page_info': item['page_info']}
+            report_page_result(item['page_info'], result)
+            file_results[item['file_path']].append(result)
+            if manifest is not None:
+                manifest.record(item['file_path'], item['page_number'], item['cache_key'],
+                                manifest_params(item, ocr_mode), result)
+
+    get_artifact_writer().flush()
+    if manifest is not None:
+        print(f"🗂️ 실행 매니페스트: {manifest.summary()} ({manifest.save()})")
+    return file_results
+
+
+def ocr_batch_main(inputs=None, ocr_mode=TESSERACT_OCR_MODE, max_workers=None, manifest_path=BATCH_MANIFEST_PATH):
+    """일괄 처리 메인 함수"""
+    start_time = datetime.now()
+    print("=== OCR 일괄 처리 시작 ===")
+    reset_metrics_recorder(run_config(ocr_mode, max_workers))
+
+    file_results = run_batch(inputs or BATCH_INPUTS, ocr_mode, max_workers, manifest_path)
+
+    elapsed = (datetime.now() - start_time).total_seconds()
+    page_total = sum(len(results) for results in file_results.values())
+    reused_total = sum(1 for results in file_results.values() for r in results if r.get('manifest_reused'))
+    processed_total = page_total - reused_total
+    success_total = 0
+    print("\n=== 파일별 결과 ===")
+    for file_path, results in file_results.items():
+        success_count = sum(1 for r in results if r['success'])
+        success_total += success_count
+        print(f"{'✅' if success_count else '❌'} {file_path}: {success_count}/{len(results)} 페이지 성공")
+
+    print(f"\n=== 모든 OCR 일괄 처리 완료 ===")
+    print(f"⏱️ 총 소요시간: {elapsed:.2f}초")
+    print(f"📄 페이지: 처리 {processed_total} / 매니페스트 재사용 {reused_total} ({success_total}/{page_total} 성공)")
+    if elapsed > 0 and processed_total:
+        # 처리량은 실제로 처리한 페이지만으로 계산 (재사용 페이지는 OCR을 거치지 않음)
+        print(f"🚀 처리 속도: {processed_total / elapsed:.2f} 페이지/초")
+    cache = get_ocr_cache()
+    if cache is not None:
+        print(f"💾 OCR 캐시: {cache.summary()}")
+    write_run_metrics()
+    return file_results
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="디렉토리/글롭/목록 파일 단위 OCR 일괄 처리")
+    parser.add_argument('inputs', nargs='*', help="입력 디렉토리, 글롭 패턴(예: 'assets/*.pdf'), 목록 파일(.txt/.json)")
+    parser.add_argument('--mode', default=TESSERACT_OCR_MODE, choices=OCR_main.TESSERACT_OCR_MODE_LIST)
+    parser.add_argument('--workers', type=int, default=None, help="워커 스레드 수 (기본: CPU 코어 수)")
+    parser.add_argument('--manifest', default=BATCH_MANIFEST_PATH,
+                        help=f"실행 매니페스트 경로 (기본: {BATCH_MANIFEST_PATH})")
+    parser.add_argument('--no-manifest', action='store_true', help="매니페스트 없이 모든 페이지를 다시 처리")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    ocr_batch_main(args.inputs, args.mode, args.workers, None if args.no_manifest else args.manifest)
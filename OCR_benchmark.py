@@ -0,0 +1,238 @@
+"""OCR 벤치마크 실행 파일
+
+assets/의 파일과 재현 가능한 합성 페이지(이미지만 있는 PDF)로 DPI/워커 수/OCR 모드 조합을 실행하여
+조합별 페이지당 소요 시간, 단계별 시간 합계, 최대 메모리를 측정합니다.
+저장해 둔 기준(baseline) 결과와 비교하여 허용 범위보다 느려진 조합이 있으면 종료 코드 1을 반환합니다.
+
+    python OCR_benchmark.py --dpi 150 300 --workers 1 4 --synthetic 4
+    python OCR_benchmark.py --save-baseline benchmarks/baseline.json
+    python OCR_benchmark.py --baseline benchmarks/baseline.json
+"""
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import platform
+import argparse
+import tempfile
+import itertools
+import multiprocessing
+from datetime import datetime
+from PIL import Image, ImageDraw, ImageFont  # type: ignore
+import OCR_main
+from OCR_main import TESSERACT_OCR_MODE_LIST, process_file, run_config
+from src.tesseract.metrics import reset_metrics_recorder
+
+#################
+# 상수
+#################
+BENCH_INPUTS = [
+    './assets/인보이스.pdf',
+    './assets/car_numberpad.png',
+]
+BENCH_DPI_LIST = [150, 300]
+BENCH_WORKER_LIST = [1, max(1, multiprocessing.cpu_count())]
+BENCH_MODES = TESSERACT_OCR_MODE_LIST
+BENCH_REPEAT = 1
+BENCH_OUTPUT_DIR = "benchmarks"
+BENCH_REGRESSION_TOLERANCE = 0.15  # 기준보다 페이지당 시간이 15% 넘게 늘면 회귀로 판단
+
+# 합성 페이지 설정 (같은 seed면 같은 PDF가 만들어짐)
+SYNTHETIC_PAGES = 4
+SYNTHETIC_SEED = 1234
+SYNTHETIC_DPI = 150
+SYNTHETIC_PAGE_INCHES = (8.5, 11)
+SYNTHETIC_FONT_SIZE = 24
+SYNTHETIC_VOCABULARY = (
+    "INVOICE", "SHIPPER", "CONSIGNEE", "QUANTITY", "UNIT", "PRICE", "TOTAL", "WEIGHT", "ORIGIN",
+    "PACKAGES", "CURRENCY", "USD", "EACH", "KG", "DATE", "NO", "TERMS", "PAYMENT", "CUSTOMER",
+)
+
+# --------------------------------------------------
+
+
+def load_font(size=SYNTHETIC_FONT_SIZE):
+    """크기를 지정할 수 있는 기본 글꼴 (Pillow 10.1 미만이면 고정 크기 기본 글꼴)"""
+    try:
+        return ImageFont.load_default(size=size)
+    except TypeError:
+        return ImageFont.load_default()
+
+
+def make_synthetic_page(rng, dpi=SYNTHETIC_DPI, font=None):
+    """단어 줄과 표 테두리가 있는 합성 페이지 이미지 한 장"""
+    font = font or load_font()
+    width, height = (int(inches * dpi) for inches in SYNTHETIC_PAGE_INCHES)
+    image = Image.new('RGB', (width, height), 'white')
+    draw = ImageDraw.Draw(image)
+
+    margin = dpi // 2
+    line_height = int(SYNTHETIC_FONT_SIZE * 1.6)
+    y = margin
+    while y < height - margin - line_height:
+        words = []
+        for _ in range(rng.randint(3, 8)):
+            word = rng.choice(SYNTHETIC_VOCABULARY)
+            words.append(word if rng.random() < 0.7 else f"{rng.randint(1, 99999):,}")
+        draw.text((margin, y), " ".join(words), fill='black', font=font)
+        if rng.random() < 0.15:
+            # 표처럼 보이도록 가로줄 추가
+            draw.line((margin, y + line_height - 4, width - margin, y + line_height - 4), fill='black', width=2)
+        y += line_height
+    return image
+
+
+def make_synthetic_pdf(path, pages=SYNTHETIC_PAGES, seed=SYNTHETIC_SEED, dpi=SYNTHETIC_DPI):
+    """텍스트 레이어 없이 이미지로만 된 합성 PDF 생성 (래스터화+OCR 경로 측정용)"""
+    rng = random.Random(seed)
+    font = load_font()
+    images = [make_synthetic_page(rng, dpi, font) for _ in range(pages)]
+    images[0].save(path, save_all=True, append_images=images[1:], resolution=dpi)
+    return path
+
+
+def case_key(dpi, workers, ocr_mode):
+    return f"dpi={dpi},workers={workers},mode={ocr_mode}"
+
+
+def run_case(inputs, dpi, workers, ocr_mode, output_root, repeat=BENCH_REPEAT):
+    """조합 하나를 repeat번 실행하여 가장 빠른 실행의 지표를 반환"""
+    best = None
+    for _ in range(repeat):
+        OCR_main.PDF_TO_IMG_DPI = dpi
+        recorder = reset_metrics_recorder(run_config(ocr_mode, workers))
+        start = time.perf_counter()
+        for file_path in inputs:
+            process_file(file_path, ocr_mode, workers, output_base_dir=output_root)
+        elapsed = time.perf_counter() - start
+
+        summary = recorder.summary()
+        pages = summary['pages'] or 1
+        case = {
+            'key': case_key(dpi, workers, ocr_mode),
+            'dpi': dpi,
+            'workers': workers,
+            'ocr_mode': ocr_mode,
+            'elapsed': round(elapsed, 4),
+            'pages': summary['pages'],
+            'success': summary['success'],
+            'seconds_per_page': round(elapsed / pages, 4),
+            'stage_totals': summary['stage_totals'],
+            'peak_rss_mb': summary['peak_rss_mb'],
+        }
+        if best is None or case['elapsed'] < best['elapsed']:
+            best = case
+    return best
+
+
+def compare_to_baseline(cases, baseline, tolerance=BENCH_REGRESSION_TOLERANCE):
+    """기준 결과와 조합별 페이지당 시간을 비교하여 [(키, 기준, 현재, 비율, 회귀 여부)] 반환"""
+    baseline_cases = {case['key']: case for case in baseline.get('cases', [])}
+    rows = []
+    for case in cases:
+        base = baseline_cases.get(case['key'])
+        if base is None or not base.get('seconds_per_page'):
+            continue
+        ratio = case['seconds_per_page'] / base['seconds_per_page']
+        rows.append((case['key'], base['seconds_per_page'], case['seconds_per_page'], ratio, ratio > 1 + tolerance))
+    return rows
+
+
+def run_benchmark(inputs, dpi_list, worker_list, modes, synthetic_pages, seed, repeat, text_layer=True,
+                  keep_output=False):
+    """모든 조합을 실행하고 결과 문서를 반환"""
+    work_dir = tempfile.mkdtemp(prefix="ocr_bench_")
+    inputs = [path for path in inputs if os.path.exists(path)]
+    if synthetic_pages:
+        inputs.append(make_synthetic_pdf(os.path.join(work_dir, f"synthetic_{seed}.pdf"), synthetic_pages, seed))
+
+    # 측정이 캐시 적중에 좌우되지 않도록 캐시는 끔
+    OCR_main.OCR_CACHE_ENABLED = False
+    OCR_main.TEXT_LAYER_ENABLED = text_layer
+    output_root = os.path.join(work_dir, "output")
+
+    cases = []
+    try:
+        for dpi, workers, ocr_mode in itertools.product(dpi_list, worker_list, modes):
+            print(f"\n🏁 벤치마크: {case_key(dpi, workers, ocr_mode)}")
+            case = run_case(inputs, dpi, workers, ocr_mode, output_root, repeat)
+            cases.append(case)
+            print(f"🏁 {case['key']}: {case['elapsed']:.2f}초, 페이지당 {case['seconds_per_page']:.3f}초")
+    finally:
+        if keep_output:
+            print(f"📁 벤치마크 출력 보존: {work_dir}")
+        else:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    return {
+        'started': datetime.now().isoformat(timespec='seconds'),
+        'host': {
+            'python': platform.python_version(), 'platform': platform.platform(),
+            'cpu_count': multiprocessing.cpu_count(),
+        },
+        'inputs': [os.path.basename(path) for path in inputs],
+        'synthetic': {'pages': synthetic_pages, 'seed': seed},
+        'text_layer': text_layer,
+        'cases': cases,
+    }
+
+
+def print_comparison(rows, tolerance=BENCH_REGRESSION_TOLERANCE):
+    print(f"\n=== 기준 대비 페이지당 시간 (허용 +{tolerance * 100:.0f}%) ===")
+    for key, base, current, ratio, regressed in rows:
+        print(f"{'❌' if regressed else '✅'} {key}: {base:.3f}s → {current:.3f}s ({(ratio - 1) * 100:+.1f}%)")
+
+
+def save_json(document, path):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(document, f, ensure_ascii=False, indent=2)
+    return path
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="DPI/워커 수/OCR 모드 조합별 OCR 벤치마크")
+    parser.add_argument('inputs', nargs='*', default=BENCH_INPUTS, help="벤치마크 입력 파일 (기본: assets의 샘플)")
+    parser.add_argument('--dpi', type=int, nargs='+', default=BENCH_DPI_LIST)
+    parser.add_argument('--workers', type=int, nargs='+', default=BENCH_WORKER_LIST)
+    parser.add_argument('--modes', nargs='+', default=BENCH_MODES, choices=TESSERACT_OCR_MODE_LIST)
+    parser.add_argument('--synthetic', type=int, default=SYNTHETIC_PAGES, help="합성 PDF 페이지 수 (0이면 생성 안 함)")
+    parser.add_argument('--seed', type=int, default=SYNTHETIC_SEED)
+    parser.add_argument('--repeat', type=int, default=BENCH_REPEAT, help="조합별 반복 횟수 (가장 빠른 실행 사용)")
+    parser.add_argument('--no-text-layer', action='store_true', help="PDF 텍스트 레이어를 쓰지 않고 모두 OCR")
+    parser.add_argument('--baseline', help="비교할 기준 결과 JSON")
+    parser.add_argument('--save-baseline', help="이번 결과를 기준으로 저장할 경로")
+    parser.add_argument('--tolerance', type=float, default=BENCH_REGRESSION_TOLERANCE)
+    parser.add_argument('--keep-output', action='store_true', help="OCR 결과/부산물 임시 디렉토리를 지우지 않음")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    document = run_benchmark(
+        args.inputs, args.dpi, args.workers, args.modes, args.synthetic, args.seed, args.repeat,
+        text_layer=not args.no_text_layer, keep_output=args.keep_output,
+    )
+    result_path = save_json(
+        document, os.path.join(BENCH_OUTPUT_DIR, f"bench_{datetime.now().strftime('%y%m%d_%H%M%S')}.json"),
+    )
+    print(f"\n📊 벤치마크 결과 저장: {result_path}")
+
+    if args.save_baseline:
+        print(f"📌 기준 결과 저장: {save_json(document, args.save_baseline)}")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        rows = compare_to_baseline(document['cases'], baseline, args.tolerance)
+        print_comparison(rows, args.tolerance)
+        if any(row[4] for row in rows):
+            print("❌ 성능 회귀가 있습니다.")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
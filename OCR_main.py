@@ -1,10 +1,33 @@
 """OCR 메인 실행 파일"""
 import os
+import json
+import hashlib
 import multiprocessing
+from functools import partial
 from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from pdf2image import convert_from_path  # type: ignore
-from src.tesseract.run_tesseract import process_single_image
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed, wait, FIRST_COMPLETED
+from pdf2image import convert_from_path, pdfinfo_from_path  # type: ignore
+from PIL import Image  # type: ignore
+from src.tesseract.run_tesseract import (
+    process_single_image, process_cached_result, process_page_buffer, warm_up_ocr_backend, ocr_region_data,
+    save_ocr_result,
+    LANGUAGE, OCR_BACKEND, PREPROCESS_PIPELINE, PAGE_TRIAGE_ENABLED, TILED_OCR_ENABLED, MULTIPASS_ENABLED,
+)
+from src.tesseract.multipass import SECOND_PASS_LANGUAGE
+from src.tesseract.page_buffer import PageBufferPool, rasterize_pdf_page_into, PAGE_BUFFER_GRAY
+from src.tesseract.adaptive_dpi import refine_low_confidence_regions, ADAPTIVE_RETRY_PSM, ADAPTIVE_BASE_DPI
+from src.tesseract.ocr_cache import OCRResultCache, hash_file
+from src.tesseract.artifacts import get_artifact_writer
+from src.tesseract.ocr_data import data_to_text
+from src.tesseract.metrics import (
+    StageTimer, get_metrics_recorder, reset_metrics_recorder, format_stage_totals, METRICS_ENABLED,
+)
+from src.tesseract.pdf_text_layer import (
+    read_text_layer, is_usable_text_layer, list_image_pages, extract_text_layer_page,
+)
+from src.tesseract.roi_template import (
+    load_template, submit_template_fields, submit_pdf_template_fields, collect_fields, template_area_ratio,
+)
 
 #################
 # 상수
@@ -15,6 +38,35 @@ TESSERACT_OCR_MODE = TESSERACT_OCR_MODE_LIST[1]
 PDF_TO_IMG_DPI = 1200
 MAX_WORKERS = 4  # 병렬 처리 최대 스레드 수
 
+# PDF 페이지를 한 장씩 변환하며 OCR 워커에 바로 넘길지 여부
+# (True면 메모리 사용량이 페이지 수가 아닌 워커 수에 비례)
+PDF_STREAMING = True
+PDF_QUEUE_SIZE_PER_WORKER = 1  # 워커당 미리 변환해 둘 대기 페이지 수
+
+# 프로세스 워커 모드: PDF 페이지를 공유 메모리 페이지 버퍼에 바로 래스터화하고(pdftoppm → 버퍼)
+# 프로세스 풀의 워커가 버퍼에 복사 없이 붙어 OCR (스레드 대신 프로세스 병렬, 페이지 pickle 없음)
+# (버퍼 형식/백엔드는 src/tesseract/page_buffer.py)
+PDF_PROCESS_WORKERS = False
+
+# 다중 해상도 모드: ADAPTIVE_BASE_DPI로 전체 OCR 후 신뢰도가 낮은 줄만
+# PDF_TO_IMG_DPI로 다시 래스터화하여 재인식 (image_to_data 모드 전용)
+ADAPTIVE_DPI = False  # 기준 DPI는 src/tesseract/adaptive_dpi.py의 ADAPTIVE_BASE_DPI
+
+# PDF 텍스트 레이어: 글자가 들어 있는 디지털 PDF 페이지는 래스터화/OCR 없이 단어와 좌표를 바로 읽음
+# (텍스트 레이어가 없는 페이지만 OCR, 이미지가 섞인 페이지는 이미지 영역만 OCR)
+TEXT_LAYER_ENABLED = True
+
+# OCR 결과 디스크 캐시 (같은 입력/설정이면 래스터화와 OCR을 생략)
+OCR_CACHE_ENABLED = True
+
+# 필드 템플릿 모드: 템플릿 JSON을 지정하면 페이지 전체 대신 템플릿 필드 영역만 OCR
+# (형식은 src/tesseract/roi_template.py 참조, 결과는 페이지별 page_XXX_fields.json)
+ROI_TEMPLATE_PATH = None
+
+# 실행 지표(단계별 시간/메모리) 파일 저장 위치 (run_metrics_YYMMDD_HHMMSS.json)
+METRICS_DIR = "test_result"
+OUTPUT_PATH_HASH_LENGTH = 8  # 일괄 처리 출력 디렉토리 이름에 붙이는 경로 해시 길이
+
 FILES_LIST = [
     ('./assets/인보이스.pdf'),
     # ('./assets/car_numberpad.png'),
@@ -22,11 +74,48 @@ FILES_LIST = [
 
 # --------------------------------------------------
 
+_ocr_cache = None
+
+
+def get_ocr_cache():
+    """OCR 결과 캐시를 반환 (비활성화 상태면 None)"""
+    global _ocr_cache
+    if not OCR_CACHE_ENABLED:
+        return None
+    if _ocr_cache is None:
+        _ocr_cache = OCRResultCache()
+    return _ocr_cache
+
+
+def make_cache_key(source, ocr_mode, dpi=None, page_number=None):
+    """입력 해시와 OCR 설정으로 캐시 키 생성"""
+    return OCRResultCache.make_key(
+        source,
+        page=page_number,
+        dpi=dpi,
+        adaptive=ADAPTIVE_DPI and dpi is not None,
+        preprocess=PREPROCESS_PIPELINE.signature(),
+        page_triage=PAGE_TRIAGE_ENABLED,
+        tiled=TILED_OCR_ENABLED,
+        raster="buffer_gray" if PDF_PROCESS_WORKERS and PAGE_BUFFER_GRAY and dpi is not None else None,
+        multipass=SECOND_PASS_LANGUAGE if MULTIPASS_ENABLED else None,
+        lang=LANGUAGE,
+        backend=OCR_BACKEND,
+        ocr_mode=ocr_mode,
+    )
+
+
+def get_output_directory(file_path, base_dir="test_result", path_hash=False):
+    """실행 시간과 파일명을 기반으로 출력 디렉토리 생성
 
-def get_output_directory(file_path, base_dir="test_result"):
-    """실행 시간과 파일명을 기반으로 출력 디렉토리 생성"""
+    path_hash가 True면 전체 경로의 짧은 해시를 붙여, 다른 폴더에 있는 같은 이름의 입력이
+    같은 디렉토리에 결과를 덮어쓰지 않도록 합니다. (일괄 처리용)
+    """
     timestamp = datetime.now().strftime("%y%m%d_%H%M%S")
     filename = os.path.splitext(os.path.basename(file_path))[0]
+    if path_hash:
+        digest = hashlib.sha1(os.path.abspath(file_path).encode('utf-8')).hexdigest()[:OUTPUT_PATH_HASH_LENGTH]
+        filename = f"{filename}_{digest}"
     return os.path.join(base_dir, f"{timestamp}_{filename}")
 
 
@@ -45,7 +134,8 @@ def convert_pdf_to_images(pdf_path, dpi=PDF_TO_IMG_DPI):
     """PDF를 이미지 리스트로 변환"""
     try:
         print(f"PDF 변환 중: {pdf_path}")
-        pages = convert_from_path(pdf_path, dpi=dpi, fmt='RGB')
+        with get_metrics_recorder().stage("rasterize"):
+            pages = convert_from_path(pdf_path, dpi=dpi, fmt='RGB')
         print(f"총 {len(pages)} 페이지 발견")
         return pages
     except Exception as e:
@@ -53,52 +143,346 @@ def convert_pdf_to_images(pdf_path, dpi=PDF_TO_IMG_DPI):
         return None
 
 
-def process_pdf_parallel(pdf_path, output_dir, ocr_mode, max_workers=4):
-    """PDF 페이지들을 병렬로 처리하는 함수"""
-    print("📄 PDF 파일로 인식됨")
-    
-    # PDF를 이미지로 변환
-    images = convert_pdf_to_images(pdf_path)
-    if images is None:
+def get_pdf_page_count(pdf_path):
+    """PDF 파일의 페이지 수를 반환 (래스터화 없이 pdfinfo만 사용)"""
+    try:
+        info = pdfinfo_from_path(pdf_path)
+        return int(info["Pages"])
+    except Exception as e:
+        print(f"PDF 정보 조회 오류: {e}")
         return None
-    
-    print(f"🔄 {len(images)} 페이지를 병렬 처리 시작 (최대 {max_workers} 스레드)")
-    
-    # 병렬 처리를 위한 작업 목록 생성
-    tasks = []
-    for idx, image in enumerate(images, 1):
+
+
+def iter_pdf_pages(pdf_path, dpi=PDF_TO_IMG_DPI, skip_pages=()):
+    """PDF 페이지를 한 장씩 변환하여 (페이지 번호, 이미지)로 내보내는 제너레이터
+
+    convert_from_path의 first_page/last_page로 한 번에 한 페이지만 래스터화하므로
+    전체 페이지를 메모리에 올리지 않습니다. skip_pages의 페이지는 변환하지 않습니다.
+    """
+    page_count = get_pdf_page_count(pdf_path)
+    if page_count is None:
+        return
+    print(f"총 {page_count} 페이지 발견 (스트리밍 변환)")
+
+    for page_number in range(1, page_count + 1):
+        if page_number in skip_pages:
+            continue
+        try:
+            with get_metrics_recorder().stage("rasterize"):
+                pages = convert_from_path(
+                    pdf_path, dpi=dpi, fmt='RGB',
+                    first_page=page_number, last_page=page_number,
+                )
+        except Exception as e:
+            print(f"PDF 변환 오류 (페이지 {page_number}): {e}")
+            continue
+        if pages:
+            yield page_number, pages[0]
+
+
+def report_page_result(page_info, result):
+    """페이지 처리 결과를 출력하고 실행 지표에 기록하는 함수"""
+    get_metrics_recorder().record_page(page_info, result)
+    if result['success']:
+        print(f"✅ {page_info} 처리 완료:")
+        print(f"   📄 OCR 결과: {result['output_file']}")
+        if result.get('cache_hit'):
+            print("   💾 캐시 적중: 래스터화/OCR 생략")
+        if result.get('manifest_reused'):
+            print("   ♻️ 실행 매니페스트: 변경이 없어 이전 결과 재사용")
+        if result.get('text_layer'):
+            print("   📝 텍스트 레이어 사용: 래스터화/OCR 생략")
+        if result.get('blank_page'):
+            print("   📭 빈 페이지: 전처리/OCR 생략")
+        triage = result.get('page_triage') or {}
+        if triage.get('rotation') or triage.get('skew'):
+            print(f"   🔄 페이지 보정: 방향 {triage['rotation']}°, 기울기 {triage['skew']}°")
+        if result.get('image_regions'):
+            print(f"   🖼️ 이미지 영역 OCR: {result['image_regions']}개")
+        if result.get('original_image'):
+            print(f"   🖼️ 원본 이미지: {result['original_image']}")
+        if result.get('boxed_image'):
+            print(f"   📦 바운딩 박스 이미지: {result['boxed_image']}")
+        if result.get('processed_image'):
+            print(f"   🔧 처리된 이미지: {result['processed_image']}")
+        if result.get('tiles'):
+            print(f"   🧩 타일 OCR: {result['tiles']}개 타일 병렬 처리")
+        second_pass = result.get('second_pass') or {}
+        if second_pass.get('second_pass_lines'):
+            print(f"   🔁 2차 OCR: {second_pass['second_pass_lines']}/{second_pass['lines']}줄 "
+                  f"(한글 {second_pass['hangul_lines']}줄, 페이지 면적 {second_pass['area_ratio'] * 100:.1f}%, "
+                  f"단어 {second_pass['changed_words']}개 교체/추가)")
+        if result.get('refined_regions'):
+            print(f"   🔍 고해상도 재인식 영역: {result['refined_regions']}개")
+    else:
+        print(f"❌ {page_info} 처리 실패: {result['error']}")
+
+
+def make_adaptive_refiner(pdf_path, page_number, image_size):
+    """페이지별 다중 해상도 보정 함수를 생성 (process_single_image의 refine_data용)"""
+    return partial(
+        refine_low_confidence_regions,
+        pdf_path=pdf_path,
+        page_number=page_number,
+        ocr_region=partial(ocr_region_data, psm=ADAPTIVE_RETRY_PSM),
+        base_dpi=ADAPTIVE_BASE_DPI,
+        high_dpi=PDF_TO_IMG_DPI,
+        image_size=image_size,
+    )
+
+
+def collect_page_result(future, page_info, results):
+    """완료된 Future의 결과를 results에 추가하는 함수"""
+    try:
+        result = future.result()
+        report_page_result(page_info, result)
+        results.append(result)
+    except Exception as e:
+        print(f"❌ {page_info} 처리 중 예외 발생: {e}")
+        results.append({'success': False, 'error': str(e), 'page_info': page_info})
+
+
+def run_pages_bounded(executor, pages, output_dir, ocr_mode, max_pending, page_options=None):
+    """(페이지 번호, 이미지) 이터러블을 제한된 대기열로 워커에 제출하는 함수
+
+    대기 중인 작업이 max_pending개에 도달하면 하나가 끝날 때까지 다음 페이지의
+    래스터화를 미루므로, 메모리에 동시에 존재하는 페이지 수가 제한됩니다.
+    page_options(페이지 번호, 이미지)가 주어지면 반환한 dict를
+    process_single_image의 추가 인자로 전달합니다.
+    """
+    results = []
+    future_to_page = {}
+
+    for idx, image in pages:
         page_info = f"페이지 {idx}"
         file_prefix = f"page_{idx:03d}"
-        tasks.append((image, output_dir, ocr_mode, page_info, file_prefix))
-    
-    # 병렬 처리 실행
+        options = page_options(idx, image) if page_options else {}
+        future = executor.submit(process_single_image, image, output_dir, ocr_mode, page_info, file_prefix, **options)
+        future_to_page[future] = page_info
+        del image  # 제출한 뒤에는 워커만 페이지를 참조하도록 함
+
+        # 대기열이 가득 차면 완료된 작업이 생길 때까지 대기
+        while len(future_to_page) >= max_pending:
+            done, _ = wait(future_to_page, return_when=FIRST_COMPLETED)
+            for future in done:
+                collect_page_result(future, future_to_page.pop(future), results)
+
+    # 남은 작업 처리
+    for future in as_completed(future_to_page):
+        collect_page_result(future, future_to_page[future], results)
+
+    return results
+
+
+def process_pdf_shared_buffers(pdf_path, output_dir, ocr_mode, dpi, max_workers=4, skip_pages=(),
+                               cache_keys=None, adaptive=False):
+    """PDF 페이지를 공유 메모리 버퍼에 래스터화하고 프로세스 풀에서 OCR하는 함수
+
+    페이지 버퍼는 워커 수 × (1 + PDF_QUEUE_SIZE_PER_WORKER)개를 재사용하며, 빈 버퍼가 없으면
+    끝난 페이지를 수거할 때까지 다음 페이지 래스터화를 미룹니다. 워커에는 버퍼 이름과 모양만 넘기고,
+    캐시 저장은 워커가 돌려준 OCR 결과로 이 프로세스에서 합니다.
+    """
+    page_count = get_pdf_page_count(pdf_path)
+    if page_count is None:
+        return []
+    cache = get_ocr_cache()
+    cache_keys = cache_keys or {}
+    slots = max_workers * (1 + PDF_QUEUE_SIZE_PER_WORKER)
+    print(f"🔄 공유 메모리 프로세스 처리 시작 (최대 {max_workers} 프로세스, 페이지 버퍼 {slots}개)")
+    os.makedirs(output_dir, exist_ok=True)
+
     results = []
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        # 모든 작업 제출
-        future_to_page = {
-            executor.submit(process_single_image, *task): task[3] 
-            for task in tasks
-        }
-        
-        # 완료된 작업들 처리
-        for future in as_completed(future_to_page):
-            page_info = future_to_page[future]
+    pending = {}
+
+    def collect(future):
+        page_number, buffer = pending.pop(future)
+        pool.release(buffer)
+        page_info = f"페이지 {page_number}"
+        try:
+            result = future.result()
+        except Exception as e:
+            result = {'success': False, 'error': str(e), 'page_info': page_info}
+        ocr_result = result.pop('ocr_result', None)
+        if cache is not None and result['success'] and page_number in cache_keys and ocr_result is not None:
+            cache.put(cache_keys[page_number], {'ocr_mode': ocr_mode, 'result': ocr_result})
+        report_page_result(page_info, result)
+        results.append(result)
+
+    # spawn: 부모의 스레드(부산물 저장 등) 상태를 물려받지 않도록 새 인터프리터로 워커 시작
+    context = multiprocessing.get_context("spawn")
+    with PageBufferPool(slots) as pool, \
+            ProcessPoolExecutor(max_workers=max_workers, mp_context=context, initializer=warm_up_ocr_backend) as executor:
+        for page_number in range(1, page_count + 1):
+            if page_number in skip_pages:
+                continue
+            while not pool.available():
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    collect(future)
             try:
-                result = future.result()
-                if result['success']:
-                    print(f"✅ {page_info} 처리 완료:")
-                    print(f"   📄 OCR 결과: {result['output_file']}")
-                    print(f"   🖼️ 원본 이미지: {result['original_image']}")
-                    if result.get('boxed_image'):
-                        print(f"   📦 바운딩 박스 이미지: {result['boxed_image']}")
-                    print(f"   🔧 처리된 이미지: {result['processed_image']}")
-                else:
-                    print(f"❌ {page_info} 처리 실패: {result['error']}")
-                results.append(result)
+                with get_metrics_recorder().stage("rasterize"):
+                    buffer = rasterize_pdf_page_into(pool, pdf_path, page_number, dpi)
             except Exception as e:
-                print(f"❌ {page_info} 처리 중 예외 발생: {e}")
-                results.append({'success': False, 'error': str(e), 'page_info': page_info})
-    
+                print(f"PDF 변환 오류 (페이지 {page_number}): {e}")
+                continue
+            refine_data = None
+            if adaptive:
+                refine_data = make_adaptive_refiner(pdf_path, page_number, (buffer.shape[1], buffer.shape[0]))
+            future = executor.submit(
+                process_page_buffer, buffer.describe(), output_dir, ocr_mode,
+                f"페이지 {page_number}", f"page_{page_number:03d}", refine_data,
+            )
+            pending[future] = (page_number, buffer)
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                collect(future)
+    return results
+
+
+def process_text_layer_page(pdf_path, page_number, page_layer, output_dir, ocr_mode, dpi, has_images):
+    """텍스트 레이어 페이지 하나의 결과 파일 작성 (이미지 영역이 있으면 그 영역만 OCR)"""
+    page_info = f"페이지 {page_number}"
+    timer = StageTimer()
+    try:
+        ocr_region = partial(ocr_region_data, psm=ADAPTIVE_RETRY_PSM)
+        with timer.stage("text_layer"):
+            data, image_regions = extract_text_layer_page(
+                pdf_path, page_number, page_layer, dpi, has_images, ocr_region,
+            )
+            result = data if ocr_mode == "image_to_data" else data_to_text(data)
+        with timer.stage("save_result"):
+            output_file = save_ocr_result(result, output_dir, ocr_mode, page_info, f"page_{page_number:03d}")
+    except Exception as e:
+        return {'success': False, 'error': str(e), 'metrics': {'stages': timer.as_dict()}, 'page_info': page_info}
+    return {
+        'success': True,
+        'output_file': output_file,
+        'processed_image': None,
+        'original_image': None,
+        'boxed_image': None,
+        'text_layer': True,
+        'image_regions': image_regions,
+        'metrics': {'stages': timer.as_dict()},
+        'page_info': page_info,
+    }
+
+
+def process_text_layer_pages(pdf_path, output_dir, ocr_mode, dpi, max_workers=4):
+    """텍스트 레이어를 쓸 수 있는 페이지를 처리하고 {페이지 번호: 결과}를 반환
+
+    텍스트 레이어가 없는(스캔) 페이지는 결과에 포함되지 않으며 호출자가 OCR합니다.
+    """
+    try:
+        layers = read_text_layer(pdf_path)
+        image_pages = list_image_pages(pdf_path)
+    except Exception as e:
+        print(f"⚠️ 텍스트 레이어 조회 실패, 전체 페이지를 OCR합니다: {e}")
+        return {}
+
+    usable = [page_number for page_number, layer in layers.items() if is_usable_text_layer(layer)]
+    if not usable:
+        return {}
+    print(f"📝 텍스트 레이어 사용: {len(usable)}/{len(layers)} 페이지 (나머지만 OCR)")
+
+    os.makedirs(output_dir, exist_ok=True)
+    results = {}
+    # 이미지 영역 OCR이 있을 수 있으므로 워커 풀에서 처리
+    with ThreadPoolExecutor(max_workers=max_workers, initializer=warm_up_ocr_backend) as executor:
+        futures = {
+            executor.submit(
+                process_text_layer_page, pdf_path, page_number, layers[page_number],
+                output_dir, ocr_mode, dpi, page_number in image_pages,
+            ): page_number
+            for page_number in usable
+        }
+        for future in as_completed(futures):
+            results[futures[future]] = future.result()
+    return results
+
+
+def process_pdf_parallel(pdf_path, output_dir, ocr_mode, max_workers=4, streaming=PDF_STREAMING):
+    """PDF 페이지들을 병렬로 처리하는 함수"""
+    print("📄 PDF 파일로 인식됨")
+
+    # 다중 해상도 모드에서는 기준 DPI로 변환하고 페이지마다 보정 함수를 붙임
+    adaptive = ADAPTIVE_DPI and ocr_mode == "image_to_data"
+    dpi = ADAPTIVE_BASE_DPI if adaptive else PDF_TO_IMG_DPI
+    if adaptive:
+        print(f"🔍 다중 해상도 모드: {ADAPTIVE_BASE_DPI} DPI 1차 인식 후 저신뢰 영역만 {PDF_TO_IMG_DPI} DPI 재인식")
+
+    # 텍스트 레이어가 있는 페이지는 래스터화 없이 단어와 좌표를 바로 읽음
+    results = []
+    done_pages = set()  # 래스터화가 필요 없는 페이지 (텍스트 레이어/캐시 적중)
+    if TEXT_LAYER_ENABLED:
+        for page_number, result in sorted(process_text_layer_pages(pdf_path, output_dir, ocr_mode, dpi, max_workers).items()):
+            report_page_result(result['page_info'], result)
+            results.append(result)
+            if result['success']:
+                done_pages.add(page_number)
+
+    # 캐시에 있는 페이지는 래스터화 없이 결과 파일만 작성
+    cache = get_ocr_cache()
+    cache_keys = {}
+    page_count = get_pdf_page_count(pdf_path) if cache is not None or done_pages else None
+    if page_count and cache is not None:
+        pdf_digest = hash_file(pdf_path)
+        for page_number in range(1, page_count + 1):
+            if page_number in done_pages:
+                continue
+            key = make_cache_key(pdf_digest, ocr_mode, dpi, page_number)
+            cached = cache.get(key)
+            if cached is None:
+                cache_keys[page_number] = key
+                continue
+            page_info = f"페이지 {page_number}"
+            result = process_cached_result(cached, output_dir, ocr_mode, page_info, f"page_{page_number:03d}")
+            report_page_result(page_info, result)
+            results.append(result)
+            done_pages.add(page_number)
+
+    def page_options(idx, image):
+        """페이지별 process_single_image 추가 인자"""
+        options = {}
+        if adaptive:
+            options['refine_data'] = make_adaptive_refiner(pdf_path, idx, image.size)
+        if idx in cache_keys:
+            options.update(cache=cache, cache_key=cache_keys[idx])
+        return options
+
+    if page_count and len(done_pages) >= page_count:
+        pages = iter(())  # 모든 페이지가 텍스트 레이어/캐시로 처리됨
+        max_pending = 1
+    elif PDF_PROCESS_WORKERS:
+        pages = None  # 공유 메모리 페이지 버퍼 + 프로세스 풀에서 처리
+    elif streaming:
+        # 페이지를 한 장씩 변환하며 바로 워커에 전달
+        pages = iter_pdf_pages(pdf_path, dpi, done_pages)
+        max_pending = max_workers * (1 + PDF_QUEUE_SIZE_PER_WORKER)
+        print(f"🔄 스트리밍 병렬 처리 시작 (최대 {max_workers} 스레드, 대기열 {max_pending} 페이지)")
+    else:
+        # PDF를 이미지로 변환
+        images = convert_pdf_to_images(pdf_path, dpi)
+        if images is None:
+            return None
+        pages = ((idx, image) for idx, image in enumerate(images, 1) if idx not in done_pages)
+        max_pending = len(images) or 1
+        print(f"🔄 {len(images)} 페이지를 병렬 처리 시작 (최대 {max_workers} 스레드)")
+
+    # 병렬 처리 실행
+    # 워커 스레드마다 OCR 엔진을 미리 초기화해 페이지마다 모델을 다시 읽지 않도록 함
+    if pages is None:
+        results += process_pdf_shared_buffers(
+            pdf_path, output_dir, ocr_mode, dpi, max_workers, done_pages, cache_keys, adaptive,
+        )
+    else:
+        with ThreadPoolExecutor(max_workers=max_workers, initializer=warm_up_ocr_backend) as executor:
+            results += run_pages_bounded(executor, pages, output_dir, ocr_mode, max_pending, page_options)
+
+    if not results:
+        return None
+
     # 결과 요약
     success_count = sum(1 for r in results if r['success'])
     print(f"🎯 처리 완료: {success_count}/{len(results)} 페이지 성공")
@@ -113,23 +497,75 @@ def process_image_file(image_path, output_dir, ocr_mode):
     filename = os.path.splitext(os.path.basename(image_path))[0]
     page_info = filename
     file_prefix = filename
-    
-    result = process_single_image(image_path, output_dir, ocr_mode, page_info, file_prefix)
-    
-    if result['success']:
-        print(f"✅ 처리 완료:")
-        print(f"   📄 OCR 결과: {result['output_file']}")
-        print(f"   🖼️ 원본 이미지: {result['original_image']}")
-        if result.get('boxed_image'):
-            print(f"   📦 바운딩 박스 이미지: {result['boxed_image']}")
-        print(f"   🔧 처리된 이미지: {result['processed_image']}")
-        return output_dir
+
+    # 같은 이미지/설정의 결과가 캐시에 있으면 OCR 생략
+    cache = get_ocr_cache()
+    cached = cache_key = None
+    if cache is not None:
+        cache_key = make_cache_key(hash_file(image_path), ocr_mode)
+        cached = cache.get(cache_key)
+
+    if cached is not None:
+        result = process_cached_result(cached, output_dir, ocr_mode, page_info, file_prefix)
     else:
-        print(f"❌ 처리 실패: {result['error']}")
-        return None
+        result = process_single_image(image_path, output_dir, ocr_mode, page_info, file_prefix,
+                                      cache=cache, cache_key=cache_key)
+
+    report_page_result(page_info, result)
+    return output_dir if result['success'] else None
+
+
+def save_fields_result(fields, output_dir, file_prefix):
+    """필드 OCR 결과 {필드 이름: {'text', 'conf'}}를 JSON으로 저장"""
+    output_file = os.path.join(output_dir, f"{file_prefix}_fields.json")
+    with open(output_file, 'w', encoding='utf-8') as f:
+        json.dump(fields, f, ensure_ascii=False, indent=2)
+    return output_file
 
 
-def process_file(file_path, ocr_mode=TESSERACT_OCR_MODE, max_workers=4):
+def report_fields_result(page_info, fields, output_file):
+    """필드 OCR 결과 요약 출력"""
+    confs = [field['conf'] for field in fields.values() if not field.get('error')]
+    failed = [name for name, field in fields.items() if field.get('error')]
+    mean_conf = sum(confs) / len(confs) if confs else 0.0
+    print(f"✅ {page_info} 필드 {len(fields)}개 인식 (평균 신뢰도 {mean_conf:.1f}): {output_file}")
+    if failed:
+        print(f"   ⚠️ 실패한 필드: {', '.join(failed)}")
+
+
+def process_template_file(file_path, output_dir, template_path, max_workers=4):
+    """템플릿 필드 영역만 OCR하는 함수 (PDF는 필드 영역만 래스터화)"""
+    template = load_template(template_path)
+    print(f"🧩 필드 템플릿 모드: {len(template['fields'])}개 필드, "
+          f"페이지 면적의 약 {template_area_ratio(template) * 100:.1f}%만 OCR")
+    os.makedirs(output_dir, exist_ok=True)
+
+    # 모든 페이지의 필드 작업을 하나의 워커 풀에 넣은 뒤 페이지 순서대로 결과 수집
+    with ThreadPoolExecutor(max_workers=max_workers, initializer=warm_up_ocr_backend) as executor:
+        if is_pdf_file(file_path):
+            page_count = get_pdf_page_count(file_path)
+            if not page_count:
+                return None
+            pages = [
+                (f"페이지 {page_number}", f"page_{page_number:03d}",
+                 submit_pdf_template_fields(executor, file_path, page_number, template, PDF_TO_IMG_DPI))
+                for page_number in range(1, page_count + 1)
+            ]
+        else:
+            with Image.open(file_path) as image:
+                futures = submit_template_fields(executor, image.convert('RGB'), template)
+            filename = os.path.splitext(os.path.basename(file_path))[0]
+            pages = [(filename, filename, futures)]
+
+        for page_info, file_prefix, futures in pages:
+            fields = collect_fields(futures)
+            output_file = save_fields_result(fields, output_dir, file_prefix)
+            report_fields_result(page_info, fields, output_file)
+
+    return output_dir
+
+
+def process_file(file_path, ocr_mode=TESSERACT_OCR_MODE, max_workers=4, output_base_dir="test_result"):
     """파일을 처리하는 함수"""
     print(f"\n📁 처리 대상: {file_path}")
     print(f"🔧 OCR 모드: {ocr_mode}")
@@ -140,10 +576,12 @@ def process_file(file_path, ocr_mode=TESSERACT_OCR_MODE, max_workers=4):
         return None
 
     # 출력 디렉토리 생성
-    output_dir = get_output_directory(file_path)
+    output_dir = get_output_directory(file_path, output_base_dir)
 
     # 파일 타입에 따라 처리
-    if is_pdf_file(file_path):
+    if ROI_TEMPLATE_PATH and (is_pdf_file(file_path) or is_image_file(file_path)):
+        result = process_template_file(file_path, output_dir, ROI_TEMPLATE_PATH, max_workers)
+    elif is_pdf_file(file_path):
         result = process_pdf_parallel(file_path, output_dir, ocr_mode, max_workers)
     elif is_image_file(file_path):
         result = process_image_file(file_path, output_dir, ocr_mode)
@@ -151,15 +589,59 @@ def process_file(file_path, ocr_mode=TESSERACT_OCR_MODE, max_workers=4):
         print(f"❌ 지원하지 않는 파일 형식: {file_path}")
         return None
 
+    # 백그라운드에서 인코딩 중인 부산물 이미지가 모두 저장될 때까지 대기
+    get_artifact_writer().flush()
     return result
 
 
+def run_config(ocr_mode=TESSERACT_OCR_MODE, max_workers=None):
+    """실행 지표에 함께 남길 현재 설정"""
+    return {
+        'ocr_mode': ocr_mode,
+        'max_workers': max_workers,
+        'dpi': PDF_TO_IMG_DPI,
+        'adaptive_dpi': ADAPTIVE_DPI,
+        'text_layer': TEXT_LAYER_ENABLED,
+        'ocr_cache': OCR_CACHE_ENABLED,
+        'ocr_backend': OCR_BACKEND,
+        'language': LANGUAGE,
+        'preprocess': PREPROCESS_PIPELINE.signature(),
+        'page_triage': PAGE_TRIAGE_ENABLED,
+        'tiled_ocr': TILED_OCR_ENABLED,
+        'multipass': SECOND_PASS_LANGUAGE if MULTIPASS_ENABLED else None,
+        'process_workers': PDF_PROCESS_WORKERS,
+    }
+
+
+def write_run_metrics(base_dir=METRICS_DIR):
+    """공용 실행 지표를 JSON으로 저장하고 단계별 합계를 출력 (비활성화 상태면 None)"""
+    if not METRICS_ENABLED:
+        return None
+    recorder = get_metrics_recorder()
+    os.makedirs(base_dir, exist_ok=True)
+    path = recorder.write(os.path.join(base_dir, f"run_metrics_{recorder.started.strftime('%y%m%d_%H%M%S')}.json"))
+    summary = recorder.summary()
+    print(f"📊 단계별 시간 합계: {format_stage_totals(summary['stage_totals'])}")
+    print(f"📊 사전 판정: 빈 페이지 건너뜀 {summary['blank_skipped']}개, "
+          f"방향 보정 {summary['rotated']}개, 기울기 보정 {summary['deskewed']}개")
+    if summary['manifest_reused']:
+        print(f"📊 처리 페이지 {summary['pages']}개 (실행 매니페스트 재사용 {summary['manifest_reused']}개는 처리량에서 제외)")
+    if summary['second_pass_line_ratio'] is not None:
+        print(f"📊 2차 OCR: 줄 {summary['second_pass_line_ratio'] * 100:.1f}% "
+              f"(페이지 면적 평균 {summary['second_pass_area_ratio'] * 100:.1f}%)")
+    if summary['peak_rss_mb'] is not None:
+        print(f"📊 최대 메모리: {summary['peak_rss_mb']:.1f} MB")
+    print(f"📊 실행 지표 저장: {path}")
+    return path
+
+
 def ocr_main():
     """메인 실행 함수"""
     start_time = datetime.now()
     
     # CPU 코어 수의 절반을 워커 수로 설정
     max_workers = max(1, multiprocessing.cpu_count())
+    reset_metrics_recorder(run_config(TESSERACT_OCR_MODE, max_workers))
 
     print("=== OCR 처리 시작 ===")
     print(f"🔧 병렬 처리 설정: 최대 {max_workers} 스레드 (CPU 코어 수: {multiprocessing.cpu_count()})")
@@ -176,6 +658,10 @@ def ocr_main():
     elapsed_time = end_time - start_time
     print(f"\n === 모든 OCR 처리 완료 === ")
     print(f"⏱️ 총 소요시간: {elapsed_time.total_seconds():.2f}초")
+    cache = get_ocr_cache()
+    if cache is not None:
+        print(f"💾 OCR 캐시: {cache.summary()}")
+    write_run_metrics()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,203 @@
+"""OCR → LLM 구조화 추출 파이프라인 실행 파일
+
+문서의 페이지를 워커 스레드에서 OCR하고, 페이지 OCR이 끝나는 즉시 그 텍스트로
+스키마 기반 LLM 추출 요청을 보낸 뒤, 페이지별 결과를 하나의 문서 JSON으로 합칩니다.
+CPU를 쓰는 뒷 페이지 OCR과 앞 페이지의 LLM 요청(네트워크 대기)이 겹쳐 실행되므로
+문서 하나의 전체 소요 시간이 대략 OCR/LLM 시간의 합이 아니라 둘 중 긴 쪽에 가까워집니다.
+
+LLM은 `async def llm(prompt) -> 응답 문자열` 형태의 함수로 주입할 수 있어
+API 키 없이 가짜(stub) LLM으로도 실행할 수 있습니다. (--stub-llm)
+"""
+import os
+import json
+import time
+import asyncio
+import argparse
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor
+from src.tesseract.run_tesseract import warm_up_ocr_backend
+from src.tesseract.ocr_data import data_to_text
+from src.tesseract.artifacts import get_artifact_writer
+from src.llm.extraction import load_schema, build_extraction_prompt, parse_extraction, merge_page_extractions
+from src.llm.llm_cache import make_llm_cache_key
+from src.llm.run_gptAPI import (
+    MODEL_NAME, COMPLETION_PARAMS, SYSTEM_PROMPT, create_async_llm_client, get_llm_cache,
+)
+from OCR_main import TESSERACT_OCR_MODE, TESSERACT_OCR_MODE_LIST, get_output_directory, report_page_result
+from OCR_batch import build_work_items, process_work_item
+
+#################
+# 상수
+#################
+PIPELINE_INPUT = './assets/인보이스.pdf'
+EXTRACTION_SUFFIX = "_extracted.json"
+
+# --------------------------------------------------
+
+
+def page_text_from_result(result, ocr_mode):
+    """페이지 OCR 결과에서 LLM에 넘길 텍스트를 만듦"""
+    ocr_result = result.get('ocr_result')
+    if ocr_result is None:
+        return ""
+    if ocr_mode == "image_to_data":
+        return data_to_text(ocr_result)
+    return str(ocr_result)
+
+
+def make_stub_llm(schema):
+    """API 없이 파이프라인을 돌려 보기 위한 가짜 LLM (항상 빈 스키마 틀을 응답)"""
+    async def stub_llm(prompt):
+        return json.dumps(schema, ensure_ascii=False)
+    return stub_llm
+
+
+def ocr_work_item(item, ocr_mode):
+    """워커 스레드에서 페이지 하나를 OCR하고 OCR 결과와 소요 시간을 함께 반환"""
+    start = time.perf_counter()
+    result = process_work_item(item, ocr_mode, keep_result=True)
+    result['ocr_seconds'] = time.perf_counter() - start
+    return result
+
+
+async def extract_page(llm, page_text, schema, cache=None):
+    """페이지 하나의 텍스트로 추출 요청 (같은 텍스트는 LLM 캐시에서 재사용)"""
+    prompt = build_extraction_prompt(page_text, schema)
+    key = None
+    if cache is not None:
+        instruction = build_extraction_prompt("", schema)
+        key = make_llm_cache_key(MODEL_NAME, COMPLETION_PARAMS, SYSTEM_PROMPT, instruction, page_text)
+        cached = cache.get(key)
+        if cached is not None:
+            return parse_extraction(cached['response']), True
+
+    response = await llm(prompt)
+    extracted = parse_extraction(response)
+    if cache is not None:
+        cache.put(key, response)
+    return extracted, False
+
+
+async def run_pipeline_async(file_path, llm=None, ocr_mode=TESSERACT_OCR_MODE, max_workers=None, schema=None):
+    """파일 하나를 OCR하며 페이지별로 바로 LLM 추출을 수행하고 합친 문서를 반환
+
+    Args:
+        file_path: PDF 또는 이미지 파일 경로
+        llm: async def llm(prompt) -> 응답 문자열 (None이면 OpenAI 비동기 클라이언트 + LLM 응답 캐시 사용)
+        ocr_mode: OCR 모드
+        max_workers: OCR 워커 스레드 수 (기본: CPU 코어 수)
+        schema: 스키마 틀 (None이면 src/llm/1.json에서 생성)
+
+    Returns:
+        {'document', 'pages', 'errors', 'timing'}
+    """
+    schema = schema or load_schema()
+    max_workers = max_workers or max(1, multiprocessing.cpu_count())
+
+    # 주입한 LLM(가짜 LLM 등)의 응답은 캐시에 남기지 않음
+    client = None
+    cache = None
+    if llm is None:
+        client = create_async_llm_client()
+        llm = client.complete
+        cache = get_llm_cache()
+
+    loop = asyncio.get_running_loop()
+    items = build_work_items([file_path], ocr_mode)
+    pages = {}
+    errors = {}
+    timing = {'ocr': 0.0, 'llm': 0.0}
+    start = time.perf_counter()
+
+    async def ocr_page(item):
+        # OCR은 스레드 풀에서 실행하여 이벤트 루프(LLM 요청)를 막지 않음
+        # 래스터화 오류 등은 실패한 페이지 결과로 바꿔 나머지 페이지는 계속 처리
+        try:
+            result = await loop.run_in_executor(executor, ocr_work_item, item, ocr_mode)
+        except Exception as e:
+            return item, {'success': False, 'error': str(e), 'page_info': item['page_info']}
+        timing['ocr'] += result['ocr_seconds']
+        return item, result
+
+    async def llm_page(page_number, page_text):
+        page_start = time.perf_counter()
+        try:
+            pages[page_number], cache_hit = await extract_page(llm, page_text, schema, cache)
+            print(f"🤖 페이지 {page_number} 추출 완료{' (캐시)' if cache_hit else ''}")
+        except Exception as e:
+            errors[page_number] = str(e)
+            print(f"❌ 페이지 {page_number} 추출 오류: {e}")
+        timing['llm'] += time.perf_counter() - page_start
+
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers, initializer=warm_up_ocr_backend) as executor:
+            llm_tasks = []
+            for next_page in asyncio.as_completed([ocr_page(item) for item in items]):
+                item, result = await next_page
+                report_page_result(item['page_info'], result)
+                page_number = item['page_number'] or 1
+                if not result['success']:
+                    errors[page_number] = result.get('error', "OCR 실패")
+                    continue
+                page_text = page_text_from_result(result, ocr_mode)
+                if page_text.strip():
+                    llm_tasks.append(asyncio.create_task(llm_page(page_number, page_text)))
+            await asyncio.gather(*llm_tasks)
+    finally:
+        if client is not None:
+            await client.close()
+        get_artifact_writer().flush()
+
+    timing['total'] = time.perf_counter() - start
+    ordered = [pages[number] for number in sorted(pages)]
+    return {
+        'document': merge_page_extractions(ordered, schema),
+        'pages': pages,
+        'errors': errors,
+        'timing': timing,
+    }
+
+
+def run_pipeline(file_path, llm=None, ocr_mode=TESSERACT_OCR_MODE, max_workers=None, schema=None):
+    """run_pipeline_async의 동기 버전"""
+    return asyncio.run(run_pipeline_async(file_path, llm, ocr_mode, max_workers, schema))
+
+
+def save_document(document, file_path):
+    """합친 문서 JSON을 파일별 출력 디렉토리에 저장하고 경로를 반환"""
+    output_dir = get_output_directory(file_path)
+    os.makedirs(output_dir, exist_ok=True)
+    filename = os.path.splitext(os.path.basename(file_path))[0]
+    output_file = os.path.join(output_dir, f"{filename}{EXTRACTION_SUFFIX}")
+    with open(output_file, 'w', encoding='utf-8') as f:
+        json.dump(document, f, ensure_ascii=False, indent=2)
+    return output_file
+
+
+def ocr_pipeline_main(file_path=PIPELINE_INPUT, ocr_mode=TESSERACT_OCR_MODE, max_workers=None, stub_llm=False):
+    """파이프라인 메인 함수"""
+    print("=== OCR → LLM 추출 파이프라인 시작 ===")
+    schema = load_schema()
+    llm = make_stub_llm(schema) if stub_llm else None
+    outcome = run_pipeline(file_path, llm, ocr_mode, max_workers, schema)
+
+    output_file = save_document(outcome['document'], file_path)
+    timing = outcome['timing']
+    print(f"\n📄 추출 결과: {output_file} ({len(outcome['pages'])}개 페이지 병합, 오류 {len(outcome['errors'])}개)")
+    print(f"⏱️ 전체 {timing['total']:.2f}초 (페이지별 OCR 합계 {timing['ocr']:.2f}초, "
+          f"LLM 대기 합계 {timing['llm']:.2f}초가 겹쳐 실행됨)")
+    return outcome
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="OCR 결과를 바로 스키마 기반 LLM 추출로 넘기는 파이프라인")
+    parser.add_argument('input', nargs='?', default=PIPELINE_INPUT, help="PDF 또는 이미지 파일")
+    parser.add_argument('--mode', default=TESSERACT_OCR_MODE, choices=TESSERACT_OCR_MODE_LIST)
+    parser.add_argument('--workers', type=int, default=None, help="OCR 워커 스레드 수 (기본: CPU 코어 수)")
+    parser.add_argument('--stub-llm', action='store_true', help="API 호출 없이 빈 스키마를 응답하는 가짜 LLM 사용")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    ocr_pipeline_main(args.input, args.mode, args.workers, args.stub_llm)
@@ -0,0 +1,494 @@
+"""OCR 서비스 실행 파일
+
+한 번 띄워 두고 계속 문서를 받는 로컬 HTTP 서비스입니다. cv2/pytesseract 임포트와
+OCR 엔진 초기화(워커 스레드 풀)는 시작할 때 한 번만 하고, 요청마다 작업(job)을 대기열에 넣어
+같은 워커 풀에서 페이지 단위로 처리합니다.
+
+    python OCR_server.py --port 8765
+
+    # 파일 업로드 (바로 job_id 반환 → GET /jobs/<id>로 조회)
+    curl --data-binary @invoice.pdf "http://127.0.0.1:8765/jobs?filename=invoice.pdf"
+    # 서버의 입력 디렉토리(--input-root) 안의 경로로 요청하고 끝날 때까지 대기
+    python OCR_server.py --input-root ./assets
+    curl -d '{"path": "인보이스.pdf", "wait": true}' http://127.0.0.1:8765/jobs
+    # 페이지가 끝나는 대로 한 줄씩(NDJSON) 받기
+    curl -N --data-binary @invoice.pdf "http://127.0.0.1:8765/jobs?filename=invoice.pdf&stream=1"
+
+엔드포인트
+    POST /jobs              작업 등록 (대기열이 가득 차면 503 + Retry-After)
+    GET  /jobs/<id>         작업 상태와 페이지 결과 (?stream=1이면 NDJSON 스트리밍)
+    GET  /health            상태, 대기/실행 중 작업 수
+    GET  /metrics           작업 통계와 단계별 시간 합계
+"""
+import os
+import json
+import time
+import uuid
+import queue
+import shutil
+import argparse
+import tempfile
+import threading
+import multiprocessing
+from datetime import datetime
+from urllib.parse import urlparse, parse_qs
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from src.tesseract.run_tesseract import warm_up_ocr_backend
+from src.tesseract.ocr_data import data_to_text
+from src.tesseract.artifacts import get_artifact_writer
+from src.tesseract.metrics import get_metrics_recorder, reset_metrics_recorder
+from OCR_main import (
+    TESSERACT_OCR_MODE, TESSERACT_OCR_MODE_LIST, is_pdf_file, is_image_file, report_page_result, run_config,
+    write_run_metrics,
+)
+from OCR_batch import build_work_items, process_work_item
+
+#################
+# 상수
+#################
+SERVICE_HOST = "127.0.0.1"
+SERVICE_PORT = 8765
+SERVICE_WORKERS = max(1, multiprocessing.cpu_count())  # 페이지 OCR 워커 스레드 수 (시작 시 미리 초기화)
+SERVICE_MAX_ACTIVE_JOBS = 2      # 동시에 페이지를 워커 풀에 넣는 작업 수
+SERVICE_MAX_QUEUED_JOBS = 16     # 대기열 상한 (넘으면 새 작업을 거절하여 과부하를 막음)
+SERVICE_RETRY_AFTER = 5          # 거절 시 Retry-After 헤더 (초)
+SERVICE_MAX_UPLOAD_MB = 200
+SERVICE_OUTPUT_DIR = "test_result"
+SERVICE_JOB_TTL = 3600           # 끝난 작업을 보관하는 시간 (초)
+SERVICE_METRICS_MAX_PAGES = 1000 # 실행 지표에 보관할 최근 페이지 수
+# JSON {"path": ...} 요청으로 읽을 수 있는 서버 디렉토리 (None이면 경로 요청을 받지 않고 업로드만 허용)
+SERVICE_INPUT_ROOT = None
+
+# --------------------------------------------------
+
+
+class ServiceBusy(Exception):
+    """대기열이 가득 차 작업을 받을 수 없음"""
+
+
+class PathNotAllowed(Exception):
+    """입력 디렉토리 밖의 경로이거나 경로 요청이 꺼져 있음"""
+
+
+def resolve_input_path(path, input_root):
+    """요청 경로를 input_root 기준 실제 경로로 바꿈 (심볼릭 링크/.. 로 밖을 가리키면 거절)"""
+    if not input_root:
+        raise PathNotAllowed("경로 요청이 비활성화되어 있습니다. (--input-root로 허용할 디렉토리를 지정)")
+    root = os.path.realpath(input_root)
+    resolved = os.path.realpath(os.path.join(root, path))
+    if os.path.commonpath([root, resolved]) != root:
+        raise PathNotAllowed(f"입력 디렉토리 밖의 경로입니다: {path}")
+    return resolved
+
+
+def page_payload(item, result, ocr_mode, include_data=False):
+    """페이지 처리 결과를 응답용 JSON dict로 변환"""
+    payload = {
+        'page_info': item['page_info'],
+        'page_number': item['page_number'],
+        'success': result['success'],
+    }
+    if not result['success']:
+        payload['error'] = result.get('error')
+        return payload
+
+    ocr_result = result.get('ocr_result')
+    if ocr_mode == "image_to_data" and ocr_result is not None:
+        payload['text'] = data_to_text(ocr_result)
+        if include_data:
+            payload['data'] = ocr_result
+    else:
+        payload['text'] = ocr_result
+    for key in ('output_file', 'cache_hit', 'blank_page', 'page_triage', 'tiles', 'refined_regions', 'metrics'):
+        if result.get(key) is not None:
+            payload[key] = result[key]
+    return payload
+
+
+class OCRJob:
+    """문서 하나의 OCR 작업 (페이지 결과가 생길 때마다 대기 중인 스트림에 알림)"""
+
+    def __init__(self, file_path, ocr_mode, include_data=False, upload_dir=None):
+        self.id = uuid.uuid4().hex[:12]
+        self.file_path = file_path
+        self.ocr_mode = ocr_mode
+        self.include_data = include_data
+        self.upload_dir = upload_dir
+        self.status = "queued"
+        self.error = None
+        self.total_pages = None
+        self.pages = []
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+        self._cond = threading.Condition()
+
+    @property
+    def done(self):
+        return self.status in ("done", "failed")
+
+    def start(self, total_pages):
+        with self._cond:
+            self.status = "running"
+            self.started = time.time()
+            self.total_pages = total_pages
+            self._cond.notify_all()
+
+    def add_page(self, payload):
+        with self._cond:
+            self.pages.append(payload)
+            self._cond.notify_all()
+
+    def finish(self, error=None):
+        with self._cond:
+            self.status = "failed" if error else "done"
+            self.error = error
+            self.finished = time.time()
+            self._cond.notify_all()
+
+    def wait(self, timeout=None):
+        with self._cond:
+            self._cond.wait_for(lambda: self.done, timeout)
+        return self.done
+
+    def iter_pages(self):
+        """이미 끝난 페이지부터 차례로 내보내고, 작업이 끝날 때까지 새 페이지를 기다림"""
+        index = 0
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: index < len(self.pages) or self.done)
+                pending = self.pages[index:]
+                finished = self.done
+            for payload in pending:
+                yield payload
+            index += len(pending)
+            if finished and index >= len(self.pages):
+                return
+
+    def to_dict(self, include_pages=True):
+        with self._cond:
+            document = {
+                'job_id': self.id,
+                'file': os.path.basename(self.file_path),
+                'ocr_mode': self.ocr_mode,
+                'status': self.status,
+                'total_pages': self.total_pages,
+                'completed_pages': len(self.pages),
+                'queue_seconds': round((self.started or time.time()) - self.created, 3),
+                'elapsed': round((self.finished or time.time()) - self.started, 3) if self.started else None,
+            }
+            if self.error:
+                document['error'] = self.error
+            if include_pages:
+                document['pages'] = sorted(self.pages, key=lambda page: page['page_number'] or 0)
+        return document
+
+
+class OCRService:
+    """작업 대기열 + 미리 초기화한 OCR 워커 풀
+
+    디스패처 스레드(max_active_jobs개)가 대기열에서 작업을 꺼내 페이지 단위로 워커 풀에 넣습니다.
+    대기열이 가득 차면 submit이 ServiceBusy를 던지므로 호출자가 나중에 다시 시도하도록 알려야 합니다.
+    """
+
+    def __init__(self, workers=SERVICE_WORKERS, max_active_jobs=SERVICE_MAX_ACTIVE_JOBS,
+                 max_queued_jobs=SERVICE_MAX_QUEUED_JOBS, output_dir=SERVICE_OUTPUT_DIR):
+        self.workers = workers
+        self.output_dir = output_dir
+        self.executor = ThreadPoolExecutor(max_workers=workers, initializer=warm_up_ocr_backend,
+                                           thread_name_prefix="ocr-worker")
+        self.queue = queue.Queue(maxsize=max_queued_jobs)
+        self.jobs = {}
+        self.stats = {'submitted': 0, 'completed': 0, 'failed': 0, 'rejected': 0, 'pages': 0}
+        self.job_seconds = 0.0
+        self.active = 0
+        self.started = time.time()
+        self._lock = threading.Lock()
+        self._dispatchers = [
+            threading.Thread(target=self._dispatch, name=f"ocr-dispatch-{k}", daemon=True)
+            for k in range(max_active_jobs)
+        ]
+
+    def start(self):
+        """워커 스레드를 모두 띄워 OCR 엔진을 미리 로드한 뒤 디스패처 시작"""
+        barrier = threading.Barrier(self.workers)
+        warm_ups = [self.executor.submit(barrier.wait, 30) for _ in range(self.workers)]
+        for future in warm_ups:
+            try:
+                future.result()
+            except threading.BrokenBarrierError:
+                pass
+        for dispatcher in self._dispatchers:
+            dispatcher.start()
+        return self
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+        get_artifact_writer().flush()
+
+    def submit(self, file_path, ocr_mode=TESSERACT_OCR_MODE, include_data=False, upload_dir=None):
+        """작업을 대기열에 넣고 OCRJob을 반환 (대기열이 가득 차면 ServiceBusy)"""
+        if ocr_mode not in TESSERACT_OCR_MODE_LIST:
+            raise ValueError(f"지원하지 않는 OCR 모드: {ocr_mode}")
+        if not (is_pdf_file(file_path) or is_image_file(file_path)):
+            raise ValueError(f"지원하지 않는 파일 형식: {os.path.basename(file_path)}")
+        if not os.path.isfile(file_path):
+            raise ValueError(f"파일이 없습니다: {file_path}")
+
+        self._prune_jobs()
+        job = OCRJob(file_path, ocr_mode, include_data, upload_dir)
+        try:
+            self.queue.put_nowait(job)
+        except queue.Full:
+            with self._lock:
+                self.stats['rejected'] += 1
+            raise ServiceBusy("대기 중인 작업이 너무 많습니다.")
+        with self._lock:
+            self.jobs[job.id] = job
+            self.stats['submitted'] += 1
+        return job
+
+    def get_job(self, job_id):
+        with self._lock:
+            return self.jobs.get(job_id)
+
+    def _prune_jobs(self):
+        """보관 시간이 지난 끝난 작업을 정리"""
+        now = time.time()
+        with self._lock:
+            expired = [job_id for job_id, job in self.jobs.items()
+                       if job.done and now - job.finished > SERVICE_JOB_TTL]
+            for job_id in expired:
+                del self.jobs[job_id]
+
+    def _dispatch(self):
+        while True:
+            job = self.queue.get()
+            with self._lock:
+                self.active += 1
+            try:
+                self.run_job(job)
+            finally:
+                with self._lock:
+                    self.active -= 1
+                self.queue.task_done()
+
+    def run_job(self, job):
+        """작업 하나의 페이지를 워커 풀에 넣고 끝나는 순서대로 결과를 기록"""
+        try:
+            items = build_work_items([job.file_path], job.ocr_mode)
+            if not items:
+                raise ValueError("처리할 페이지가 없습니다.")
+            filename = os.path.splitext(os.path.basename(job.file_path))[0]
+            for item in items:
+                item['output_dir'] = os.path.join(self.output_dir, f"{job.id}_{filename}")
+
+            job.start(len(items))
+            futures = {self.executor.submit(process_work_item, item, job.ocr_mode, True): item for item in items}
+            for future in as_completed(futures):
+                item = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    result = {'success': False, 'error': str(e), 'page_info': item['page_info']}
+                report_page_result(item['page_info'], result)
+                job.add_page(page_payload(item, result, job.ocr_mode, job.include_data))
+            job.finish()
+        except Exception as e:
+            print(f"❌ 작업 {job.id} 실패: {e}")
+            job.finish(str(e))
+        finally:
+            if job.upload_dir:
+                shutil.rmtree(job.upload_dir, ignore_errors=True)
+
+        with self._lock:
+            self.stats['failed' if job.error else 'completed'] += 1
+            self.stats['pages'] += len(job.pages)
+            if job.started:
+                self.job_seconds += job.finished - job.started
+
+    def health(self):
+        with self._lock:
+            active = self.active
+        queued = self.queue.qsize()
+        return {
+            'status': "ok",
+            'accepting': not self.queue.full(),
+            'workers': self.workers,
+            'active_jobs': active,
+            'queued_jobs': queued,
+            'uptime': round(time.time() - self.started, 1),
+        }
+
+    def metrics(self):
+        with self._lock:
+            stats = dict(self.stats)
+            finished = stats['completed'] + stats['failed']
+            stats['mean_job_seconds'] = round(self.job_seconds / finished, 3) if finished else None
+        return {'jobs': stats, **self.health(), 'ocr': get_metrics_recorder().summary()}
+
+
+class OCRRequestHandler(BaseHTTPRequestHandler):
+    """OCR 서비스 HTTP 핸들러 (service 속성은 make_server에서 지정)"""
+
+    service = None
+    input_root = None
+    server_version = "OCRService/1.0"
+
+    def log_message(self, format, *args):
+        print(f"🌐 {self.address_string()} {format % args}")
+
+    def send_json(self, status, document, headers=None):
+        body = json.dumps(document, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def stream_job(self, job):
+        """페이지 결과를 끝나는 대로 한 줄(NDJSON)씩 보내고 마지막 줄에 작업 상태를 보냄"""
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson; charset=utf-8")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        self.close_connection = True
+        try:
+            for payload in job.iter_pages():
+                self.wfile.write(json.dumps({'page': payload}, ensure_ascii=False).encode('utf-8') + b"\n")
+                self.wfile.flush()
+            self.wfile.write(json.dumps({'job': job.to_dict(include_pages=False)}, ensure_ascii=False).encode('utf-8') + b"\n")
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # 클라이언트가 먼저 끊어도 작업은 계속 진행
+
+    def read_job_request(self, params):
+        """요청 본문에서 (파일 경로, 옵션 dict, 업로드 임시 디렉토리)를 읽음"""
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > SERVICE_MAX_UPLOAD_MB * 1024 * 1024:
+            raise ValueError(f"업로드 크기 제한({SERVICE_MAX_UPLOAD_MB}MB)을 넘었습니다.")
+        body = self.rfile.read(length) if length else b""
+
+        if self.headers.get_content_type() == "application/json":
+            options = json.loads(body or b"{}")
+            if not isinstance(options, dict):
+                raise ValueError("JSON 요청 본문은 객체여야 합니다.")
+            if not isinstance(options.get('path'), str) or not options['path']:
+                raise ValueError("JSON 요청에는 문자열 'path'가 필요합니다.")
+            return resolve_input_path(options['path'], self.input_root), options, None
+
+        filename = os.path.basename(params.get('filename', [""])[0])
+        if not body or filename in ("", ".", ".."):
+            raise ValueError("업로드 요청에는 본문과 ?filename= 이 필요합니다.")
+        if not (is_pdf_file(filename) or is_image_file(filename)):
+            raise ValueError(f"지원하지 않는 파일 형식: {filename}")
+        options = {key: values[0] for key, values in params.items()}
+        upload_dir = tempfile.mkdtemp(prefix="ocr_upload_")
+        file_path = os.path.join(upload_dir, filename)
+        with open(file_path, 'wb') as f:
+            f.write(body)
+        return file_path, options, upload_dir
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        if url.path.rstrip('/') != "/jobs":
+            return self.send_json(404, {'error': "not found"})
+
+        upload_dir = None
+        try:
+            file_path, options, upload_dir = self.read_job_request(parse_qs(url.query))
+            job = self.service.submit(
+                file_path, options.get('mode', TESSERACT_OCR_MODE),
+                include_data=is_true(options.get('data')), upload_dir=upload_dir,
+            )
+        except ServiceBusy as e:
+            if upload_dir:
+                shutil.rmtree(upload_dir, ignore_errors=True)
+            return self.send_json(503, {'error': str(e)}, {"Retry-After": str(SERVICE_RETRY_AFTER)})
+        except PathNotAllowed as e:
+            return self.send_json(403, {'error': str(e)})
+        except ValueError as e:
+            if upload_dir:
+                shutil.rmtree(upload_dir, ignore_errors=True)
+            return self.send_json(400, {'error': str(e)})
+
+        if is_true(options.get('stream')):
+            return self.stream_job(job)
+        if is_true(options.get('wait')):
+            job.wait()
+            return self.send_json(200, job.to_dict())
+        return self.send_json(202, {'job_id': job.id, 'status': job.status, 'status_url': f"/jobs/{job.id}"})
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        path = url.path.rstrip('/')
+        if path == "/health":
+            return self.send_json(200, self.service.health())
+        if path == "/metrics":
+            return self.send_json(200, self.service.metrics())
+        if path.startswith("/jobs/"):
+            job = self.service.get_job(path[len("/jobs/"):])
+            if job is None:
+                return self.send_json(404, {'error': "작업을 찾을 수 없습니다."})
+            if is_true(parse_qs(url.query).get('stream', [None])[0]):
+                return self.stream_job(job)
+            return self.send_json(200, job.to_dict())
+        return self.send_json(404, {'error': "not found"})
+
+
+def is_true(value):
+    """쿼리 문자열/JSON의 참 값 판정 (1, true, yes, True)"""
+    if isinstance(value, bool):
+        return value
+    return str(value).lower() in ("1", "true", "yes") if value is not None else False
+
+
+def make_server(service, host=SERVICE_HOST, port=SERVICE_PORT, input_root=SERVICE_INPUT_ROOT):
+    """서비스를 연결한 HTTP 서버 생성 (input_root: 경로 요청을 허용할 디렉토리)"""
+    handler = type("BoundOCRRequestHandler", (OCRRequestHandler,), {'service': service, 'input_root': input_root})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def ocr_server_main(host=SERVICE_HOST, port=SERVICE_PORT, workers=SERVICE_WORKERS,
+                    max_active_jobs=SERVICE_MAX_ACTIVE_JOBS, max_queued_jobs=SERVICE_MAX_QUEUED_JOBS,
+                    input_root=SERVICE_INPUT_ROOT):
+    """서비스 메인 함수"""
+    reset_metrics_recorder(run_config(TESSERACT_OCR_MODE, workers), max_pages=SERVICE_METRICS_MAX_PAGES)
+    print("=== OCR 서비스 시작 ===")
+    start = time.perf_counter()
+    service = OCRService(workers, max_active_jobs, max_queued_jobs).start()
+    print(f"🔥 워커 {workers}개 초기화 완료 ({time.perf_counter() - start:.2f}초)")
+
+    server = make_server(service, host, port, input_root)
+    print(f"🌐 http://{host}:{port} 에서 대기 중 (동시 작업 {max_active_jobs}개, 대기열 {max_queued_jobs}개)")
+    print(f"📂 경로 요청: {os.path.realpath(input_root) if input_root else '비활성화 (업로드만 허용)'}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n🛑 서비스 종료 중...")
+    finally:
+        server.server_close()
+        service.close()
+        write_run_metrics()
+        print(f"=== OCR 서비스 종료 ({datetime.now().strftime('%Y-%m-%d %H:%M:%S')}) ===")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="작업 대기열과 미리 초기화한 워커 풀을 쓰는 로컬 OCR HTTP 서비스")
+    parser.add_argument('--host', default=SERVICE_HOST)
+    parser.add_argument('--port', type=int, default=SERVICE_PORT)
+    parser.add_argument('--workers', type=int, default=SERVICE_WORKERS, help="페이지 OCR 워커 스레드 수")
+    parser.add_argument('--max-active', type=int, default=SERVICE_MAX_ACTIVE_JOBS, help="동시에 실행할 작업 수")
+    parser.add_argument('--max-queued', type=int, default=SERVICE_MAX_QUEUED_JOBS, help="대기열 상한")
+    parser.add_argument('--input-root', default=SERVICE_INPUT_ROOT,
+                        help="JSON 경로 요청을 허용할 디렉토리 (지정하지 않으면 업로드만 허용)")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    ocr_server_main(args.host, args.port, args.workers, args.max_active, args.max_queued, args.input_root)
@@ -0,0 +1,100 @@
+"""크기 제한이 있는 JSON 디스크 캐시 공통 모듈
+
+OCR 결과 캐시(src/tesseract/ocr_cache.py)와 LLM 응답 캐시(src/llm/llm_cache.py)가 함께 씁니다.
+항목은 cache_dir/<키 앞 두 글자>/<키>.json에 저장하며, 전체 크기가 max_bytes를 넘으면
+가장 오래 사용하지 않은 항목부터 삭제합니다. (파일 수정 시간 기준 LRU)
+"""
+import os
+import json
+import threading
+
+DISK_CACHE_EVICT_RATIO = 0.9  # 삭제 시 이 비율까지 줄임
+
+
+class DiskLRUCache:
+    """크기 제한이 있는 JSON 디스크 캐시 (스레드 안전)"""
+
+    def __init__(self, cache_dir, max_bytes, evict_ratio=DISK_CACHE_EVICT_RATIO):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.evict_ratio = evict_ratio
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+        self._total_bytes = sum(size for _, size, _ in self._scan())
+
+    def _scan(self):
+        """(경로, 크기, 마지막 사용 시간) 목록"""
+        entries = []
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if not name.endswith('.json'):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((path, stat.st_size, stat.st_mtime))
+        return entries
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    def get(self, key):
+        """캐시된 값을 반환 (없으면 None)"""
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                value = json.load(f)
+            os.utime(path)  # LRU: 사용 시간 갱신
+        except (OSError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+        return value
+
+    def put(self, key, value):
+        """값을 저장하고 필요하면 오래된 항목을 삭제"""
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # 임시 파일에 쓴 뒤 교체하여 다른 스레드가 덜 쓴 파일을 읽지 않도록 함
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(value, f, ensure_ascii=False, separators=(',', ':'))
+        size = os.path.getsize(temp_path)
+        with self._lock:
+            try:
+                size -= os.path.getsize(path)  # 같은 키를 덮어쓰면 이전 크기를 뺌
+            except OSError:
+                pass
+            os.replace(temp_path, path)
+            self._total_bytes += size
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        """가장 오래 사용하지 않은 항목부터 삭제 (self._lock 보유 상태에서 호출)"""
+        entries = sorted(self._scan(), key=lambda entry: entry[2])
+        total = sum(size for _, size, _ in entries)
+        target = self.max_bytes * self.evict_ratio
+        for path, size, _ in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+        self._total_bytes = total
+
+    def summary(self):
+        """적중/미스 통계 문자열"""
+        total = self.hits + self.misses
+        rate = self.hits / total * 100 if total else 0.0
+        return f"적중 {self.hits} / 미스 {self.misses} (적중률 {rate:.1f}%)"
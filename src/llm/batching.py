@@ -0,0 +1,62 @@
+"""여러 셀을 한 번의 LLM 요청으로 묶는 배치 모듈
+
+원문들을 ID가 붙은 JSON 객체로 묶어 보내고, 응답도 같은 ID를 키로 하는 JSON 객체로 받아
+셀별 결과로 나눕니다. 배치 크기는 추정 토큰 예산에 맞춰 정해집니다.
+"""
+import json
+
+from src.llm.llm_client import estimate_tokens
+
+LLM_BATCH_TOKEN_BUDGET = 2000            # 배치 하나에 담을 원문의 추정 토큰 합계 상한
+LLM_BATCH_MAX_ITEMS = 20                 # 배치 하나에 담을 최대 셀 수
+LLM_BATCH_OUTPUT_TOKENS_PER_ITEM = 200   # 셀 하나의 결과에 필요한 출력 토큰 여유분
+LLM_BATCH_MAX_COMPLETION_TOKENS = 16000  # 배치 요청의 max_completion_tokens 상한
+
+BATCH_INSTRUCTION = (
+    "아래 입력 JSON의 각 값은 서로 독립적인 원문입니다. 각 원문에 위 지시를 따로 적용하세요.\n"
+    "반드시 입력과 같은 ID를 키로, 해당 원문의 결과 JSON 객체를 값으로 하는 JSON 객체 하나만 출력하세요.\n"
+    '예: {"1": {...}, "2": {...}}'
+)
+
+
+def pack_batches(texts, token_budget=LLM_BATCH_TOKEN_BUDGET, max_items=LLM_BATCH_MAX_ITEMS):
+    """원문 목록을 토큰 예산/개수 상한에 맞춰 순서대로 묶음"""
+    batches = []
+    current, current_tokens = [], 0
+    for text in texts:
+        tokens = estimate_tokens(text)
+        if current and (current_tokens + tokens > token_budget or len(current) >= max_items):
+            batches.append(current)
+            current, current_tokens = [], 0
+        current.append(text)
+        current_tokens += tokens
+    if current:
+        batches.append(current)
+    return batches
+
+
+def build_batch_prompt(texts, instruction):
+    """ID("1", "2", ...)를 붙인 배치 프롬프트 생성"""
+    payload = {str(idx): text for idx, text in enumerate(texts, 1)}
+    return f"{instruction}\n\n{BATCH_INSTRUCTION}\n\n입력:\n{json.dumps(payload, ensure_ascii=False)}"
+
+
+def batch_completion_params(texts):
+    """배치 크기에 맞춘 max_completion_tokens"""
+    needed = sum(estimate_tokens(text) * 2 + LLM_BATCH_OUTPUT_TOKENS_PER_ITEM for text in texts)
+    return {"max_completion_tokens": min(LLM_BATCH_MAX_COMPLETION_TOKENS, needed)}
+
+
+def split_batch_result(parsed, count):
+    """배치 응답 객체를 {배치 내 인덱스: 결과 JSON 문자열}로 나눔
+
+    ID가 없거나 값이 객체가 아닌 항목은 빠지며, 호출자가 셀 단위 요청으로 다시 처리합니다.
+    """
+    if not isinstance(parsed, dict):
+        return {}
+    results = {}
+    for idx in range(count):
+        value = parsed.get(str(idx + 1))
+        if isinstance(value, (dict, list)):
+            results[idx] = json.dumps(value, ensure_ascii=False)
+    return results
@@ -0,0 +1,100 @@
+"""JSON 추출 마이크로 벤치마크
+
+기존 방식(중괄호마다 범위를 잘라 json.loads → json.dumps)과 src/llm/json_extract.py를
+큰 응답/악의적인 응답에서 비교합니다. 프로젝트 루트에서 `python -m src.llm.bench_json_extract`로 실행합니다.
+"""
+import re
+import json
+import timeit
+
+from src.llm.json_extract import extract_json
+
+BENCH_REPEAT = 3
+BENCH_SIZE = 200_000  # 케이스별 대략적인 응답 길이(문자)
+
+
+def legacy_extract_first_json(text):
+    """이전 구현 (비교 기준)"""
+    if not text:
+        return ""
+
+    code_block = re.search(r"```(?:json)?\s*([\s\S]*?)```", text, re.IGNORECASE)
+    if code_block:
+        candidate = code_block.group(1).strip()
+        try:
+            parsed = json.loads(candidate)
+            return json.dumps(parsed, ensure_ascii=False)
+        except Exception:
+            pass
+
+    brace_stack = []
+    start_idx = -1
+    for idx, ch in enumerate(text):
+        if ch == '{':
+            if not brace_stack:
+                start_idx = idx
+            brace_stack.append('{')
+        elif ch == '}':
+            if brace_stack:
+                brace_stack.pop()
+                if not brace_stack and start_idx != -1:
+                    candidate = text[start_idx:idx + 1]
+                    try:
+                        parsed = json.loads(candidate)
+                        return json.dumps(parsed, ensure_ascii=False)
+                    except Exception:
+                        start_idx = -1
+                        continue
+
+    return ""
+
+
+def build_cases(size=BENCH_SIZE):
+    """벤치마크 입력 {이름: (응답 문자열, 기대 결과)}"""
+    item = {"이름": "홍길동", "설명": "중괄호 {가} 들어간 \"문자열\"", "값": list(range(10))}
+    large_object = {f"k{i}": item for i in range(size // 120)}
+    large_text = json.dumps(large_object, ensure_ascii=False)
+
+    # 문자열 안에 짝이 맞지 않는 닫는 중괄호가 있는 큰 객체
+    unbalanced_object = {f"k{i}": {"메모": "닫는 중괄호 } 포함", "값": i} for i in range(size // 40)}
+
+    nested_depth = 500
+    broken_nested = '{"a":' * nested_depth + '1' + '}' * (nested_depth - 1) + ',}'
+    ok = {"ok": True}
+
+    return {
+        # 설명 문장 뒤에 큰 JSON 하나
+        'large_valid': ("결과는 다음과 같습니다.\n" + large_text + "\n이상입니다.", large_object),
+        # 코드블록 안의 큰 JSON
+        'large_fenced': ("```json\n" + large_text + "\n```", large_object),
+        # 문자열 안의 닫는 중괄호 때문에 기존 방식은 범위를 잘못 잘라 찾지 못함
+        'brace_in_string': (json.dumps(unbalanced_object, ensure_ascii=False), unbalanced_object),
+        # 깨진 객체가 계속 이어진 뒤 마지막에 유효한 객체
+        'many_broken': ("{잘못된 객체} " * (size // 12) + '{"ok": true}', ok),
+        # 중첩이 깊고 마지막에서 깨진 객체들
+        'broken_nested': ((broken_nested + " ") * max(1, size // (len(broken_nested) * 10)) + '{"ok": true}', ok),
+        # 닫히지 않은 여는 중괄호만 잔뜩
+        'open_braces': ("{" * size, None),
+    }
+
+
+def bench_case(func, text, repeat=BENCH_REPEAT):
+    """가장 빠른 1회 실행 시간(초)"""
+    return min(timeit.repeat(lambda: func(text), number=1, repeat=repeat))
+
+
+def main():
+    print(f"{'케이스':<16} {'길이':>9} {'기존(ms)':>10} {'신규(ms)':>10} {'배속':>7}  기존/신규 정답")
+    for name, (text, expected) in build_cases().items():
+        legacy = bench_case(legacy_extract_first_json, text)
+        current = bench_case(extract_json, text)
+        legacy_result = legacy_extract_first_json(text)
+        legacy_ok = (json.loads(legacy_result) if legacy_result else None) == expected
+        current_ok = extract_json(text) == expected
+        speedup = legacy / current if current > 0 else float('inf')
+        print(f"{name:<16} {len(text):>9} {legacy * 1000:>10.2f} {current * 1000:>10.2f} {speedup:>6.1f}x  "
+              f"{'✅' if legacy_ok else '❌'}/{'✅' if current_ok else '❌'}")
+
+
+if __name__ == "__main__":
+    main()
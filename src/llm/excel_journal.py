@@ -0,0 +1,147 @@
+"""엑셀 처리 결과 저널(체크포인트) 모듈
+
+완료된 (행, 열) 결과를 통합 문서 옆의 JSON Lines 파일에 바로 추가 기록합니다.
+처리 중에는 저널이 결과의 원본이며, 통합 문서는 마지막에 한 번만 씁니다.
+중간에 중단되더라도 다음 실행에서 저널을 읽어 완료된 셀은 다시 요청하지 않습니다.
+"""
+import os
+import json
+import tempfile
+from openpyxl import Workbook, load_workbook
+
+JOURNAL_SUFFIX = ".journal.jsonl"
+JOURNAL_FSYNC_EVERY = 20  # 항목 N개마다 디스크에 강제 기록
+STREAM_OUTPUT_SUFFIX = "_result"  # 행 단위 재작성 결과 파일 이름 접미사 (원본은 덮어쓰지 않음)
+
+
+def journal_path_for(file_path):
+    """통합 문서에 대응하는 저널 파일 경로"""
+    return file_path + JOURNAL_SUFFIX
+
+
+def stream_output_path_for(file_path):
+    """행 단위 재작성 결과를 쓸 별도 파일 경로 (예: a.xlsx -> a_result.xlsx)"""
+    base, ext = os.path.splitext(file_path)
+    return f"{base}{STREAM_OUTPUT_SUFFIX}{ext}"
+
+
+class ExcelJournal:
+    """(행, 열) -> 값 결과를 추가 전용으로 기록하는 저널"""
+
+    def __init__(self, path, fsync_every=JOURNAL_FSYNC_EVERY):
+        self.path = path
+        self.fsync_every = fsync_every
+        self._file = None
+        self._unsynced = 0
+
+    def load(self):
+        """저널에 기록된 결과를 {(행, 열): 값}으로 읽음 (마지막 줄이 깨져 있으면 무시)"""
+        entries = {}
+        if not os.path.exists(self.path):
+            return entries
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    item = json.loads(line)
+                except ValueError:
+                    continue  # 중단 시점에 덜 쓰인 줄
+                entries[(item['r'], item['c'])] = item['v']
+        return entries
+
+    def append(self, row, col, value):
+        """결과 한 건을 기록"""
+        if self._file is None:
+            self._file = open(self.path, 'a', encoding='utf-8')
+        self._file.write(json.dumps({'r': row, 'c': col, 'v': value}, ensure_ascii=False) + "\n")
+        self._file.flush()
+        self._unsynced += 1
+        if self._unsynced >= self.fsync_every:
+            self.sync()
+
+    def sync(self):
+        """OS 버퍼까지 디스크에 기록"""
+        if self._file is not None and self._unsynced:
+            os.fsync(self._file.fileno())
+            self._unsynced = 0
+
+    def close(self):
+        if self._file is not None:
+            self.sync()
+            self._file.close()
+            self._file = None
+
+    def remove(self):
+        """모든 결과가 통합 문서에 반영된 뒤 저널 삭제"""
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def replace_with_temp(file_path, save):
+    """같은 디렉토리의 임시 파일에 save(경로)로 쓴 뒤 원본을 원자적으로 교체"""
+    directory = os.path.dirname(os.path.abspath(file_path))
+    fd, temp_path = tempfile.mkstemp(suffix=os.path.splitext(file_path)[1], dir=directory)
+    os.close(fd)
+    try:
+        save(temp_path)
+        os.replace(temp_path, file_path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+def apply_cells_to_workbook(file_path, cells):
+    """{(행, 열): 값}을 활성 시트에 기록하고 저장 (서식 유지, 통합 문서 전체를 메모리에 올림)"""
+    if not cells:
+        return
+    wb = load_workbook(filename=file_path)
+    ws = wb.active
+    for (row_idx, col), value in cells.items():
+        ws.cell(row=row_idx, column=col).value = value
+    replace_with_temp(file_path, lambda path: wb.save(filename=path))
+
+
+def stream_cells_to_workbook(file_path, cells, output_path=None):
+    """{(행, 열): 값}을 반영한 통합 문서를 행 단위로 output_path에 씀 (메모리 사용량이 시트 크기와 무관)
+
+    읽기 전용 모드로 모든 시트를 한 행씩 읽어 쓰기 전용 통합 문서에 옮기며, 활성 시트의 행에만 값을 덮어씁니다.
+    쓰기 전용 통합 문서는 값만 옮기므로 셀 서식/열 너비/병합/수식/차트는 유지되지 않습니다.
+    그래서 원본은 건드리지 않고 별도 파일(기본: stream_output_path_for)에 씁니다.
+    """
+    if not cells:
+        return None
+    output_path = output_path or stream_output_path_for(file_path)
+    if os.path.abspath(output_path) == os.path.abspath(file_path):
+        raise ValueError("행 단위 재작성은 원본 통합 문서를 덮어쓸 수 없습니다.")
+    by_row = {}
+    for (row_idx, col), value in cells.items():
+        by_row.setdefault(row_idx, {})[col] = value
+
+    def save(path):
+        source = load_workbook(filename=file_path, read_only=True)
+        target = Workbook(write_only=True)
+        try:
+            active_title = source.active.title
+            for index, ws in enumerate(source.worksheets):
+                out = target.create_sheet(title=ws.title)
+                if ws.title == active_title:
+                    target.active = index
+                updates = by_row if ws.title == active_title else {}
+                for row_idx, row in enumerate(ws.iter_rows(values_only=True), start=1):
+                    out.append(apply_row(row, updates.get(row_idx)))
+            target.save(path)
+        finally:
+            source.close()
+
+    replace_with_temp(output_path, save)
+    return output_path
+
+
+def apply_row(row, updates):
+    """행 값 튜플에 {열: 값}을 덮어쓴 목록"""
+    if not updates:
+        return list(row)
+    values = list(row) + [None] * (max(updates) - len(row))
+    for col, value in updates.items():
+        values[col - 1] = value
+    return values
@@ -0,0 +1,95 @@
+"""스키마 기반 문서 추출 모듈
+
+src/llm/1.json(상업 송장 예시)을 값이 비어 있는 스키마 틀로 바꿔 페이지별 추출 프롬프트를 만들고,
+페이지별 추출 결과를 하나의 문서 JSON으로 합칩니다.
+"""
+import os
+import json
+
+from src.llm.json_extract import extract_json
+
+SCHEMA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "1.json")
+
+EXTRACTION_INSTRUCTION = (
+    "다음은 문서 한 페이지의 OCR 텍스트입니다. 아래 JSON 틀과 같은 구조로 이 페이지에 있는 값만 채우세요.\n"
+    "- 페이지에 없는 값은 null로 두고, 추측하지 마세요.\n"
+    "- line_items, notes 같은 목록에는 이 페이지에 나온 항목만 넣으세요.\n"
+    "- JSON 객체 하나만 출력하세요."
+)
+
+# 여러 페이지에 값이 있으면 마지막 페이지 값을 쓰는 섹션 (합계는 보통 마지막 페이지에 있음)
+MERGE_LAST_WINS_SECTIONS = ("totals",)
+
+
+def load_schema(schema_path=SCHEMA_PATH):
+    """예시 문서 JSON을 읽어 값이 비어 있는 스키마 틀로 반환"""
+    with open(schema_path, 'r', encoding='utf-8') as f:
+        return schema_template(json.load(f))
+
+
+def schema_template(example):
+    """예시 값의 구조만 남긴 틀 (객체는 키 유지, 객체 목록은 첫 항목의 틀 하나, 나머지 값은 null)"""
+    if isinstance(example, dict):
+        return {key: schema_template(value) for key, value in example.items()}
+    if isinstance(example, list):
+        if example and isinstance(example[0], dict):
+            return [schema_template(example[0])]
+        return []
+    return None
+
+
+def build_extraction_prompt(page_text, schema, instruction=EXTRACTION_INSTRUCTION):
+    """페이지 OCR 텍스트와 스키마 틀로 추출 프롬프트 생성"""
+    template = json.dumps(schema, ensure_ascii=False, indent=2)
+    return f"{instruction}\n\nJSON 틀:\n{template}\n\nOCR 텍스트:\n{page_text}"
+
+
+def parse_extraction(response):
+    """추출 응답에서 JSON 객체를 파싱 (객체가 아니면 ValueError)"""
+    parsed = extract_json(response)
+    if not isinstance(parsed, dict):
+        raise ValueError("응답에서 JSON 객체를 찾을 수 없습니다.")
+    return parsed
+
+
+def is_empty_value(value):
+    return value is None or value == "" or value == [] or value == {}
+
+
+def merge_values(current, new, last_wins=False):
+    """두 페이지의 값을 합침
+
+    - 객체: 키별로 재귀 병합
+    - 목록: 이어 붙이되 완전히 같은 항목은 한 번만
+    - 값: 먼저 나온 비어 있지 않은 값 (last_wins면 나중 값)
+    """
+    if is_empty_value(new):
+        return current
+    if is_empty_value(current):
+        return new
+    if isinstance(current, dict) and isinstance(new, dict):
+        merged = dict(current)
+        for key, value in new.items():
+            merged[key] = merge_values(current.get(key), value, last_wins)
+        return merged
+    if isinstance(current, list) and isinstance(new, list):
+        merged = list(current)
+        for item in new:
+            if item not in merged:
+                merged.append(item)
+        return merged
+    return new if last_wins else current
+
+
+def merge_page_extractions(pages, schema=None):
+    """페이지 순서대로 정렬된 추출 결과 목록을 하나의 문서로 합침"""
+    document = dict(schema) if schema else {}
+    # 스키마 틀의 목록 자리(예시 항목 틀)는 비우고 시작
+    for key, value in document.items():
+        if isinstance(value, list):
+            document[key] = []
+
+    for page in pages:
+        for key, value in page.items():
+            document[key] = merge_values(document.get(key), value, key in MERGE_LAST_WINS_SECTIONS)
+    return document
@@ -0,0 +1,98 @@
+"""LLM 응답에서 JSON 객체를 추출하는 모듈
+
+응답을 한 번만 훑으며 최상위의 균형 잡힌 {...} 범위를 찾고(문자열 리터럴/이스케이프 안의 중괄호는 무시),
+각 범위를 json.JSONDecoder.raw_decode로 한 번씩만 파싱하여 객체를 그대로 반환합니다.
+각 문자는 스캔 한 번, 파싱 한 번만 거치므로 응답 길이에 선형 시간으로 끝납니다.
+"""
+import re
+import json
+
+CODE_FENCE_PATTERN = re.compile(r"```(?:json)?\s*([\s\S]*?)```", re.IGNORECASE)
+# 객체 안에서 살펴볼 토큰: 문자열 리터럴(이스케이프 포함) 또는 연속된 여는/닫는 중괄호
+OBJECT_TOKEN_PATTERN = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"|\{+|\}+', re.DOTALL)
+
+_decoder = json.JSONDecoder()
+
+
+def iter_object_spans(text):
+    """최상위 {...} 범위를 (시작, 끝)으로 차례로 생성
+
+    객체 밖(깊이 0)의 따옴표는 일반 문장으로 보고, 객체 안에서만 문자열 리터럴을 추적합니다.
+    끝까지 닫히지 않은 범위는 생성하지 않습니다.
+    """
+    pos = 0
+    while True:
+        start = text.find('{', pos)
+        if start < 0:
+            return
+
+        depth = 0
+        for match in OBJECT_TOKEN_PATTERN.finditer(text, start):
+            token = match.group()
+            if token[0] == '{':
+                depth += len(token)
+            elif token[0] == '}':
+                if len(token) >= depth:
+                    pos = match.start() + depth
+                    yield start, pos
+                    break
+                depth -= len(token)
+        else:
+            return
+
+
+def decode_span(text, start, end):
+    """범위 전체가 JSON 객체이면 파싱 결과를, 아니면 None을 반환
+
+    잘라낸 문자열에서 파싱하므로 실패 시 오류 위치 계산도 범위 길이에 비례합니다.
+    """
+    candidate = text[start:end]
+    try:
+        obj, obj_end = _decoder.raw_decode(candidate)
+    except (ValueError, RecursionError):
+        return None
+    return obj if obj_end == len(candidate) else None
+
+
+def iter_json_objects(text):
+    """응답에 들어 있는 최상위 JSON 객체를 앞에서부터 차례로 생성"""
+    if not text:
+        return
+    for start, end in iter_object_spans(text):
+        obj = decode_span(text, start, end)
+        if obj is not None:
+            yield obj
+
+
+def decode_code_fence(text):
+    """```json ... ``` 코드블록 내용 전체가 JSON이면 파싱 결과를 반환 (없거나 깨졌으면 None)"""
+    code_block = CODE_FENCE_PATTERN.search(text)
+    if not code_block:
+        return None
+    candidate = code_block.group(1).strip()
+    try:
+        obj, end = _decoder.raw_decode(candidate)
+    except (ValueError, RecursionError):
+        return None
+    return obj if end == len(candidate) else None
+
+
+def extract_json(text, all_objects=False):
+    """응답에서 JSON을 파싱하여 반환
+
+    Args:
+        text: LLM 응답 문자열
+        all_objects: True면 찾은 모든 JSON 객체의 목록을 반환
+
+    Returns:
+        첫 번째 JSON 값 (코드블록 우선, 없으면 None) 또는 all_objects일 때 객체 목록
+    """
+    if all_objects:
+        return list(iter_json_objects(text))
+    if not text:
+        return None
+
+    fenced = decode_code_fence(text)
+    if fenced is not None:
+        return fenced
+    return next(iter_json_objects(text), None)
@@ -0,0 +1,56 @@
+"""LLM 프롬프트/응답 디스크 캐시 모듈
+
+모델 이름, 호출 파라미터, 시스템 프롬프트, 지시문, 원문 해시로 만든 키에 응답을 저장합니다.
+같은 통합 문서를 다시 실행하면 바뀐 셀만 API를 호출하게 됩니다.
+저장/LRU 삭제는 src/disk_cache.py의 DiskLRUCache가 담당합니다.
+"""
+import json
+import hashlib
+from src.disk_cache import DiskLRUCache
+
+LLM_CACHE_DIR = ".llm_cache"
+LLM_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+
+def hash_text(text):
+    """원문 텍스트의 SHA-256 해시"""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def make_llm_cache_key(model, params, system_prompt, instruction, text):
+    """모델/파라미터/지시문/원문 해시로 캐시 키 생성"""
+    payload = json.dumps({
+        'model': model,
+        'params': params,
+        'system_prompt': system_prompt,
+        'instruction': instruction,
+        'text': hash_text(text),
+    }, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class LLMResponseCache(DiskLRUCache):
+    """크기 제한이 있는 LLM 응답 디스크 캐시 (스레드 안전)"""
+
+    def __init__(self, cache_dir=LLM_CACHE_DIR, max_bytes=LLM_CACHE_MAX_BYTES):
+        super().__init__(cache_dir, max_bytes)
+        self.saved_tokens = 0
+
+    def get(self, key):
+        """캐시된 항목({'response', 'usage'})을 반환 (없으면 None)"""
+        value = super().get(key)
+        if value is not None:
+            with self._lock:
+                self.saved_tokens += usage_total(value.get('usage'))
+        return value
+
+    def put(self, key, response, usage=None):
+        """응답과 토큰 사용량을 저장하고 필요하면 오래된 항목을 삭제"""
+        super().put(key, {'response': response, 'usage': usage or {}})
+
+
+def usage_total(usage):
+    """usage dict의 총 토큰 수 (없으면 0)"""
+    if not usage:
+        return 0
+    return int(usage.get('prompt_tokens', 0)) + int(usage.get('completion_tokens', 0))
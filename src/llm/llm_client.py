@@ -0,0 +1,197 @@
+"""비동기 LLM 클라이언트 모듈
+
+하나의 AsyncOpenAI 클라이언트(연결 풀 공유)로 요청을 보내며,
+동시 요청 수 제한, 분당 요청/토큰 수 제한, 429/5xx 재시도(지수 백오프 + 지터)를 제공합니다.
+base_url을 지정하면 로컬 모의(mock) HTTP 서버로도 그대로 테스트할 수 있습니다.
+"""
+import time
+import random
+import asyncio
+
+from openai import (
+    AsyncOpenAI, APIConnectionError, APIStatusError, APITimeoutError, RateLimitError,
+)
+
+LLM_MAX_CONCURRENCY = 8            # 동시에 진행할 최대 요청 수
+LLM_REQUESTS_PER_MINUTE = 500      # 분당 요청 수 제한 (None이면 제한 없음)
+LLM_TOKENS_PER_MINUTE = 200_000    # 분당 토큰 수 제한 (None이면 제한 없음)
+LLM_MAX_RETRIES = 6                # 재시도 횟수
+LLM_BACKOFF_BASE = 1.0             # 첫 재시도 대기 시간(초)
+LLM_BACKOFF_MAX = 60.0             # 최대 대기 시간(초)
+LLM_TIMEOUT = 120.0                # 요청 타임아웃(초)
+
+CHARS_PER_TOKEN = 3  # 토큰 수 대략 추정용 (한글/영문 혼합 기준)
+
+
+def estimate_tokens(text, max_completion_tokens=0):
+    """요청이 소비할 토큰 수를 대략 추정 (입력 글자 수 기반 + 최대 출력 토큰)"""
+    return len(text or "") // CHARS_PER_TOKEN + 1 + max_completion_tokens
+
+
+class TokenBucket:
+    """분당 용량(capacity_per_minute)만큼 채워지는 토큰 버킷"""
+
+    def __init__(self, capacity_per_minute):
+        self.capacity = float(capacity_per_minute)
+        self.tokens = self.capacity
+        self.rate = self.capacity / 60.0
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount):
+        """amount만큼 꺼내기 위해 기다려야 하는 시간(초). 0이면 바로 꺼냄"""
+        self._refill()
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            self.tokens -= amount
+            return 0.0
+        return (amount - self.tokens) / self.rate
+
+
+class RateLimiter:
+    """분당 요청 수/토큰 수를 함께 제한하는 비동기 제한기"""
+
+    def __init__(self, requests_per_minute=LLM_REQUESTS_PER_MINUTE, tokens_per_minute=LLM_TOKENS_PER_MINUTE):
+        self.request_bucket = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.token_bucket = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, tokens=1):
+        """요청 1건과 tokens개의 토큰을 쓸 수 있을 때까지 대기"""
+        async with self._lock:
+            for bucket, amount in ((self.request_bucket, 1), (self.token_bucket, tokens)):
+                if bucket is None:
+                    continue
+                delay = bucket.wait_time(amount)
+                while delay > 0:
+                    await asyncio.sleep(delay)
+                    delay = bucket.wait_time(amount)
+
+
+def is_retryable(error):
+    """재시도할 오류인지 판단 (429, 5xx, 연결/타임아웃 오류)"""
+    if isinstance(error, (RateLimitError, APIConnectionError, APITimeoutError)):
+        return True
+    return isinstance(error, APIStatusError) and error.status_code >= 500
+
+
+def retry_after_seconds(error):
+    """응답의 Retry-After 헤더 값(초). 없으면 None"""
+    response = getattr(error, 'response', None)
+    headers = getattr(response, 'headers', None) or {}
+    value = headers.get('retry-after')
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def backoff_delay(attempt, base=LLM_BACKOFF_BASE, maximum=LLM_BACKOFF_MAX):
+    """지수 백오프 + full jitter 대기 시간"""
+    return random.uniform(0, min(maximum, base * (2 ** attempt)))
+
+
+class AsyncLLMClient:
+    """연결 풀을 공유하는 비동기 Chat Completions 클라이언트
+
+    Args:
+        api_key: OpenAI API 키
+        base_url: API 주소 (로컬 모의 서버 테스트 시 지정, 기본: OpenAI)
+        model: 모델 이름
+        system_prompt: 시스템 메시지
+        completion_params: chat.completions.create에 함께 넘길 인자
+        max_concurrency: 동시 요청 수 상한
+        rate_limiter: RateLimiter (None이면 기본 설정으로 생성)
+        max_retries: 재시도 횟수
+        timeout: 요청 하나의 타임아웃(초)
+    """
+
+    def __init__(self, api_key, model, system_prompt, completion_params=None, base_url=None,
+                 max_concurrency=LLM_MAX_CONCURRENCY, rate_limiter=None, max_retries=LLM_MAX_RETRIES,
+                 timeout=LLM_TIMEOUT):
+        # 재시도는 직접 처리하므로 SDK 자체 재시도는 끔
+        self.client = AsyncOpenAI(api_key=api_key, base_url=base_url, max_retries=0, timeout=timeout)
+        self.model = model
+        self.system_prompt = system_prompt
+        self.completion_params = dict(completion_params or {})
+        self.max_concurrency = max_concurrency
+        self.rate_limiter = rate_limiter
+        self.max_retries = max_retries
+        self._semaphore = None
+        self.usage = {'requests': 0, 'retries': 0, 'prompt_tokens': 0, 'completion_tokens': 0}
+
+    def _get_semaphore(self):
+        # 세마포어/제한기는 실행 중인 이벤트 루프에서 생성
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        if self.rate_limiter is None:
+            self.rate_limiter = RateLimiter()
+        return self._semaphore
+
+    async def complete(self, prompt, system_prompt=None, return_usage=False, extra_params=None):
+        """프롬프트 하나를 보내고 응답 텍스트를 반환 (재시도 포함)
+
+        return_usage가 True면 (응답 텍스트, {'prompt_tokens', 'completion_tokens'})를 반환합니다.
+        extra_params는 이 요청에만 completion_params 위에 덮어씁니다.
+        """
+        semaphore = self._get_semaphore()
+        params = {**self.completion_params, **(extra_params or {})}
+        max_tokens = params.get('max_completion_tokens', 0)
+        messages = [
+            {"role": "system", "content": system_prompt or self.system_prompt},
+            {"role": "user", "content": prompt},
+        ]
+
+        attempt = 0
+        while True:
+            await self.rate_limiter.acquire(estimate_tokens(prompt, max_tokens))
+            try:
+                async with semaphore:
+                    completion = await self.client.chat.completions.create(
+                        model=self.model, messages=messages, **params,
+                    )
+            except Exception as e:
+                if attempt >= self.max_retries or not is_retryable(e):
+                    raise
+                delay = retry_after_seconds(e)
+                await asyncio.sleep(delay if delay is not None else backoff_delay(attempt))
+                attempt += 1
+                self.usage['retries'] += 1
+                continue
+
+            usage = {'prompt_tokens': 0, 'completion_tokens': 0}
+            if completion.usage is not None:
+                usage['prompt_tokens'] = completion.usage.prompt_tokens or 0
+                usage['completion_tokens'] = completion.usage.completion_tokens or 0
+            self.usage['requests'] += 1
+            self.usage['prompt_tokens'] += usage['prompt_tokens']
+            self.usage['completion_tokens'] += usage['completion_tokens']
+
+            text = completion.choices[0].message.content or ""
+            return (text, usage) if return_usage else text
+
+    async def complete_many(self, prompts, on_done=None, return_usage=False, extra_params=None):
+        """여러 프롬프트를 동시에 보내고 입력 순서대로 (응답 또는 예외) 목록을 반환
+
+        on_done(인덱스, 응답 또는 예외)가 주어지면 완료될 때마다 호출합니다.
+        extra_params는 프롬프트별 추가 인자 목록입니다. (None이면 모두 기본값)
+        """
+        async def run(idx, prompt):
+            try:
+                params = extra_params[idx] if extra_params is not None else None
+                result = await self.complete(prompt, return_usage=return_usage, extra_params=params)
+            except Exception as e:
+                result = e
+            if on_done is not None:
+                on_done(idx, result)
+            return result
+
+        return await asyncio.gather(*(run(idx, prompt) for idx, prompt in enumerate(prompts)))
+
+    async def close(self):
+        """연결 풀 정리"""
+        await self.client.close()
@@ -2,17 +2,57 @@
 
 이 모듈은 .env에서 API 키를 읽어 OpenAI 클라이언트를 생성한 뒤,
 사용자 프롬프트를 GPT 모델에 전달하고 응답 텍스트를 출력합니다.
+프로젝트 루트에서 `python -m src.llm.run_gptAPI`로 실행합니다.
 """
 
 import os
+import asyncio
+import threading
 
 from dotenv import load_dotenv
 from openai import OpenAI
 from openpyxl import load_workbook
 from tqdm import tqdm  # tqdm 모듈 추가
 import json
-import re
-from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from src.llm.llm_client import AsyncLLMClient, RateLimiter, LLM_MAX_CONCURRENCY
+from src.llm.llm_cache import LLMResponseCache, make_llm_cache_key, usage_total
+from src.llm.batching import pack_batches, build_batch_prompt, batch_completion_params, split_batch_result
+from src.llm.json_extract import extract_json
+from src.llm.excel_journal import (
+    ExcelJournal, journal_path_for, apply_cells_to_workbook, stream_cells_to_workbook,
+)
+
+# 사용 가능한 모델명은 계정/권한에 따라 다를 수 있습니다.
+MODEL_NAME = "gpt-5"
+SYSTEM_PROMPT = "당신은 도움을 주는 어시스턴트입니다."
+COMPLETION_PARAMS = {
+    "temperature": 1,
+    "max_completion_tokens": 2024,
+    "reasoning_effort": "minimal",
+}
+INSTRUCTION = "키-값 쌍으로 JSON 뽑아줘"
+
+# 로컬 모의 서버 등 다른 API 주소를 쓸 때 설정하는 환경 변수
+BASE_URL_ENV_NAME = "OPENAI_BASE_URL"
+
+# 프롬프트/응답 디스크 캐시 (같은 모델/파라미터/지시문/원문이면 API 호출 생략)
+LLM_CACHE_ENABLED = True
+
+# 여러 셀을 한 요청으로 묶어 보내기 (배치 크기/토큰 예산은 src/llm/batching.py 참조)
+# 배치 응답이 깨졌거나 일부 ID가 빠진 셀은 셀 단위 요청으로 다시 보냄
+LLM_BATCHING = True
+
+# 스트리밍 엑셀 처리: 행을 읽는 대로 EXCEL_CHUNK_CELLS개씩 요청하고,
+# 결과는 저널에 바로 기록한 뒤 끝날 때(중단 포함) 한 번만 통합 문서에 반영
+EXCEL_STREAMING = True
+EXCEL_CHUNK_CELLS = 200
+# False: 통합 문서 전체를 한 번 읽어 결과를 쓰고 저장 (서식/수식/차트 유지, 끝날 때 시트 크기만큼 메모리 사용)
+# True: 행 단위로 별도 파일(<이름>_result.xlsx)에 다시 씀 (메모리 사용량이 시트 크기와 무관, 값만 옮김)
+EXCEL_STREAM_WRITE = False
+
+# 원문 열 -> 결과 열 (B -> C, D -> E)
+SOURCE_TARGET_COLUMNS = ((2, 3), (4, 5))
 
 
 def load_api_key(env_key_name="OPENAI_API_KEY"):
@@ -39,81 +79,254 @@ def create_client(api_key):
     return OpenAI(api_key=api_key)
 
 
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """프로세스 공용 OpenAI 클라이언트를 반환합니다. (처음 한 번만 생성하여 연결 풀 재사용)"""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = create_client(load_api_key())
+    return _client
+
+
 def run_gpt5(prompt):
     """주어진 프롬프트를 GPT 모델에 전달하고 응답 텍스트를 반환합니다."""
-    api_key = load_api_key()
-    client = create_client(api_key)
-
-    # 사용 가능한 모델명은 계정/권한에 따라 다를 수 있습니다.
-    model_name = "gpt-5"
+    client = get_client()
 
     completion = client.chat.completions.create(
-        model=model_name,
+        model=MODEL_NAME,
         messages=[
-            {"role": "system", "content": "당신은 도움을 주는 어시스턴트입니다."},
+            {"role": "system", "content": SYSTEM_PROMPT},
             {"role": "user", "content": prompt},
         ],
-        temperature=1,
-        max_completion_tokens=2024,
-        reasoning_effort="minimal",
+        **COMPLETION_PARAMS,
     )
 
     return completion.choices[0].message.content or ""
 
 
+def create_async_llm_client(base_url=None, max_concurrency=LLM_MAX_CONCURRENCY, rate_limiter=None):
+    """비동기 LLM 클라이언트를 생성합니다.
+
+    Args:
+        base_url: API 주소 (기본: 환경 변수 OPENAI_BASE_URL, 없으면 OpenAI)
+        max_concurrency: 동시 요청 수 상한
+        rate_limiter: 분당 요청/토큰 제한기 (기본 설정은 llm_client.py 참조)
+    """
+    return AsyncLLMClient(
+        api_key=load_api_key(),
+        model=MODEL_NAME,
+        system_prompt=SYSTEM_PROMPT,
+        completion_params=COMPLETION_PARAMS,
+        base_url=base_url or os.getenv(BASE_URL_ENV_NAME),
+        max_concurrency=max_concurrency,
+        rate_limiter=rate_limiter or RateLimiter(),
+    )
+
+
+async def run_prompts_async(prompts, client=None, desc="LLM calls", return_usage=False, postfix=None,
+                            on_result=None, extra_params=None):
+    """프롬프트 목록을 비동기로 보내고 입력 순서대로 (응답 또는 예외) 목록을 반환합니다.
+
+    on_result(인덱스, 응답 또는 예외)가 주어지면 요청이 끝날 때마다 호출합니다.
+    """
+    owns_client = client is None
+    client = client or create_async_llm_client()
+
+    def on_done(idx, result):
+        progress.update(1)
+        if on_result is not None:
+            on_result(idx, result)
+
+    try:
+        with tqdm(total=len(prompts), desc=desc, unit="req", postfix=postfix) as progress:
+            return await client.complete_many(
+                prompts, on_done=on_done, return_usage=return_usage, extra_params=extra_params,
+            )
+    finally:
+        if owns_client:
+            await client.close()
+
+
+_llm_cache = None
+
+
+def get_llm_cache():
+    """LLM 응답 캐시를 반환 (비활성화 상태면 None)"""
+    global _llm_cache
+    if not LLM_CACHE_ENABLED:
+        return None
+    if _llm_cache is None:
+        _llm_cache = LLMResponseCache()
+    return _llm_cache
+
+
+def build_prompt(text, instruction=INSTRUCTION):
+    """지시문과 원문으로 프롬프트 생성"""
+    return f"{instruction}\n\n원문:\n{text}"
+
+
+async def request_texts_single(texts, instruction, client, on_text_result, postfix=None):
+    """원문마다 요청 하나씩 보냄. 보낸 요청 수를 반환"""
+    await run_prompts_async(
+        [build_prompt(text, instruction) for text in texts], client,
+        return_usage=True, postfix=postfix,
+        on_result=lambda idx, result: on_text_result(texts[idx], result),
+    )
+    return len(texts)
+
+
+async def request_texts_batched(texts, instruction, client, on_text_result, postfix=None):
+    """원문들을 배치로 묶어 요청하고, 실패한 원문만 셀 단위로 다시 요청. 보낸 요청 수를 반환"""
+    batches = pack_batches(texts)
+    fallback = []
+
+    def on_batch(idx, result):
+        batch = batches[idx]
+        if isinstance(result, Exception):
+            fallback.extend(batch)
+            return
+        response, usage = result
+        results = split_batch_result(extract_json(response), len(batch))
+        # 배치 사용량은 셀 수로 나눠 캐시에 기록
+        share = {key: value // len(batch) for key, value in usage.items()}
+        for i, text in enumerate(batch):
+            if i in results:
+                on_text_result(text, (results[i], share))
+            else:
+                fallback.append(text)
+
+    await run_prompts_async(
+        [build_batch_prompt(batch, instruction) for batch in batches], client,
+        desc="LLM batch calls", return_usage=True, postfix=postfix, on_result=on_batch,
+        extra_params=[batch_completion_params(batch) for batch in batches],
+    )
+
+    requests = len(batches)
+    if fallback:
+        tqdm.write(f"배치 응답에서 빠진 {len(fallback)}개 셀을 개별 요청으로 다시 보냅니다.")
+        requests += await request_texts_single(fallback, instruction, client, on_text_result)
+    return requests
+
+
+def resolve_texts(texts, instruction=INSTRUCTION, client=None):
+    """resolve_texts_async의 동기 버전"""
+    return asyncio.run(resolve_texts_async(texts, instruction, client))
+
+
+async def resolve_texts_async(texts, instruction=INSTRUCTION, client=None, on_resolved=None):
+    """원문 목록의 LLM 응답을 구합니다. (중복 제거 + 디스크 캐시 + 배치 요청)
+
+    같은 원문은 한 번만 요청하고, 캐시에 있는 원문은 요청하지 않습니다.
+    LLM_BATCHING이면 남은 원문을 배치로 묶어 요청합니다.
+    on_resolved(원문, 응답 문자열 또는 예외)가 주어지면 원문마다 응답이 정해지는 즉시 호출합니다.
+
+    Returns:
+        ({원문: 응답 문자열 또는 예외}, 통계 dict)
+    """
+    cache = get_llm_cache()
+    unique_texts = list(dict.fromkeys(texts))
+    counts = {}
+    for text in texts:
+        counts[text] = counts.get(text, 0) + 1
+
+    responses = {}
+    usages = {}
+    keys = {}
+    cache_hits = 0
+    for text in unique_texts:
+        if cache is None:
+            continue
+        keys[text] = make_llm_cache_key(MODEL_NAME, COMPLETION_PARAMS, SYSTEM_PROMPT, instruction, text)
+        cached = cache.get(keys[text])
+        if cached is not None:
+            responses[text] = cached['response']
+            usages[text] = cached.get('usage')
+            cache_hits += 1
+            if on_resolved is not None:
+                on_resolved(text, cached['response'])
+
+    misses = [text for text in unique_texts if text not in responses]
+    stats = {
+        'cells': len(texts),
+        'unique': len(unique_texts),
+        'cache_hits': cache_hits,
+        'requests': 0,
+    }
+
+    def on_text_result(text, result):
+        if isinstance(result, Exception):
+            responses[text] = result
+        else:
+            response, usage = result
+            responses[text] = response
+            usages[text] = usage
+            if cache is not None:
+                cache.put(keys[text], response, usage)
+        if on_resolved is not None:
+            on_resolved(text, responses[text])
+
+    if misses:
+        postfix = {'dedup': len(texts) - len(unique_texts), 'cache_hit': cache_hits}
+        owns_client = client is None
+        client = client or create_async_llm_client()
+        try:
+            if LLM_BATCHING and len(misses) > 1:
+                stats['requests'] = await request_texts_batched(misses, instruction, client, on_text_result, postfix)
+            else:
+                stats['requests'] = await request_texts_single(misses, instruction, client, on_text_result, postfix)
+        finally:
+            if owns_client:
+                await client.close()
+
+    # 캐시 적중과 중복 셀 덕분에 보내지 않은 요청의 토큰 수
+    requested = set(misses)
+    saved_tokens = 0
+    for text in unique_texts:
+        reused = counts[text] - 1 if text in requested else counts[text]
+        saved_tokens += usage_total(usages.get(text)) * reused
+    stats['saved_tokens'] = saved_tokens
+    stats['misses'] = len(misses)
+    stats['hit_rate'] = (len(texts) - len(misses)) / len(texts) if texts else 0.0
+    return responses, stats
+
+
+def format_llm_stats(stats):
+    """resolve_texts 통계를 한 줄 요약으로 변환"""
+    return (f"셀 {stats['cells']}개 / 고유 원문 {stats['unique']}개 / 캐시 적중 {stats['cache_hits']}개 / "
+            f"API 요청 {stats['requests']}건 / 재사용률 {stats['hit_rate'] * 100:.1f}% / "
+            f"절약 토큰 약 {stats['saved_tokens']}")
+
+
 def extract_first_json(text):
-    """응답 문자열에서 첫 번째 유효한 JSON 객체만 추출하여 문자열로 반환.
+    """응답 문자열에서 첫 번째 유효한 JSON을 찾아 셀에 쓸 문자열로 반환 (없으면 빈 문자열)
 
-    - ```json ... ``` 코드블록이 있으면 내부만 파싱 시도
-    - 텍스트에 섞여 있을 경우 첫 번째 { ... } 범위를 찾아 파싱
+    - ```json ... ``` 코드블록이 있으면 내부를 먼저 파싱 시도
+    - 텍스트에 섞여 있을 경우 첫 번째 유효한 { ... } 객체를 파싱 (src/llm/json_extract.py 참조)
     """
-    if not text:
+    parsed = extract_json(text)
+    if parsed is None:
         return ""
+    return json.dumps(parsed, ensure_ascii=False)
 
-    code_block = re.search(r"```(?:json)?\s*([\s\S]*?)```", text, re.IGNORECASE)
-    if code_block:
-        candidate = code_block.group(1).strip()
-        try:
-            parsed = json.loads(candidate)
-            return json.dumps(parsed, ensure_ascii=False)
-        except Exception:
-            pass
-
-    brace_stack = []
-    start_idx = -1
-    for idx, ch in enumerate(text):
-        if ch == '{':
-            if not brace_stack:
-                start_idx = idx
-            brace_stack.append('{')
-        elif ch == '}':
-            if brace_stack:
-                brace_stack.pop()
-                if not brace_stack and start_idx != -1:
-                    candidate = text[start_idx:idx + 1]
-                    try:
-                        parsed = json.loads(candidate)
-                        return json.dumps(parsed, ensure_ascii=False)
-                    except Exception:
-                        start_idx = -1
-                        continue
-
-    return ""
-
-
-def process_excel(file_path):
+
+def process_excel(file_path, client=None):
     """B열과 D열의 텍스트를 LLM에 보내고, 결과를 각각 C열과 E열에 저장합니다.
 
     - 헤더는 1행에 있다고 가정하고 2행부터 처리합니다.
     - Bn -> Cn, Dn -> En 으로 기록합니다.
+    - client(AsyncLLMClient)를 주면 그 클라이언트로 요청합니다. (테스트용 모의 서버 등)
     """
     wb = load_workbook(filename=file_path)
     ws = wb.active
 
-    instruction = "키-값 쌍으로 JSON 뽑아줘"
+    instruction = INSTRUCTION
 
     # 2행부터 마지막 행까지 반복: 요청 목록 준비
-    tasks = []  # (row_idx, target_col, prompt)
+    tasks = []  # (row_idx, target_col, text)
     for row_idx in tqdm(range(2, ws.max_row + 1), desc="Preparing rows", unit="row"):
         b_val = ws.cell(row=row_idx, column=2).value  # B열
         d_val = ws.cell(row=row_idx, column=4).value  # D열
@@ -122,38 +335,144 @@ def process_excel(file_path):
         d_text = str(d_val).strip() if d_val is not None else ""
 
         if b_text:
-            b_prompt = f"{instruction}\n\n원문:\n{b_text}"
-            tasks.append((row_idx, 3, b_prompt))  # C열에 기록
+            tasks.append((row_idx, 3, b_text))  # C열에 기록
 
         if d_text:
-            d_prompt = f"{instruction}\n\n원문:\n{d_text}"
-            tasks.append((row_idx, 5, d_prompt))  # E열에 기록
+            tasks.append((row_idx, 5, d_text))  # E열에 기록
 
-    # 병렬 LLM 호출
+    # 비동기 LLM 호출 (동시 요청 수/분당 제한/재시도는 AsyncLLMClient가 담당)
+    # 같은 원문은 한 번만 요청하고, 이전 실행에서 캐시된 원문은 요청하지 않음
     if tasks:
-        max_workers = max(4, (os.cpu_count() or 4))
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            future_to_cell = {
-                executor.submit(run_gpt5, prompt): (row_idx, col)
-                for (row_idx, col, prompt) in tasks
-            }
-
-            for future in tqdm(as_completed(future_to_cell), total=len(future_to_cell), desc="LLM calls", unit="req"):
-                row_idx, col = future_to_cell[future]
-                try:
-                    resp = future.result()
-                    ws.cell(row=row_idx, column=col).value = extract_first_json(resp)
-                except Exception as e:
-                    ws.cell(row=row_idx, column=col).value = f"ERROR: {e}"
+        responses, stats = resolve_texts([text for (_, _, text) in tasks], instruction, client)
+        tqdm.write(f"LLM 요약: {format_llm_stats(stats)}")
+
+        for (row_idx, col, text) in tasks:
+            resp = responses[text]
+            if isinstance(resp, Exception):
+                ws.cell(row=row_idx, column=col).value = f"ERROR: {resp}"
+            else:
+                ws.cell(row=row_idx, column=col).value = extract_first_json(resp)
 
     wb.save(filename=file_path)
 
 
+def is_filled(value):
+    """이미 결과가 기록된 셀인지 확인 (ERROR: 셀은 다시 처리)"""
+    if value is None:
+        return False
+    text = str(value).strip()
+    return bool(text) and not text.startswith("ERROR:")
+
+
+def iter_excel_tasks(file_path, skip_cells=()):
+    """읽기 전용 모드로 행을 하나씩 읽어 (행, 결과 열, 원문)을 내보내는 제너레이터
+
+    결과 셀이 이미 채워져 있거나 skip_cells에 있는 셀은 건너뜁니다.
+    """
+    wb = load_workbook(filename=file_path, read_only=True)
+    try:
+        ws = wb.active
+        max_col = max(target for _, target in SOURCE_TARGET_COLUMNS)
+        # 읽기 전용 시트는 빈 행도 빈 튜플로 내보내므로 enumerate로 행 번호를 셈
+        for row_idx, row in enumerate(ws.iter_rows(min_row=2, max_col=max_col, values_only=True), start=2):
+            row = tuple(row) + (None,) * (max_col - len(row))
+            for source_col, target_col in SOURCE_TARGET_COLUMNS:
+                value = row[source_col - 1]
+                text = str(value).strip() if value is not None else ""
+                if not text or is_filled(row[target_col - 1]) or (row_idx, target_col) in skip_cells:
+                    continue
+                yield row_idx, target_col, text
+    finally:
+        wb.close()
+
+
+def merge_llm_stats(total, stats):
+    """청크별 resolve_texts 통계를 누적"""
+    for key in ('cells', 'unique', 'cache_hits', 'misses', 'requests', 'saved_tokens'):
+        total[key] = total.get(key, 0) + stats[key]
+    total['hit_rate'] = (total['cells'] - total['misses']) / total['cells'] if total['cells'] else 0.0
+    return total
+
+
+def process_excel_streaming(file_path, client=None, chunk_cells=EXCEL_CHUNK_CELLS):
+    """process_excel_streaming_async의 동기 버전"""
+    return asyncio.run(process_excel_streaming_async(file_path, client, chunk_cells))
+
+
+def write_cells(file_path, cells):
+    """결과 셀을 통합 문서에 반영 (EXCEL_STREAM_WRITE면 원본 대신 별도 파일에 행 단위로 씀)"""
+    if EXCEL_STREAM_WRITE:
+        output_path = stream_cells_to_workbook(file_path, cells)
+        if output_path:
+            tqdm.write(f"결과 파일: {output_path}")
+    else:
+        apply_cells_to_workbook(file_path, cells)
+
+
+async def process_excel_streaming_async(file_path, client=None, chunk_cells=EXCEL_CHUNK_CELLS):
+    """process_excel의 스트리밍/재개 가능 버전
+
+    - 행은 읽기 전용 모드로 하나씩 읽고 chunk_cells개씩 요청합니다.
+    - 완료된 (행, 열) 결과는 통합 문서 옆 저널(.journal.jsonl)에 바로 기록합니다.
+    - 통합 문서는 종료(중단 포함) 시 저널의 결과로 한 번만 씁니다. (write_cells)
+    - 재시작하면 저널에 있는 셀은 다시 요청하지 않고, 이미 채워진 셀도 건너뜁니다.
+    """
+    journal = ExcelJournal(journal_path_for(file_path))
+    recovered = set(journal.load())
+    if recovered:
+        tqdm.write(f"저널에서 이전 실행 결과 {len(recovered)}개 셀을 복구합니다.")
+
+    owns_client = client is None
+    client = client or create_async_llm_client()
+    errors = {}  # 오류 셀은 저널에 남기지 않아 다음 실행에서 다시 시도 {(행, 열): "ERROR: ..."}
+    total_stats = {}
+
+    async def resolve_chunk(chunk):
+        cells_by_text = {}
+        for row_idx, col, text in chunk:
+            cells_by_text.setdefault(text, []).append((row_idx, col))
+
+        def on_resolved(text, response):
+            for row_idx, col in cells_by_text[text]:
+                if isinstance(response, Exception):
+                    errors[(row_idx, col)] = f"ERROR: {response}"
+                else:
+                    journal.append(row_idx, col, extract_first_json(response))
+
+        _, stats = await resolve_texts_async([text for (_, _, text) in chunk], INSTRUCTION, client, on_resolved)
+        merge_llm_stats(total_stats, stats)
+
+    tasks = iter_excel_tasks(file_path, skip_cells=recovered)
+    try:
+        chunk = []
+        for task in tasks:
+            chunk.append(task)
+            if len(chunk) >= chunk_cells:
+                await resolve_chunk(chunk)
+                chunk = []
+        if chunk:
+            await resolve_chunk(chunk)
+    finally:
+        # 정상 종료/중단 모두 지금까지의 결과를 통합 문서에 반영 (실패하면 저널이 남아 다음 실행에서 복구)
+        tasks.close()
+        journal.close()
+        write_cells(file_path, {**errors, **journal.load()})
+        journal.remove()
+        if owns_client:
+            await client.close()
+
+    if total_stats:
+        tqdm.write(f"LLM 요약: {format_llm_stats(total_stats)}")
+
+
 def main():
     # 엑셀 파일 경로 (현재 파일 기준 동일 폴더)
     excel_path = os.path.join(os.path.dirname(__file__), "LLM API결과 테스트.xlsx")
     try:
-        process_excel(excel_path)
+        if EXCEL_STREAMING:
+            process_excel_streaming(excel_path)
+        else:
+            process_excel(excel_path)
         print(f"엑셀 처리 완료: {excel_path}")
     except Exception as e:
         print(f"오류: {e}")
@@ -0,0 +1,145 @@
+"""다중 해상도 OCR 모듈
+
+페이지 전체는 적당한 DPI로 한 번 OCR하고, 신뢰도가 낮은 줄만 PDF에서 고해상도로
+다시 래스터화하여 재인식합니다. 결과 좌표는 1차 패스(기준 DPI) 좌표계로 맞춥니다.
+"""
+import os
+import subprocess
+import tempfile
+from PIL import Image  # type: ignore
+from src.tesseract import ocr_data as od
+
+ADAPTIVE_BASE_DPI = 300       # 1차 패스 DPI (결과 좌표의 기준 해상도)
+ADAPTIVE_HIGH_DPI = 1200      # 재인식 DPI
+ADAPTIVE_CONF_THRESHOLD = 60  # 이 값 미만인 단어가 있는 줄을 재인식
+ADAPTIVE_REGION_PADDING = 6   # 재인식 영역 여백 (기준 DPI 픽셀)
+ADAPTIVE_RETRY_PSM = 6        # 재인식 영역은 단일 텍스트 블록으로 처리
+
+
+def find_low_confidence_regions(data, threshold=ADAPTIVE_CONF_THRESHOLD,
+                                padding=ADAPTIVE_REGION_PADDING, image_size=None):
+    """신뢰도가 낮은 단어가 속한 줄의 박스들을 병합하여 반환 (기준 DPI 좌표)"""
+    low_lines = set()
+    for i in od.word_indices(data):
+        if 0 <= float(data['conf'][i]) < threshold:
+            low_lines.add((data['block_num'][i], data['par_num'][i], data['line_num'][i]))
+    if not low_lines:
+        return []
+
+    # 줄 단위로 모든 단어 박스를 합쳐 줄 박스를 만듦
+    line_boxes = {}
+    for i in od.word_indices(data):
+        key = (data['block_num'][i], data['par_num'][i], data['line_num'][i])
+        if key not in low_lines:
+            continue
+        left, top, right, bottom = od.row_box(data, i)
+        if key in line_boxes:
+            ml, mt, mr, mb = line_boxes[key]
+            line_boxes[key] = (min(ml, left), min(mt, top), max(mr, right), max(mb, bottom))
+        else:
+            line_boxes[key] = (left, top, right, bottom)
+
+    regions = []
+    for left, top, right, bottom in line_boxes.values():
+        left, top = max(0, left - padding), max(0, top - padding)
+        right, bottom = right + padding, bottom + padding
+        if image_size is not None:
+            right, bottom = min(right, image_size[0]), min(bottom, image_size[1])
+        regions.append((left, top, right, bottom))
+
+    return od.merge_boxes(regions)
+
+
+def rasterize_pdf_region(pdf_path, page_number, dpi, box):
+    """pdftoppm의 -x/-y/-W/-H 옵션으로 페이지의 일부 영역만 래스터화
+
+    box는 dpi 해상도 기준 픽셀 좌표 (left, top, right, bottom)입니다.
+    """
+    left, top, right, bottom = box
+    with tempfile.TemporaryDirectory() as temp_dir:
+        output_root = os.path.join(temp_dir, "region")
+        command = [
+            "pdftoppm", "-f", str(page_number), "-l", str(page_number),
+            "-r", str(dpi),
+            "-x", str(left), "-y", str(top),
+            "-W", str(right - left), "-H", str(bottom - top),
+            "-png", "-singlefile", pdf_path, output_root,
+        ]
+        subprocess.run(command, check=True, capture_output=True)
+        with Image.open(output_root + ".png") as region:
+            return region.convert('RGB')
+
+
+def word_center(data, i):
+    left, top, right, bottom = od.row_box(data, i)
+    return (left + right) / 2, (top + bottom) / 2
+
+
+def replace_region_words(data, region, region_data, threshold=ADAPTIVE_CONF_THRESHOLD):
+    """영역 안의 저신뢰 1차 단어들을 재인식 결과로 교체 (평균 신뢰도가 나아진 경우만)
+
+    신뢰도가 threshold 이상인 1차 단어는 그대로 두고, 그 단어와 겹치는(중심이 그 박스 안에 있는)
+    재인식 단어는 버립니다. 재인식 단어는 블록/문단/줄 행과 함께 새 블록 번호로 추가합니다.
+    """
+    low, kept_boxes = [], []
+    for i in od.word_indices(data):
+        if not od.box_contains_point(region, *word_center(data, i)):
+            continue
+        if float(data['conf'][i]) < threshold:
+            low.append(i)
+        else:
+            kept_boxes.append(od.row_box(data, i))
+
+    new_words = [j for j in od.word_indices(region_data, min_conf=0)
+                 if not any(od.box_contains_point(box, *word_center(region_data, j)) for box in kept_boxes)]
+    if not low or not new_words:
+        return data, False
+
+    old_conf = sum(float(data['conf'][i]) for i in low) / len(low)
+    new_conf = sum(float(region_data['conf'][j]) for j in new_words) / len(new_words)
+    if new_conf <= old_conf:
+        return data, False
+
+    kept = od.drop_words(data, low)
+    max_block = max([b for b in data['block_num'] if isinstance(b, int)] or [0])
+    added = od.offset_block_numbers(od.select_words_with_structure(region_data, new_words), max_block)
+    return od.concat_ocr_data(kept, added), True
+
+
+def refine_low_confidence_regions(data, pdf_path, page_number, ocr_region,
+                                  base_dpi=ADAPTIVE_BASE_DPI, high_dpi=ADAPTIVE_HIGH_DPI,
+                                  threshold=ADAPTIVE_CONF_THRESHOLD, image_size=None):
+    """1차 image_to_data 결과에서 신뢰도가 낮은 영역만 고해상도로 재인식하여 병합
+
+    Args:
+        data: 기준 DPI로 얻은 image_to_data 결과
+        pdf_path, page_number: 재래스터화할 PDF와 페이지 번호(1부터)
+        ocr_region: 고해상도 영역 이미지를 받아 image_to_data 결과를 돌려주는 함수
+        image_size: 기준 DPI 페이지 크기 (width, height)
+
+    Returns:
+        (병합된 결과, 재인식한 영역 수)
+    """
+    regions = find_low_confidence_regions(data, threshold, image_size=image_size)
+    scale = high_dpi / base_dpi
+    refined = 0
+
+    for region in regions:
+        high_box = tuple(int(round(v * scale)) for v in region)
+        try:
+            region_image = rasterize_pdf_region(pdf_path, page_number, high_dpi, high_box)
+        except Exception as e:
+            print(f"⚠️ 고해상도 영역 변환 실패 (페이지 {page_number}, {region}): {e}")
+            continue
+
+        try:
+            region_data = ocr_region(region_image)
+        except Exception as e:
+            print(f"⚠️ 고해상도 영역 OCR 실패 (페이지 {page_number}, {region}): {e}")
+            continue
+        # 고해상도 영역 좌표 -> 기준 DPI 페이지 좌표
+        region_data = od.transform_boxes(region_data, 1 / scale, (region[0], region[1]))
+        data, replaced = replace_region_words(data, region, region_data, threshold)
+        refined += int(replaced)
+
+    return data, refined
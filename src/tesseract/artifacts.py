@@ -0,0 +1,150 @@
+"""OCR 부산물 이미지(원본/전처리/바운딩 박스) 저장 모듈
+
+고해상도 PNG 압축은 OCR보다 오래 걸리는 경우가 많으므로, 저장 정책을 고를 수 있게 하고
+인코딩은 별도 백그라운드 스레드 풀에서 수행하여 OCR 워커를 막지 않도록 합니다.
+"""
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import cv2  # type: ignore
+import numpy as np
+from PIL import Image  # type: ignore
+from src.tesseract.metrics import get_metrics_recorder
+
+# none: 저장 안 함 / thumbnail: 축소본 PNG / fast_png: 저압축 PNG
+# jpeg, webp: 손실 압축 / full: 기존과 같은 원본 해상도 PNG
+ARTIFACT_POLICY_LIST = ["none", "thumbnail", "fast_png", "jpeg", "webp", "full"]
+ARTIFACT_POLICY = "full"
+
+# 저장할 부산물 종류 (예: 운영 환경에서는 {"boxed"}만 두고 thumbnail 정책 사용)
+ARTIFACT_KINDS = {"original", "processed", "boxed"}
+
+ARTIFACT_MAX_DIMENSION = 1600   # thumbnail 정책의 긴 변 최대 픽셀
+ARTIFACT_FAST_PNG_COMPRESSION = 1
+ARTIFACT_LOSSY_QUALITY = 85     # jpeg/webp 품질
+
+ARTIFACT_WRITER_WORKERS = 2     # 백그라운드 인코딩 스레드 수
+ARTIFACT_MAX_PENDING = 8        # 대기 중인 부산물 수 상한 (초과 시 OCR 워커가 대기)
+
+EXTENSIONS = {"thumbnail": ".png", "fast_png": ".png", "jpeg": ".jpg", "webp": ".webp", "full": ".png"}
+
+
+def resize_to_max_dimension(image, max_dimension):
+    """긴 변이 max_dimension을 넘으면 비율을 유지하여 축소"""
+    if isinstance(image, np.ndarray):
+        height, width = image.shape[:2]
+    else:
+        width, height = image.size
+    scale = max_dimension / max(width, height)
+    if scale >= 1:
+        return image
+
+    size = (max(1, int(width * scale)), max(1, int(height * scale)))
+    if isinstance(image, np.ndarray):
+        return cv2.resize(image, size, interpolation=cv2.INTER_AREA)  # type: ignore
+    return image.resize(size, Image.BILINEAR, reducing_gap=2.0)
+
+
+def save_artifact(image, base_path, policy=ARTIFACT_POLICY, max_dimension=ARTIFACT_MAX_DIMENSION):
+    """정책에 따라 이미지를 인코딩하여 저장하고 경로를 반환 (base_path는 확장자 제외)"""
+    path = base_path + EXTENSIONS[policy]
+    if policy == "thumbnail":
+        image = resize_to_max_dimension(image, max_dimension)
+
+    if isinstance(image, np.ndarray):
+        params = []
+        if policy in ("thumbnail", "fast_png"):
+            params = [cv2.IMWRITE_PNG_COMPRESSION, ARTIFACT_FAST_PNG_COMPRESSION]
+        elif policy == "jpeg":
+            params = [cv2.IMWRITE_JPEG_QUALITY, ARTIFACT_LOSSY_QUALITY]
+        elif policy == "webp":
+            params = [cv2.IMWRITE_WEBP_QUALITY, ARTIFACT_LOSSY_QUALITY]
+        cv2.imwrite(path, image, params)  # type: ignore
+        return path
+
+    if policy in ("thumbnail", "fast_png"):
+        image.save(path, compress_level=ARTIFACT_FAST_PNG_COMPRESSION)
+    elif policy in ("jpeg", "webp"):
+        if image.mode not in ("RGB", "L"):
+            image = image.convert("RGB")
+        image.save(path, quality=ARTIFACT_LOSSY_QUALITY)
+    else:
+        image.save(path)
+    return path
+
+
+class ArtifactWriter:
+    """부산물 이미지를 백그라운드 스레드에서 인코딩/저장하는 클래스
+
+    submit은 저장될 경로를 바로 반환하고, 실제 쓰기는 flush()에서 완료를 보장합니다.
+    """
+
+    def __init__(self, policy=ARTIFACT_POLICY, kinds=None, max_workers=ARTIFACT_WRITER_WORKERS,
+                 max_pending=ARTIFACT_MAX_PENDING, background=True):
+        if policy not in ARTIFACT_POLICY_LIST:
+            raise ValueError(f"지원하지 않는 부산물 저장 정책: {policy}")
+        self.policy = policy
+        self.kinds = set(ARTIFACT_KINDS if kinds is None else kinds)
+        self.background = background
+        self._executor = ThreadPoolExecutor(max_workers=max_workers) if background else None
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._futures = []
+        self._lock = threading.Lock()
+
+    def wants(self, kind):
+        """해당 종류의 부산물을 저장하는지 여부"""
+        return self.policy != "none" and kind in self.kinds
+
+    def submit(self, kind, image_or_factory, base_path):
+        """부산물 저장을 예약하고 저장 경로를 반환 (저장하지 않으면 None)
+
+        image_or_factory가 호출 가능하면 백그라운드에서 호출하여 이미지를 만듭니다.
+        (바운딩 박스 그리기처럼 저장할 때만 필요한 작업을 OCR 워커에서 빼기 위함)
+        """
+        if not self.wants(kind):
+            return None
+        path = base_path + EXTENSIONS[self.policy]
+
+        if not self.background:
+            self._write(kind, image_or_factory, base_path)
+            return path
+
+        self._slots.acquire()  # 대기 중인 부산물이 너무 많으면 여기서 대기
+        future = self._executor.submit(self._write, kind, image_or_factory, base_path)
+        future.add_done_callback(lambda _: self._slots.release())
+        with self._lock:
+            self._futures = [f for f in self._futures if not f.done()]
+            self._futures.append(future)
+        return path
+
+    def _write(self, kind, image_or_factory, base_path):
+        # 그리기/인코딩 시간은 실행 지표에 부산물 종류별로 합산
+        start = time.perf_counter()
+        try:
+            image = image_or_factory() if callable(image_or_factory) else image_or_factory
+            return save_artifact(image, base_path, self.policy)
+        finally:
+            get_metrics_recorder().record_stage(f"artifact_{kind}", time.perf_counter() - start)
+
+    def flush(self):
+        """예약된 저장 작업이 모두 끝날 때까지 대기"""
+        with self._lock:
+            futures, self._futures = self._futures, []
+        for future in futures:
+            try:
+                future.result()
+            except Exception as e:
+                print(f"⚠️ 부산물 이미지 저장 실패: {e}")
+
+
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def get_artifact_writer():
+    """프로세스 공용 ArtifactWriter 반환"""
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = ArtifactWriter()
+    return _writer
@@ -0,0 +1,95 @@
+"""image_to_data 결과의 컬럼형 바이너리 저장/로드 모듈
+
+숫자 컬럼은 구조화 numpy 배열 하나(.npy, 메모리 매핑 가능)에 저장하고,
+텍스트는 UTF-8 바이트를 이어 붙인 문자열 테이블(.bin)에 저장합니다.
+각 행은 문자열 테이블의 [text_start, text_end) 구간을 가리킵니다.
+"""
+import os
+import numpy as np
+from src.tesseract.ocr_backend import TSV_COLUMNS
+
+COLUMNAR_DTYPE = np.dtype([
+    ("level", np.int8),
+    ("page_num", np.int32),
+    ("block_num", np.int32),
+    ("par_num", np.int32),
+    ("line_num", np.int32),
+    ("word_num", np.int32),
+    ("left", np.int32),
+    ("top", np.int32),
+    ("width", np.int32),
+    ("height", np.int32),
+    ("conf", np.float32),
+    ("text_start", np.int64),
+    ("text_end", np.int64),
+])
+
+NUMERIC_COLUMNS = [c for c in TSV_COLUMNS if c != "text"]
+TEXT_TABLE_SUFFIX = "_text.bin"
+
+
+def columnar_paths(base_path):
+    """(숫자 컬럼 .npy 경로, 문자열 테이블 경로)"""
+    return f"{base_path}.npy", f"{base_path}{TEXT_TABLE_SUFFIX}"
+
+
+def to_columnar(data, prune=True):
+    """image_to_data dict를 (구조화 배열, 문자열 테이블 바이트)로 변환
+
+    prune이 True면 단어(level 5)가 아니거나 텍스트가 빈 행(conf=-1 행 포함)을 제외합니다.
+    """
+    level = np.asarray(data['level'], dtype=np.int8)
+    texts = data['text']
+    if prune:
+        has_text = np.char.str_len(np.char.strip(np.asarray(texts, dtype=str))) > 0
+        keep = np.flatnonzero((level == 5) & has_text)
+    else:
+        keep = np.arange(len(level))
+
+    table = np.empty(len(keep), dtype=COLUMNAR_DTYPE)
+    for column in NUMERIC_COLUMNS:
+        table[column] = np.asarray(data[column])[keep]
+
+    encoded = [texts[i].encode('utf-8') for i in keep.tolist()]
+    lengths = np.fromiter((len(b) for b in encoded), dtype=np.int64, count=len(encoded))
+    table['text_end'] = np.cumsum(lengths)
+    table['text_start'] = table['text_end'] - lengths
+    return table, b''.join(encoded)
+
+
+def save_columnar_result(data, base_path, prune=True):
+    """image_to_data 결과를 컬럼형 파일로 저장하고 (npy 경로, 문자열 테이블 경로) 반환"""
+    npy_path, text_path = columnar_paths(base_path)
+    table, text_blob = to_columnar(data, prune)
+    np.save(npy_path, table, allow_pickle=False)
+    with open(text_path, 'wb') as f:
+        f.write(text_blob)
+    return npy_path, text_path
+
+
+def load_columnar_arrays(base_path, mmap=True):
+    """컬럼형 파일을 (구조화 배열, 문자열 테이블)로 로드 (mmap이면 메모리 매핑)"""
+    npy_path, text_path = columnar_paths(base_path)
+    table = np.load(npy_path, mmap_mode='r' if mmap else None, allow_pickle=False)
+    if mmap:
+        text_blob = np.memmap(text_path, dtype=np.uint8, mode='r') if os.path.getsize(text_path) else b''
+    else:
+        with open(text_path, 'rb') as f:
+            text_blob = f.read()
+    return table, text_blob
+
+
+def load_columnar_result(base_path, mmap=True):
+    """컬럼형 파일을 image_to_data와 같은 dict of lists 형태로 로드
+
+    문자열 테이블은 행마다 자기 구간만 잘라 디코딩하므로 테이블 전체를 메모리로 복사하지 않습니다.
+    """
+    table, text_blob = load_columnar_arrays(base_path, mmap)
+    result = {column: table[column].tolist() for column in NUMERIC_COLUMNS}
+    result['conf'] = [int(c) if float(c).is_integer() else c for c in result['conf']]
+    result['text'] = [
+        bytes(text_blob[start:end]).decode('utf-8')
+        for start, end in zip(table['text_start'].tolist(), table['text_end'].tolist())
+    ]
+    return {column: result[column] for column in TSV_COLUMNS}
+
@@ -0,0 +1,188 @@
+"""OCR 단계별 시간/메모리 계측 모듈
+
+페이지마다 단계(불러오기/전처리/OCR/결과 저장/부산물 저장)별 소요 시간과 최대 메모리를 재고,
+실행 한 번의 페이지별 지표와 단계별 합계를 JSON 파일로 남깁니다.
+백그라운드 부산물 인코딩, PDF 래스터화처럼 페이지 결과에 묶기 어려운 단계는 실행 단위로 합산합니다.
+"""
+import sys
+import json
+import time
+import platform
+import threading
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+
+try:
+    import resource
+except ImportError:  # Windows에는 resource 모듈이 없음
+    resource = None
+
+METRICS_ENABLED = True
+
+
+def peak_rss_mb():
+    """프로세스 최대 상주 메모리(MB). 측정할 수 없는 환경이면 None"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux는 KB, macOS는 바이트 단위
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return round(peak / divisor, 1)
+
+
+def image_megabytes(image):
+    """이미지 버퍼 크기(MB) (numpy 배열 또는 PIL 이미지)"""
+    if hasattr(image, 'nbytes'):
+        return round(image.nbytes / (1024 * 1024), 2)
+    if hasattr(image, 'size') and hasattr(image, 'getbands'):
+        width, height = image.size
+        return round(width * height * len(image.getbands()) / (1024 * 1024), 2)
+    return None
+
+
+class StageTimer:
+    """단계 이름별 소요 시간(초)을 누적하는 타이머"""
+
+    def __init__(self):
+        self.stages = {}
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + time.perf_counter() - start
+
+    def as_dict(self):
+        return {name: round(seconds, 4) for name, seconds in self.stages.items()}
+
+
+class MetricsRecorder:
+    """실행 한 번의 페이지별 지표와 단계별 합계를 모으는 클래스 (스레드 안전)
+
+    max_pages를 지정하면 페이지별 지표는 최근 max_pages개만 보관합니다. (오래 실행되는 서비스용)
+    요약의 페이지 수/판정 수/단계별 합계는 보관 개수와 관계없이 전체를 셉니다.
+    실행 매니페스트에서 재사용한 페이지는 처리하지 않았으므로 'pages'와 처리량에 넣지 않고 'manifest_reused'로 따로 셉니다.
+    """
+
+    def __init__(self, config=None, max_pages=None):
+        self.config = dict(config or {})
+        self.started = datetime.now()
+        self._start = time.perf_counter()
+        self.pages = deque(maxlen=max_pages)
+        self.stage_totals = {}
+        self.counts = {'pages': 0, 'success': 0, 'manifest_reused': 0, 'blank_skipped': 0, 'rotated': 0,
+                       'deskewed': 0, 'lines': 0, 'second_pass_lines': 0, 'hangul_lines': 0}
+        self.second_pass_area = 0.0
+        self._lock = threading.Lock()
+
+    def record_stage(self, name, seconds):
+        """페이지에 묶이지 않는 단계 시간을 합산 (래스터화, 백그라운드 인코딩 등)"""
+        if not METRICS_ENABLED:
+            return
+        with self._lock:
+            self.stage_totals[name] = self.stage_totals.get(name, 0.0) + seconds
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_stage(name, time.perf_counter() - start)
+
+    def record_page(self, page_info, result):
+        """페이지 처리 결과 dict의 'metrics'를 기록"""
+        if not METRICS_ENABLED:
+            return
+        metrics = result.get('metrics') or {}
+        entry = {
+            'page_info': page_info,
+            'success': result.get('success', False),
+            'cache_hit': bool(result.get('cache_hit')),
+            'text_layer': bool(result.get('text_layer')),
+            'manifest_reused': bool(result.get('manifest_reused')),
+            'page_triage': result.get('page_triage'),
+            'second_pass': result.get('second_pass'),
+            **metrics,
+        }
+        triage = entry['page_triage'] or {}
+        second_pass = entry['second_pass'] or {}
+        with self._lock:
+            self.pages.append(entry)
+            if entry['manifest_reused']:
+                self.counts['manifest_reused'] += 1
+                return
+            self.counts['pages'] += 1
+            self.counts['success'] += bool(entry['success'])
+            self.counts['blank_skipped'] += bool(triage.get('blank'))
+            self.counts['rotated'] += bool(triage.get('rotation'))
+            self.counts['deskewed'] += bool(triage.get('skew'))
+            for key in ('lines', 'second_pass_lines', 'hangul_lines'):
+                self.counts[key] += second_pass.get(key, 0)
+            self.second_pass_area += second_pass.get('area_ratio', 0.0)
+            for name, seconds in metrics.get('stages', {}).items():
+                self.stage_totals[name] = self.stage_totals.get(name, 0.0) + seconds
+
+    def summary(self):
+        """실행 요약 (소요 시간, 처리량, 사전 판정 결과 수, 단계별 합계, 최대 메모리)"""
+        elapsed = time.perf_counter() - self._start
+        with self._lock:
+            counts = dict(self.counts)
+            second_pass_area = self.second_pass_area
+            stage_totals = {name: round(seconds, 4) for name, seconds in self.stage_totals.items()}
+        return {
+            'elapsed': round(elapsed, 4),
+            **counts,
+            'pages_per_second': round(counts['pages'] / elapsed, 4) if elapsed > 0 else None,
+            'second_pass_line_ratio': round(counts['second_pass_lines'] / counts['lines'], 4) if counts['lines'] else None,
+            'second_pass_area_ratio': round(second_pass_area / counts['pages'], 4) if counts['pages'] else None,
+            'stage_totals': dict(sorted(stage_totals.items(), key=lambda item: -item[1])),
+            'peak_rss_mb': peak_rss_mb(),
+        }
+
+    def to_dict(self):
+        with self._lock:
+            pages = list(self.pages)
+        return {
+            'started': self.started.isoformat(timespec='seconds'),
+            'host': {'python': platform.python_version(), 'platform': platform.platform()},
+            'config': self.config,
+            'summary': self.summary(),
+            'pages': pages,
+        }
+
+    def write(self, path):
+        """지표를 JSON 파일로 저장하고 경로를 반환"""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+        return path
+
+
+def format_stage_totals(stage_totals, limit=8):
+    """단계별 합계를 '단계 1.23s' 형태의 한 줄로 변환 (오래 걸린 순)"""
+    items = sorted(stage_totals.items(), key=lambda item: -item[1])[:limit]
+    return ", ".join(f"{name} {seconds:.2f}s" for name, seconds in items)
+
+
+_recorder = None
+_recorder_lock = threading.Lock()
+
+
+def get_metrics_recorder():
+    """프로세스 공용 MetricsRecorder 반환"""
+    global _recorder
+    with _recorder_lock:
+        if _recorder is None:
+            _recorder = MetricsRecorder()
+    return _recorder
+
+
+def reset_metrics_recorder(config=None, max_pages=None):
+    """새 실행을 위해 공용 MetricsRecorder를 새로 만들어 반환"""
+    global _recorder
+    with _recorder_lock:
+        _recorder = MetricsRecorder(config, max_pages)
+    return _recorder
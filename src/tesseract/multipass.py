@@ -0,0 +1,256 @@
+"""다중 패스 OCR 모듈
+
+한국어/영어가 섞인 문서를 매번 kor+eng로 OCR하면 비용이 두 배 가까이 들므로,
+1차는 빠른 eng 모델로 페이지 전체를 읽고 아래 줄만 2차로 다시 읽습니다.
+- 평균 신뢰도가 낮은 줄: 다른 페이지 분할 모드(PSM)로 재인식
+- 한글처럼 보이는 줄(글자 칸이 정사각형에 가까움): kor+eng로 재인식
+2차 결과는 단어 단위로 1차 단어와 겹치는지 보고 신뢰도가 높은 쪽을 남기며,
+원래 줄의 위치(읽기 순서)를 유지합니다.
+"""
+import threading
+import numpy as np
+from src.tesseract import ocr_data as od
+from src.tesseract.ocr_backend import TSV_COLUMNS
+
+MULTIPASS_CONF_THRESHOLD = 60       # 줄 평균 신뢰도가 이 값 미만이면 2차 패스
+SECOND_PASS_LANGUAGE = "kor+eng"    # 한글처럼 보이는 줄의 2차 언어
+SECOND_PASS_LINE_PSM = 7            # 한 줄짜리 영역 (단일 텍스트 줄)
+SECOND_PASS_BLOCK_PSM = 6           # 여러 줄이 합쳐진 영역 (단일 텍스트 블록)
+SECOND_PASS_PADDING_RATIO = 0.25    # 영역 여백 (줄 높이 대비)
+SECOND_PASS_MIN_PADDING = 4
+
+# 한글 판정: 열 투영으로 나눈 글자 칸 중 정사각형에 가까운 칸의 비율
+# (라틴 문자는 폭이 줄 높이의 절반 안팎, 한글 음절은 거의 정사각형)
+HANGUL_INK_THRESHOLD = 128
+HANGUL_SQUARE_ASPECT = (0.75, 1.3)  # 칸 폭 / 줄 글자 높이
+HANGUL_SQUARE_CELL_RATIO = 0.35     # 이 비율 이상이면 한글처럼 보이는 줄
+HANGUL_MIN_CELLS = 2
+
+WORD_OVERLAP_RATIO = 0.5            # 두 단어 박스가 작은 쪽 면적의 이 비율 이상 겹치면 같은 단어로 봄
+
+_warned = set()
+_warned_lock = threading.Lock()
+
+
+def warn_once(key, message):
+    with _warned_lock:
+        if key in _warned:
+            return
+        _warned.add(key)
+    print(message)
+
+
+def group_lines(data):
+    """단어 행을 (블록, 문단, 줄)별로 묶음 -> {줄 키: [행 인덱스, ...]} (처음 나온 순서)"""
+    lines = {}
+    for i in od.word_indices(data):
+        lines.setdefault((data['block_num'][i], data['par_num'][i], data['line_num'][i]), []).append(i)
+    return lines
+
+
+def line_box(data, rows):
+    boxes = [od.row_box(data, i) for i in rows]
+    return min(b[0] for b in boxes), min(b[1] for b in boxes), max(b[2] for b in boxes), max(b[3] for b in boxes)
+
+
+def mean_conf(data, rows):
+    return sum(float(data['conf'][i]) for i in rows) / len(rows) if rows else -1.0
+
+
+def to_gray_array(image):
+    """numpy 그레이스케일 배열로 변환 (전처리 결과는 이미 그레이스케일 배열)"""
+    array = np.asarray(image)
+    if array.ndim == 3:
+        array = array.mean(axis=2).astype(np.uint8)
+    return array
+
+
+def hangul_like(gray, box):
+    """줄 영역의 글자 칸(열 투영으로 나눈 잉크 구간) 중 정사각형에 가까운 칸이 많은지 판단"""
+    left, top, right, bottom = box
+    ink = gray[top:bottom, left:right] < HANGUL_INK_THRESHOLD
+    if not ink.size:
+        return False
+    rows = np.flatnonzero(ink.any(axis=1))
+    if rows.size == 0:
+        return False
+    height = rows[-1] - rows[0] + 1
+
+    columns = ink.any(axis=0).astype(np.int8)
+    edges = np.diff(np.concatenate(([0], columns, [0])))
+    widths = np.flatnonzero(edges == -1) - np.flatnonzero(edges == 1)
+    widths = widths[widths >= 2]  # 잡음/구두점 제외
+    if widths.size < HANGUL_MIN_CELLS:
+        return False
+    low, high = HANGUL_SQUARE_ASPECT
+    square = np.count_nonzero((widths >= low * height) & (widths <= high * height))
+    return square / widths.size >= HANGUL_SQUARE_CELL_RATIO
+
+
+def find_second_pass_lines(data, gray, threshold=MULTIPASS_CONF_THRESHOLD):
+    """2차 패스가 필요한 줄 -> {줄 키: (줄 박스, 한글 여부)} 와 전체 줄 목록"""
+    lines = group_lines(data)
+    flagged = {}
+    for key, rows in lines.items():
+        box = line_box(data, rows)
+        hangul = hangul_like(gray, box)
+        if hangul or mean_conf(data, rows) < threshold:
+            flagged[key] = (box, hangul)
+    return flagged, lines
+
+
+def plan_regions(flagged, image_size):
+    """2차 패스 줄들을 여백을 두고 병합한 영역 목록 [(박스, {줄 키: 여백 포함 줄 박스}, 한글 포함 여부)]"""
+    width, height = image_size
+    padded = {}
+    for key, ((left, top, right, bottom), _) in flagged.items():
+        pad = max(SECOND_PASS_MIN_PADDING, int((bottom - top) * SECOND_PASS_PADDING_RATIO))
+        padded[key] = (max(0, left - pad), max(0, top - pad), min(width, right + pad), min(height, bottom + pad))
+
+    regions = []
+    for box in od.merge_boxes(list(padded.values())):
+        keys = {key: line for key, line in padded.items() if od.box_contains_point(box, line[0], line[1])}
+        regions.append((box, keys, any(flagged[key][1] for key in keys)))
+    return regions
+
+
+def overlap_ratio(a, b):
+    """두 박스의 교집합 면적 / 작은 박스 면적"""
+    width = min(a[2], b[2]) - max(a[0], b[0])
+    height = min(a[3], b[3]) - max(a[1], b[1])
+    if width <= 0 or height <= 0:
+        return 0.0
+    smaller = min((a[2] - a[0]) * (a[3] - a[1]), (b[2] - b[0]) * (b[3] - b[1]))
+    return width * height / smaller if smaller > 0 else 0.0
+
+
+def box_center(box):
+    return (box[0] + box[2]) / 2, (box[1] + box[3]) / 2
+
+
+def target_line(box, padded_lines):
+    """단어 중심을 포함하는 여백 포함 줄 박스 중 세로 중심이 가장 가까운 줄 키 (없으면 None)"""
+    x, y = box_center(box)
+    inside = [key for key, line in padded_lines.items() if od.box_contains_point(line, x, y)]
+    if not inside:
+        return None
+    return min(inside, key=lambda key: abs((padded_lines[key][1] + padded_lines[key][3]) / 2 - y))
+
+
+def merge_region_words(data, lines, region_box, padded_lines, region_data):
+    """영역의 2차 단어를 영역 안의 1차 단어와 단어 단위로 비교하여 2차 패스 줄별 최종 단어 목록을 만듦
+
+    - 중심이 2차 패스 줄(여백 포함) 박스 밖에 있는 2차 단어는 버림
+    - 2차 패스 대상이 아닌 줄(병합 영역에 함께 들어간 신뢰도 높은 줄)의 단어와 겹치면 버림
+    - 겹치는 2차 패스 줄 단어들의 평균 신뢰도보다 높으면 교체하고, 겹치는 단어가 없으면 추가
+
+    Returns:
+        ({줄 키: [(left, top, width, height, conf, text), ...]}, 교체/추가한 단어 수)
+    """
+    region_keys = list(padded_lines)
+    row_line = {}
+    for key, rows in lines.items():
+        for i in rows:
+            if od.box_contains_point(region_box, *box_center(od.row_box(data, i))):
+                row_line[i] = key
+    removed = set()
+    added = {key: [] for key in region_keys}
+    changed = 0
+
+    for j in od.word_indices(region_data, min_conf=0):
+        box = od.row_box(region_data, j)
+        key = target_line(box, padded_lines)
+        if key is None:
+            continue
+        overlaps = [i for i in row_line
+                    if i not in removed and overlap_ratio(box, od.row_box(data, i)) >= WORD_OVERLAP_RATIO]
+        if any(row_line[i] not in padded_lines for i in overlaps):
+            continue
+        conf = float(region_data['conf'][j])
+        if overlaps and conf <= mean_conf(data, overlaps):
+            continue
+        removed.update(overlaps)
+        added[key].append((
+            region_data['left'][j], region_data['top'][j], region_data['width'][j], region_data['height'][j],
+            region_data['conf'][j], region_data['text'][j],
+        ))
+        changed += 1
+
+    final = {}
+    for key in region_keys:
+        words = [(data['left'][i], data['top'][i], data['width'][i], data['height'][i], data['conf'][i], data['text'][i])
+                 for i in lines[key] if i not in removed]
+        final[key] = sorted(words + added[key], key=lambda word: word[0])
+    return final, changed
+
+
+def rebuild_lines(data, lines, replacements):
+    """원래 행 순서를 유지하면서 교체된 줄의 단어 행만 새 단어 목록으로 바꿈"""
+    result = od.empty_ocr_data()
+    emitted = set()
+    row_to_line = {i: key for key, rows in lines.items() for i in rows}
+    for i in range(od.row_count(data)):
+        key = row_to_line.get(i)
+        if key is None or key not in replacements:
+            for column in result:
+                result[column].append(data[column][i])
+            continue
+        if key in emitted:
+            continue
+        emitted.add(key)
+        block_num, par_num, line_num = key
+        for word_num, (left, top, width, height, conf, text) in enumerate(replacements[key], 1):
+            for column, value in zip(TSV_COLUMNS, (
+                od.WORD_LEVEL, data['page_num'][i], block_num, par_num, line_num, word_num,
+                left, top, width, height, conf, text,
+            )):
+                result[column].append(value)
+    return result
+
+
+def second_pass_ocr(data, image, ocr_region, lang=None, threshold=MULTIPASS_CONF_THRESHOLD,
+                    second_language=SECOND_PASS_LANGUAGE):
+    """1차 image_to_data 결과에서 필요한 줄만 2차 OCR하여 단어 단위로 병합
+
+    Args:
+        data: 1차(eng) image_to_data 결과 (image 좌표)
+        image: 1차 OCR에 쓴 전처리 이미지
+        ocr_region: ocr_region(영역 이미지, lang, psm) -> image_to_data 결과
+        lang: 신뢰도만 낮은 줄의 2차 언어 (None이면 1차와 같은 기본 언어)
+        second_language: 한글처럼 보이는 줄의 2차 언어
+
+    Returns:
+        (병합된 결과, 통계 {'lines', 'second_pass_lines', 'hangul_lines', 'regions', 'area_ratio', 'changed_words'})
+    """
+    gray = to_gray_array(image)
+    height, width = gray.shape[:2]
+    flagged, lines = find_second_pass_lines(data, gray, threshold)
+    stats = {'lines': len(lines), 'second_pass_lines': len(flagged),
+             'hangul_lines': sum(1 for _, hangul in flagged.values() if hangul),
+             'regions': 0, 'area_ratio': 0.0, 'changed_words': 0}
+    if not flagged:
+        return data, stats
+
+    regions = plan_regions(flagged, (width, height))
+    replacements = {}
+    area = 0
+    for box, padded_lines, hangul in regions:
+        left, top, right, bottom = box
+        area += (right - left) * (bottom - top)
+        psm = SECOND_PASS_LINE_PSM if len(padded_lines) == 1 else SECOND_PASS_BLOCK_PSM
+        region_lang = second_language if hangul else lang
+        try:
+            region_data = ocr_region(gray[top:bottom, left:right], region_lang, psm)
+        except Exception as e:
+            warn_once((region_lang, type(e).__name__), f"⚠️ 2차 OCR 실패 ({region_lang or '기본 언어'}, PSM {psm}): {e}")
+            continue
+        region_data = od.transform_boxes(region_data, offset=(left, top))
+        final, changed = merge_region_words(data, lines, box, padded_lines, region_data)
+        replacements.update(final)
+        stats['changed_words'] += changed
+
+    stats['regions'] = len(regions)
+    stats['area_ratio'] = round(area / (width * height), 4) if width * height else 0.0
+    if not stats['changed_words']:
+        return data, stats
+    return rebuild_lines(data, lines, replacements), stats
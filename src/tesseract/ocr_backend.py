@@ -0,0 +1,163 @@
+"""OCR 백엔드 모듈
+
+pytesseract는 호출마다 임시 이미지 파일을 쓰고 tesseract 프로세스를 새로 띄워
+traineddata를 다시 읽습니다. tesserocr(Tesseract C API)가 설치되어 있으면
+스레드마다 한 번 초기화한 엔진을 재사용하고 메모리 상의 이미지를 바로 넘깁니다.
+"""
+import threading
+import pytesseract  # type: ignore
+from PIL import Image  # type: ignore
+import numpy as np
+
+try:
+    import tesserocr  # type: ignore
+except ImportError:  # 선택 의존성
+    tesserocr = None
+
+OCR_BACKEND_LIST = ["auto", "pytesseract", "tesserocr"]
+
+# Tesseract TSV 출력의 컬럼 순서 (마지막 text 컬럼만 문자열)
+TSV_COLUMNS = [
+    "level", "page_num", "block_num", "par_num", "line_num", "word_num",
+    "left", "top", "width", "height", "conf", "text",
+]
+
+
+def tsv_to_dict(tsv):
+    """Tesseract TSV 텍스트를 pytesseract Output.DICT와 같은 형태로 변환
+
+    두 백엔드가 모두 이 함수로 TSV를 읽어 결과가 같도록 합니다.
+    conf는 소수 신뢰도를 그대로 두고 (정수 값이면 -1처럼 int), 나머지 숫자 컬럼은 int입니다.
+    """
+    result = {column: [] for column in TSV_COLUMNS}
+    text_idx = len(TSV_COLUMNS) - 1
+
+    for line in tsv.splitlines():
+        if not line:
+            continue
+        row = line.split('\t')
+        if row[0] == "level":  # 헤더 행
+            continue
+        if len(row) < len(TSV_COLUMNS):
+            row.append('')
+        for i, column in enumerate(TSV_COLUMNS):
+            if i == text_idx:
+                result[column].append(row[i])
+            elif column == "conf":
+                try:
+                    conf = float(row[i])
+                    result[column].append(int(conf) if conf.is_integer() else conf)
+                except ValueError:
+                    result[column].append(row[i])
+            else:
+                try:
+                    result[column].append(int(float(row[i])))
+                except ValueError:
+                    result[column].append(row[i])
+    return result
+
+
+def to_pil_image(image):
+    """numpy 배열이면 PIL Image로 감싸서 반환 (이미 PIL이면 그대로)"""
+    if isinstance(image, np.ndarray):
+        return Image.fromarray(image)
+    return image
+
+
+class PytesseractBackend:
+    """pytesseract(tesseract CLI 호출) 기반 백엔드"""
+
+    name = "pytesseract"
+
+    def warm_up(self, lang):
+        """CLI 방식은 미리 초기화할 상태가 없음"""
+
+    def image_to_string(self, image, lang, psm=None):
+        config = f"--psm {psm}" if psm is not None else ""
+        return pytesseract.image_to_string(image, lang=lang, config=config)
+
+    def image_to_data(self, image, lang, psm=None):
+        config = f"--psm {psm}" if psm is not None else ""
+        # Output.DICT는 pytesseract 버전에 따라 conf를 정수로 자르므로 TSV 문자열을 직접 변환
+        return tsv_to_dict(pytesseract.image_to_data(image, lang=lang, config=config))
+
+    def detect_orientation(self, image):
+        """페이지 방향 검출(OSD): (바로 세우기 위해 시계 방향으로 돌릴 각도, 신뢰도)"""
+        osd = pytesseract.image_to_osd(image, output_type=pytesseract.Output.DICT)
+        return int(osd['rotate']), float(osd['orientation_conf'])
+
+
+class TesserocrBackend:
+    """tesserocr 기반 백엔드: 스레드별로 언어마다 초기화된 엔진을 유지"""
+
+    name = "tesserocr"
+
+    def __init__(self):
+        if tesserocr is None:
+            raise RuntimeError("tesserocr가 설치되어 있지 않습니다. (pip install tesserocr)")
+        self._local = threading.local()
+
+    def _get_api(self, lang):
+        """현재 스레드의 언어별 PyTessBaseAPI를 반환 (없으면 생성)"""
+        apis = getattr(self._local, 'apis', None)
+        if apis is None:
+            apis = self._local.apis = {}
+        api = apis.get(lang)
+        if api is None:
+            api = tesserocr.PyTessBaseAPI(lang=lang)
+            apis[lang] = api
+        return api
+
+    def _get_osd_api(self):
+        """현재 스레드의 방향 검출 전용 PyTessBaseAPI (osd traineddata)"""
+        api = getattr(self._local, 'osd_api', None)
+        if api is None:
+            api = self._local.osd_api = tesserocr.PyTessBaseAPI(lang="osd", psm=tesserocr.PSM.OSD_ONLY)
+        return api
+
+    def _set_image(self, image, lang, psm):
+        api = self._get_api(lang)
+        api.SetPageSegMode(tesserocr.PSM.AUTO if psm is None else psm)
+        api.SetImage(to_pil_image(image))
+        return api
+
+    def warm_up(self, lang):
+        """워커 스레드 시작 시 traineddata를 미리 읽어 둠"""
+        self._get_api(lang)
+
+    def image_to_string(self, image, lang, psm=None):
+        api = self._set_image(image, lang, psm)
+        return api.GetUTF8Text()
+
+    def image_to_data(self, image, lang, psm=None):
+        api = self._set_image(image, lang, psm)
+        api.Recognize()
+        return tsv_to_dict(api.GetTSVText(0))
+
+    def detect_orientation(self, image):
+        api = self._get_osd_api()
+        api.SetImage(to_pil_image(image))
+        osd = api.DetectOrientationScript()
+        if not osd:
+            raise RuntimeError("방향 검출 실패")
+        # orient_deg는 글자가 돌아간 각도(반시계), 바로 세우려면 그만큼 시계 방향으로 되돌림
+        return (360 - int(osd['orient_deg'])) % 360, float(osd['orient_conf'])
+
+
+_backends = {}
+_backends_lock = threading.Lock()
+
+
+def get_ocr_backend(name="auto"):
+    """이름에 해당하는 OCR 백엔드 인스턴스를 반환 (프로세스 내에서 공유)"""
+    if name == "auto":
+        name = "tesserocr" if tesserocr is not None else "pytesseract"
+    if name not in OCR_BACKEND_LIST:
+        raise ValueError(f"지원하지 않는 OCR 백엔드: {name}")
+
+    with _backends_lock:
+        backend = _backends.get(name)
+        if backend is None:
+            backend = TesserocrBackend() if name == "tesserocr" else PytesseractBackend()
+            _backends[name] = backend
+    return backend
@@ -0,0 +1,35 @@
+"""OCR 결과 디스크 캐시 모듈
+
+입력(PDF 바이트 해시 + 페이지 번호 또는 이미지 해시)과 DPI, 전처리 설정, 언어,
+OCR 모드로 만든 키에 OCR 결과를 저장합니다. 저장/LRU 삭제는 src/disk_cache.py의 DiskLRUCache가 담당합니다.
+"""
+import json
+import hashlib
+from src.disk_cache import DiskLRUCache
+
+OCR_CACHE_DIR = ".ocr_cache"
+OCR_CACHE_MAX_BYTES = 512 * 1024 * 1024
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def hash_file(file_path):
+    """파일 바이트의 SHA-256 해시"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class OCRResultCache(DiskLRUCache):
+    """크기 제한이 있는 OCR 결과 디스크 캐시 (스레드 안전)"""
+
+    def __init__(self, cache_dir=OCR_CACHE_DIR, max_bytes=OCR_CACHE_MAX_BYTES):
+        super().__init__(cache_dir, max_bytes)
+
+    @staticmethod
+    def make_key(source, **params):
+        """입력 식별자와 OCR 파라미터로 캐시 키를 생성"""
+        payload = json.dumps({'source': source, **params}, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
@@ -0,0 +1,131 @@
+"""image_to_data 결과(dict of lists)를 다루는 공통 함수 모듈"""
+from src.tesseract.ocr_backend import TSV_COLUMNS
+
+WORD_LEVEL = 5
+BOX_COLUMNS = ("left", "top", "width", "height")
+
+
+def empty_ocr_data():
+    """비어 있는 image_to_data 형태의 dict 반환"""
+    return {column: [] for column in TSV_COLUMNS}
+
+
+def row_count(data):
+    """결과에 포함된 행 수"""
+    return len(data.get('level', []))
+
+
+def word_indices(data, min_conf=None):
+    """텍스트가 있는 단어(level 5) 행의 인덱스 목록 (min_conf가 있으면 신뢰도 필터)"""
+    indices = []
+    for i in range(row_count(data)):
+        if data['level'][i] != WORD_LEVEL or not str(data['text'][i]).strip():
+            continue
+        if min_conf is not None and float(data['conf'][i]) < min_conf:
+            continue
+        indices.append(i)
+    return indices
+
+
+def data_to_text(data, min_conf=None):
+    """단어 행을 (블록, 문단, 줄) 단위로 묶어 줄바꿈으로 이은 텍스트 반환 (image_to_string 결과와 비슷한 형태)"""
+    lines = {}
+    for i in word_indices(data, min_conf):
+        key = (data['block_num'][i], data['par_num'][i], data['line_num'][i])
+        lines.setdefault(key, []).append(str(data['text'][i]).strip())
+    return "\n".join(" ".join(words) for words in lines.values())
+
+
+def select_rows(data, indices):
+    """지정한 인덱스의 행만 골라 새 dict로 반환"""
+    return {column: [values[i] for i in indices] for column, values in data.items()}
+
+
+def row_key(data, i):
+    """i번째 행의 (블록, 문단, 줄) 번호"""
+    return data['block_num'][i], data['par_num'][i], data['line_num'][i]
+
+
+def structure_keys(lines):
+    """줄 키 집합 -> 레벨별(블록 2, 문단 3, 줄 4) 키 집합"""
+    return {2: {line[:1] for line in lines}, 3: {line[:2] for line in lines}, 4: set(lines)}
+
+
+def has_words(data, i, keys):
+    """블록/문단/줄(level 2~4) 행이 structure_keys(keys)의 줄을 하나라도 포함하는지"""
+    level = data['level'][i]
+    return 2 <= level <= 4 and row_key(data, i)[:level - 1] in keys[level]
+
+
+def select_words_with_structure(data, words):
+    """단어 행 words와 그 단어들이 속한 블록/문단/줄 행만 골라 반환 (페이지 행은 제외)"""
+    words = set(words)
+    keys = structure_keys({row_key(data, i) for i in words})
+    return select_rows(data, [i for i in range(row_count(data)) if i in words or has_words(data, i, keys)])
+
+
+def drop_words(data, words):
+    """단어 행 words를 지우고, 그 때문에 단어가 하나도 남지 않은 블록/문단/줄 행도 함께 지움"""
+    words = set(words)
+    remaining = structure_keys({row_key(data, i) for i in word_indices(data) if i not in words})
+    affected = structure_keys({row_key(data, i) for i in words})
+    keep = [i for i in range(row_count(data))
+            if i not in words and (not has_words(data, i, affected) or has_words(data, i, remaining))]
+    return select_rows(data, keep)
+
+
+def concat_ocr_data(*datas):
+    """여러 결과를 행 방향으로 이어 붙임"""
+    result = empty_ocr_data()
+    for data in datas:
+        for column in result:
+            result[column].extend(data.get(column, []))
+    return result
+
+
+def transform_boxes(data, scale=1.0, offset=(0, 0)):
+    """박스 좌표를 scale배 한 뒤 offset만큼 이동한 새 dict 반환"""
+    dx, dy = offset
+    result = {column: list(values) for column, values in data.items()}
+    result['left'] = [int(round(v * scale)) + dx for v in data['left']]
+    result['top'] = [int(round(v * scale)) + dy for v in data['top']]
+    result['width'] = [int(round(v * scale)) for v in data['width']]
+    result['height'] = [int(round(v * scale)) for v in data['height']]
+    return result
+
+
+def offset_block_numbers(data, offset):
+    """block_num을 offset만큼 밀어 다른 결과와 병합할 때 번호 충돌을 피함"""
+    result = {column: list(values) for column, values in data.items()}
+    result['block_num'] = [v + offset if v > 0 else v for v in data['block_num']]
+    return result
+
+
+def row_box(data, i):
+    """i번째 행의 (left, top, right, bottom)"""
+    left, top = data['left'][i], data['top'][i]
+    return left, top, left + data['width'][i], top + data['height'][i]
+
+
+def box_contains_point(box, x, y):
+    """박스가 점 (x, y)를 포함하는지"""
+    left, top, right, bottom = box
+    return left <= x <= right and top <= y <= bottom
+
+
+def merge_boxes(boxes, gap=0):
+    """겹치거나 gap 이내로 인접한 박스들을 하나로 합침"""
+    merged = []
+    for box in sorted(boxes):
+        left, top, right, bottom = box
+        for j, (ml, mt, mr, mb) in enumerate(merged):
+            if left <= mr + gap and ml <= right + gap and top <= mb + gap and mt <= bottom + gap:
+                merged[j] = (min(ml, left), min(mt, top), max(mr, right), max(mb, bottom))
+                break
+        else:
+            merged.append(box)
+
+    # 합쳐진 박스끼리 다시 겹칠 수 있으므로 변화가 없을 때까지 반복
+    if len(merged) < len(boxes):
+        return merge_boxes(merged, gap)
+    return merged
@@ -0,0 +1,249 @@
+"""공유 메모리 페이지 버퍼 모듈
+
+1200 DPI 페이지 한 장은 수백 MB이므로, 래스터화 결과를 PIL 이미지 → numpy → (프로세스 간) pickle로
+옮기면 페이지마다 같은 크기의 복사가 여러 번 일어납니다.
+이 모듈은 pdftoppm이 표준 출력으로 내보내는 PGM/PPM 픽셀을 미리 할당한 공유 버퍼에 바로 읽어 넣고
+(래스터화 결과를 한 번만 씀), 다른 프로세스의 워커는 버퍼 이름(handle)만 받아 복사 없이 numpy 배열로 붙습니다.
+
+- 버퍼는 multiprocessing.shared_memory(/dev/shm)로 만들고, 공간이 부족하면 임시 파일 mmap으로 대신합니다.
+- PageBufferPool은 정해진 개수의 버퍼를 재사용하며, 빈 버퍼가 없으면 래스터화를 미뤄 메모리 사용량을 제한합니다.
+"""
+import os
+import shutil
+import tempfile
+import threading
+import subprocess
+import cv2  # type: ignore
+import numpy as np
+from multiprocessing import shared_memory
+
+PAGE_BUFFER_BACKEND_LIST = ["auto", "shm", "mmap"]
+PAGE_BUFFER_BACKEND = "auto"      # auto: /dev/shm 여유 공간이 충분하면 shm, 아니면 mmap 임시 파일
+PAGE_BUFFER_GRAY = True           # True면 그레이스케일(1채널)로 래스터화 (OCR 전처리가 어차피 그레이스케일로 변환)
+PAGE_BUFFER_SHM_DIR = "/dev/shm"
+PAGE_BUFFER_GROWTH = 1.25         # 버퍼를 다시 할당할 때 여유 배수 (페이지 크기가 조금씩 달라도 재사용)
+PNM_READ_CHUNK = 8 * 1024 * 1024
+PDFTOPPM_ERROR_TAIL = 2000        # 오류 메시지에 담을 pdftoppm 경고의 마지막 바이트 수
+
+
+def create_segment(size, backend=PAGE_BUFFER_BACKEND):
+    """size 바이트의 공유 세그먼트를 만들어 (handle, 메모리 객체) 반환"""
+    if backend == "auto":
+        try:
+            free = shutil.disk_usage(PAGE_BUFFER_SHM_DIR).free
+        except OSError:
+            free = 0
+        backend = "shm" if free > size * 2 else "mmap"
+    if backend not in PAGE_BUFFER_BACKEND_LIST:
+        raise ValueError(f"지원하지 않는 페이지 버퍼 백엔드: {backend}")
+
+    if backend == "shm":
+        shm = shared_memory.SharedMemory(create=True, size=size)
+        return {'kind': "shm", 'name': shm.name, 'size': size}, shm
+
+    fd, path = tempfile.mkstemp(prefix="ocr_page_", suffix=".buf")
+    with os.fdopen(fd, 'wb') as f:
+        f.truncate(size)
+    return {'kind': "mmap", 'path': path, 'size': size}, np.memmap(path, dtype=np.uint8, mode='r+', shape=(size,))
+
+
+def open_segment(handle):
+    """다른 프로세스에서 handle로 세그먼트에 붙음 (생성한 쪽만 삭제 책임을 가짐)"""
+    if handle['kind'] == "shm":
+        try:
+            return shared_memory.SharedMemory(name=handle['name'], track=False)
+        except TypeError:  # Python 3.13 미만에는 track 인자가 없음
+            return shared_memory.SharedMemory(name=handle['name'])
+    return np.memmap(handle['path'], dtype=np.uint8, mode='r+', shape=(handle['size'],))
+
+
+def segment_view(segment, shape, dtype=np.uint8):
+    """세그먼트 앞부분을 shape 모양의 numpy 배열로 보는 뷰 (복사 없음)"""
+    raw = segment.buf if isinstance(segment, shared_memory.SharedMemory) else segment
+    count = int(np.prod(shape))
+    return np.ndarray(shape, dtype=dtype, buffer=raw[:count * np.dtype(dtype).itemsize])
+
+
+class PageBuffer:
+    """풀에서 빌린 버퍼 하나 (array는 공유 메모리 위의 numpy 뷰)"""
+
+    def __init__(self, slot, handle, segment, shape):
+        self.slot = slot
+        self.handle = handle
+        self.segment = segment
+        self.shape = tuple(shape)
+        self.array = segment_view(segment, self.shape)
+
+    def describe(self, **extra):
+        """다른 프로세스에 넘길 수 있는 작은 dict (세그먼트 위치와 배열 모양)"""
+        return {**self.handle, 'shape': self.shape, **extra}
+
+
+class AttachedPage:
+    """워커 프로세스에서 handle로 붙은 페이지 (close는 분리만 하고 삭제는 풀이 담당)
+
+    close 전에 array를 참조하는 변수가 남아 있으면 공유 메모리를 바로 닫을 수 없으므로
+    open()의 반환값은 이름에 묶지 말고 바로 넘기는 것이 좋습니다. (남아 있으면 GC 때 해제)
+    """
+
+    def __init__(self, description):
+        self.description = description
+        self.segment = None
+        self.array = None
+
+    def open(self):
+        self.segment = open_segment(self.description)
+        self.array = segment_view(self.segment, self.description['shape'])
+        return self.array
+
+    def close(self):
+        self.array = None
+        if isinstance(self.segment, shared_memory.SharedMemory):
+            try:
+                self.segment.close()
+            except BufferError:
+                pass
+        self.segment = None
+
+
+class PageBufferPool:
+    """재사용하는 페이지 버퍼 풀 (스레드 안전)
+
+    슬롯마다 필요한 크기가 되었을 때 세그먼트를 할당하고, 더 큰 페이지가 오면 그 슬롯만 다시 할당합니다.
+    acquire는 빈 슬롯이 없으면 release될 때까지 기다리므로, 한 번에 메모리에 있는 페이지 수가 slots개로 제한됩니다.
+    """
+
+    def __init__(self, slots, backend=PAGE_BUFFER_BACKEND):
+        self.backend = backend
+        self._segments = [None] * slots   # 슬롯별 (handle, 세그먼트)
+        self._free = list(range(slots))
+        self._cond = threading.Condition()
+        self.allocations = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def available(self):
+        with self._cond:
+            return len(self._free)
+
+    def acquire(self, shape, timeout=None):
+        """shape 크기를 담을 수 있는 버퍼를 빌림 (빈 슬롯이 없으면 대기)"""
+        size = int(np.prod(shape))
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._free, timeout):
+                raise TimeoutError("사용 가능한 페이지 버퍼가 없습니다.")
+            slot = self._free.pop()
+        try:
+            current = self._segments[slot]
+            if current is None or current[0]['size'] < size:
+                if current is not None:
+                    self._destroy(current)
+                self._segments[slot] = create_segment(int(size * PAGE_BUFFER_GROWTH), self.backend)
+                self.allocations += 1
+        except Exception:
+            self.release_slot(slot)
+            raise
+        handle, segment = self._segments[slot]
+        return PageBuffer(slot, handle, segment, shape)
+
+    def release(self, buffer):
+        """버퍼를 풀에 돌려줌 (이후 이 버퍼의 array를 쓰면 안 됨)"""
+        buffer.array = None
+        self.release_slot(buffer.slot)
+
+    def release_slot(self, slot):
+        with self._cond:
+            self._free.append(slot)
+            self._cond.notify()
+
+    @staticmethod
+    def _destroy(entry):
+        handle, segment = entry
+        if handle['kind'] == "shm":
+            try:
+                segment.close()
+            except BufferError:  # 남은 뷰가 있으면 GC 때 해제됨
+                pass
+            segment.unlink()
+        else:
+            del segment
+            try:
+                os.remove(handle['path'])
+            except OSError:
+                pass
+
+    def close(self):
+        """모든 세그먼트를 해제하고 삭제"""
+        for k, entry in enumerate(self._segments):
+            if entry is not None:
+                try:
+                    self._destroy(entry)
+                except (OSError, BufferError):
+                    pass
+                self._segments[k] = None
+
+
+def read_pnm_header(stream):
+    """PGM/PPM(P5/P6) 헤더를 읽어 (너비, 높이, 채널 수) 반환"""
+    tokens = []
+    while len(tokens) < 4:
+        line = stream.readline()
+        if not line:
+            raise ValueError("PNM 헤더를 읽을 수 없습니다.")
+        line = line.split(b'#', 1)[0]
+        tokens.extend(line.split())
+    magic, width, height, maxval = tokens[:4]
+    if magic not in (b'P5', b'P6') or int(maxval) > 255:
+        raise ValueError(f"지원하지 않는 PNM 형식: {magic!r} (maxval {int(maxval)})")
+    return int(width), int(height), 1 if magic == b'P5' else 3
+
+
+def readinto_exact(stream, view):
+    """스트림에서 view 크기만큼 정확히 읽어 넣음"""
+    raw = memoryview(view).cast('B')
+    offset = 0
+    while offset < len(raw):
+        count = stream.readinto(raw[offset:offset + PNM_READ_CHUNK])
+        if not count:
+            raise ValueError(f"래스터화 출력이 예상보다 짧습니다. ({offset}/{len(raw)} 바이트)")
+        offset += count
+
+
+def rasterize_pdf_page_into(pool, pdf_path, page_number, dpi, gray=PAGE_BUFFER_GRAY):
+    """pdftoppm 출력(PGM/PPM)을 풀에서 빌린 버퍼에 바로 읽어 넣고 PageBuffer를 반환
+
+    gray가 False면 (높이, 너비, 3) 배열이 되며, 버퍼 안에서 바로 OpenCV 채널 순서(BGR)로 바꿔 둡니다.
+    pdftoppm의 경고(stderr)는 임시 파일로 받습니다. 파이프로 받으면 손상된 PDF에서 경고가
+    파이프 버퍼를 채울 때 pdftoppm과 이쪽이 서로를 기다리며 멈춥니다.
+    """
+    command = ["pdftoppm", "-f", str(page_number), "-l", str(page_number), "-r", str(dpi)]
+    if gray:
+        command.append("-gray")
+    command.append(pdf_path)
+
+    with tempfile.TemporaryFile() as stderr:
+        process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=stderr)
+        buffer = None
+        try:
+            width, height, channels = read_pnm_header(process.stdout)
+            shape = (height, width) if channels == 1 else (height, width, channels)
+            buffer = pool.acquire(shape)
+            readinto_exact(process.stdout, buffer.array)
+            process.communicate()
+            if process.returncode != 0:
+                stderr.seek(max(0, os.fstat(stderr.fileno()).st_size - PDFTOPPM_ERROR_TAIL))
+                raise RuntimeError(f"pdftoppm 실패: {stderr.read().decode('utf-8', errors='replace').strip()}")
+            if channels == 3:
+                cv2.cvtColor(buffer.array, cv2.COLOR_RGB2BGR, dst=buffer.array)  # type: ignore
+            return buffer
+        except Exception:
+            if buffer is not None:
+                pool.release(buffer)
+            process.kill()
+            process.wait()
+            raise
@@ -0,0 +1,197 @@
+"""페이지 사전 판정 모듈
+
+전처리/OCR 전에 페이지를 축소한 사본으로 빠르게 살펴봅니다.
+- 잉크 비율이 거의 없고 축소 사본 OCR에서도 글자가 나오지 않는 빈 페이지(구분지 등)는 OCR을 건너뜀
+- 90/180/270도로 돌아간 페이지는 OSD로 방향을 찾고, 작은 기울기는 투영 프로파일로 추정
+보정은 원본 해상도 이미지에 한 번만 적용하므로 비싼 전체 해상도 OCR은 페이지당 한 번,
+바로 선 이미지에서만 수행됩니다.
+"""
+import math
+import cv2  # type: ignore
+import numpy as np
+from PIL import Image  # type: ignore
+from src.tesseract.ocr_backend import get_ocr_backend
+
+TRIAGE_MAX_DIMENSION = 1600      # 판정용 축소 사본의 긴 변 (픽셀)
+
+# 빈 페이지 판정
+BLANK_INK_THRESHOLD = 160        # 이보다 어두운 픽셀을 잉크로 봄 (그레이스케일)
+BLANK_MAX_INK_RATIO = 0.002      # 잉크 비율이 이 값 이하면 빈 페이지
+BLANK_MARGIN_RATIO = 0.05        # 스캔 가장자리 그림자를 피하려고 제외할 테두리 비율
+BLANK_CONFIRM_OCR = True         # 잉크 비율로 빈 페이지 후보가 되면 축소 사본을 OCR해 글자가 없을 때만 빈 페이지로 판정
+
+# 방향(90/180/270도) 검출
+ORIENTATION_ENABLED = True
+ORIENTATION_MIN_CONF = 2.0       # OSD 신뢰도가 이보다 낮으면 방향을 바꾸지 않음
+
+# 기울기 검출
+DESKEW_ENABLED = True
+DESKEW_MAX_ANGLE = 5.0           # 탐색 범위 (±도)
+DESKEW_COARSE_STEP = 0.5
+DESKEW_FINE_STEP = 0.1
+DESKEW_MIN_ANGLE = 0.3           # 이보다 작은 기울기는 보정하지 않음
+DESKEW_MAX_POINTS = 100000       # 투영에 쓸 잉크 픽셀 최대 개수 (넘으면 균등 샘플링)
+
+PIL_CLOCKWISE_TRANSPOSE = {
+    90: Image.Transpose.ROTATE_270,
+    180: Image.Transpose.ROTATE_180,
+    270: Image.Transpose.ROTATE_90,
+}
+CV2_CLOCKWISE_ROTATE = {
+    90: cv2.ROTATE_90_CLOCKWISE,
+    180: cv2.ROTATE_180,
+    270: cv2.ROTATE_90_COUNTERCLOCKWISE,
+}
+
+
+def downsample_gray(image, max_dimension=TRIAGE_MAX_DIMENSION):
+    """긴 변이 max_dimension 이하가 되도록 축소한 그레이스케일 numpy 배열
+
+    PIL 이미지는 reduce(정수 배 박스 축소)로 먼저 줄인 뒤 변환하여 원본 전체를 변환하지 않습니다.
+    """
+    if isinstance(image, Image.Image):
+        factor = max(1, math.ceil(max(image.size) / max_dimension))
+        small = image.reduce(factor) if factor > 1 else image
+        return np.asarray(small.convert('L') if small.mode != 'L' else small)
+
+    height, width = image.shape[:2]
+    scale = min(1.0, max_dimension / max(width, height))
+    small = image
+    if scale < 1:
+        small = cv2.resize(image, (max(1, int(width * scale)), max(1, int(height * scale))),
+                           interpolation=cv2.INTER_AREA)  # type: ignore
+    if small.ndim == 3:
+        small = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)  # type: ignore
+    return small
+
+
+def ink_mask(gray, threshold=BLANK_INK_THRESHOLD, denoise=False):
+    """잉크 픽셀 마스크 (denoise면 작은 점 잡음을 중앙값 필터로 제거)
+
+    빈 페이지 판정에는 denoise를 쓰지 않습니다. 축소 사본에서 가늘거나 옅은 획은 1픽셀 남짓이라
+    중앙값 필터가 함께 지워 버립니다.
+    """
+    if denoise:
+        gray = cv2.medianBlur(gray, 3)  # type: ignore
+    return gray < threshold
+
+
+def ink_ratio(ink, margin_ratio=BLANK_MARGIN_RATIO):
+    """가장자리를 뺀 영역의 잉크 픽셀 비율"""
+    height, width = ink.shape
+    dy, dx = int(height * margin_ratio), int(width * margin_ratio)
+    inner = ink[dy:height - dy, dx:width - dx]
+    return float(np.count_nonzero(inner)) / max(1, inner.size)
+
+
+def has_text(gray, backend="auto", lang="eng"):
+    """축소 사본을 OCR해 글자가 하나라도 나오는지 확인 (실패하면 글자가 있다고 보고 OCR을 건너뛰지 않음)"""
+    try:
+        return bool(get_ocr_backend(backend).image_to_string(gray, lang).strip())
+    except Exception:
+        return True
+
+
+def detect_orientation(gray, backend="auto", min_conf=ORIENTATION_MIN_CONF):
+    """OSD로 바로 세우기 위해 시계 방향으로 돌릴 각도(0/90/180/270)와 신뢰도를 반환
+
+    osd traineddata가 없거나 글자가 너무 적어 검출에 실패하면 (0, None)입니다.
+    """
+    try:
+        rotation, conf = get_ocr_backend(backend).detect_orientation(gray)
+    except Exception:
+        return 0, None
+    if rotation not in CV2_CLOCKWISE_ROTATE or conf < min_conf:
+        return 0, conf
+    return rotation, conf
+
+
+def projection_score(ys, xs, angle):
+    """angle(도)만큼 기울어진 줄을 따라 투영한 행 히스토그램의 인접 차이 제곱합 (줄이 맞을수록 큼)"""
+    theta = math.radians(angle)
+    rows = np.round(ys * math.cos(theta) - xs * math.sin(theta)).astype(np.int64)
+    histogram = np.bincount(rows - rows.min())
+    return float(np.sum(np.diff(histogram) ** 2))
+
+
+def estimate_skew(ink, max_angle=DESKEW_MAX_ANGLE, coarse_step=DESKEW_COARSE_STEP,
+                  fine_step=DESKEW_FINE_STEP, max_points=DESKEW_MAX_POINTS):
+    """잉크 픽셀 좌표의 투영 프로파일로 기울기(도)를 추정
+
+    양수는 글줄이 오른쪽 아래로 내려가는(시계 방향으로 돌아간) 경우이며,
+    이미지를 그만큼 반시계 방향으로 돌리면 바로 섭니다.
+    """
+    ys, xs = np.nonzero(ink)
+    if ys.size < 2:
+        return 0.0
+    if ys.size > max_points:
+        step = ys.size // max_points + 1
+        ys, xs = ys[::step], xs[::step]
+    ys = ys.astype(np.float64)
+    xs = xs.astype(np.float64)
+
+    def best_angle(candidates):
+        return max(candidates, key=lambda angle: projection_score(ys, xs, angle))
+
+    coarse = best_angle(np.arange(-max_angle, max_angle + 1e-9, coarse_step))
+    fine = best_angle(np.arange(coarse - coarse_step, coarse + coarse_step + 1e-9, fine_step))
+    return round(float(fine), 2)
+
+
+def triage_page(image, backend="auto", lang="eng", orientation=ORIENTATION_ENABLED, deskew=DESKEW_ENABLED,
+                confirm_blank=BLANK_CONFIRM_OCR):
+    """축소 사본으로 빈 페이지 여부, 방향, 기울기를 판정
+
+    Returns:
+        {'blank', 'ink_ratio', 'rotation'(시계 방향 도), 'orientation_conf', 'skew'(도)}
+    """
+    gray = downsample_gray(image)
+    ratio = ink_ratio(ink_mask(gray))
+    blank = ratio <= BLANK_MAX_INK_RATIO
+    if blank and confirm_blank:
+        blank = not has_text(gray, backend, lang)
+    triage = {'blank': blank, 'ink_ratio': round(ratio, 5),
+              'rotation': 0, 'orientation_conf': None, 'skew': 0.0}
+    if triage['blank']:
+        return triage
+
+    ink = ink_mask(gray, denoise=True)
+
+    if orientation:
+        triage['rotation'], triage['orientation_conf'] = detect_orientation(gray, backend)
+        if triage['rotation']:
+            ink = cv2.rotate(ink.astype(np.uint8), CV2_CLOCKWISE_ROTATE[triage['rotation']])  # type: ignore
+
+    if deskew:
+        skew = estimate_skew(ink)
+        triage['skew'] = skew if abs(skew) >= DESKEW_MIN_ANGLE else 0.0
+    return triage
+
+
+def needs_correction(triage):
+    return bool(triage and not triage['blank'] and (triage['rotation'] or triage['skew']))
+
+
+def correct_page(image, triage):
+    """판정 결과의 방향/기울기 보정을 원본 해상도 이미지에 한 번 적용 (입력과 같은 형식으로 반환)
+
+    기울기 보정은 크기를 유지하고 잘려 나온 모서리는 흰색으로 채웁니다.
+    """
+    rotation, skew = triage['rotation'], triage['skew']
+    if isinstance(image, Image.Image):
+        if rotation:
+            image = image.transpose(PIL_CLOCKWISE_TRANSPOSE[rotation])
+        if skew:
+            fill = 255 if image.mode == 'L' else (255,) * len(image.getbands())
+            image = image.rotate(skew, resample=Image.BILINEAR, fillcolor=fill)
+        return image
+
+    if rotation:
+        image = cv2.rotate(image, CV2_CLOCKWISE_ROTATE[rotation])  # type: ignore
+    if skew:
+        height, width = image.shape[:2]
+        matrix = cv2.getRotationMatrix2D((width / 2, height / 2), skew, 1.0)  # type: ignore
+        border = (255,) * (image.shape[2] if image.ndim == 3 else 1)
+        image = cv2.warpAffine(image, matrix, (width, height), flags=cv2.INTER_LINEAR,
+                               borderMode=cv2.BORDER_CONSTANT, borderValue=border)  # type: ignore
+    return image
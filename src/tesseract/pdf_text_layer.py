@@ -0,0 +1,216 @@
+"""PDF 텍스트 레이어 모듈
+
+디지털로 만들어진 PDF는 글자와 좌표가 이미 들어 있으므로 래스터화/OCR 대신
+pdftotext -bbox-layout으로 단어와 좌표를 바로 읽어 image_to_data와 같은 형태로 만듭니다.
+(좌표는 지정한 DPI 기준 픽셀, 단어 신뢰도는 100)
+
+텍스트 레이어가 없거나 깨진 페이지만 기존 래스터화+OCR로 처리하며,
+텍스트 레이어가 있어도 이미지가 들어 있는 페이지는 글자가 없는 이미지 영역만 찾아 OCR합니다.
+"""
+import re
+import subprocess
+import numpy as np  # type: ignore
+import cv2  # type: ignore
+import xml.etree.ElementTree as ET
+from pdf2image import convert_from_path  # type: ignore
+from src.tesseract import ocr_data as od
+from src.tesseract.ocr_backend import TSV_COLUMNS
+from src.tesseract.adaptive_dpi import rasterize_pdf_region
+
+TEXT_LAYER_MIN_WORDS = 3           # 이보다 단어가 적으면 텍스트 레이어가 없는 페이지로 봄
+TEXT_LAYER_MIN_VALID_RATIO = 0.8   # 정상 글자(대체 문자/제어 문자/사용자 정의 영역 제외) 비율 하한
+TEXT_LAYER_CONF = 100
+
+# 텍스트 레이어가 있는 페이지의 이미지 영역 검출 설정
+IMAGE_REGION_DPI = 72                  # 영역 검출용 저해상도 래스터화 DPI
+IMAGE_REGION_INK_THRESHOLD = 245       # 이보다 어두운 픽셀을 잉크로 봄 (그레이스케일)
+IMAGE_REGION_MIN_AREA_RATIO = 0.01     # 이보다 작은 영역은 무시 (페이지 면적 대비)
+IMAGE_REGION_MIN_FILL = 0.2            # 영역 박스 안 잉크 비율 하한 (표 테두리 같은 선은 제외)
+IMAGE_REGION_TEXT_PADDING = 2          # 텍스트 단어 박스를 지울 때 여백 (검출 DPI 픽셀)
+
+PDF_POINTS_PER_INCH = 72
+XHTML_NAMESPACE = "{http://www.w3.org/1999/xhtml}"
+INVALID_XML_CHARS = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+
+def run_pdftotext_bbox(pdf_path, first_page=None, last_page=None):
+    """pdftotext -bbox-layout 출력(XHTML)을 문자열로 반환"""
+    command = ["pdftotext", "-bbox-layout", "-enc", "UTF-8"]
+    if first_page is not None:
+        command += ["-f", str(first_page)]
+    if last_page is not None:
+        command += ["-l", str(last_page)]
+    command += [pdf_path, "-"]
+    completed = subprocess.run(command, check=True, capture_output=True)
+    return completed.stdout.decode('utf-8', errors='replace')
+
+
+def parse_bbox_layout(xhtml, first_page=1):
+    """pdftotext -bbox-layout 출력을 페이지별 단어 목록으로 변환
+
+    Returns:
+        {페이지 번호: {'width', 'height', 'words': [(xMin, yMin, xMax, yMax, 텍스트, 블록 번호, 줄 번호), ...]}}
+        (좌표 단위는 pt)
+    """
+    try:
+        root = ET.fromstring(xhtml)
+    except ET.ParseError:
+        root = ET.fromstring(INVALID_XML_CHARS.sub(" ", xhtml))
+
+    pages = {}
+    for page_number, page in enumerate(root.iter(f"{XHTML_NAMESPACE}page"), first_page):
+        words = []
+        for block_num, block in enumerate(page.iter(f"{XHTML_NAMESPACE}block"), 1):
+            for line_num, line in enumerate(block.iter(f"{XHTML_NAMESPACE}line"), 1):
+                for word in line.iter(f"{XHTML_NAMESPACE}word"):
+                    text = (word.text or "").strip()
+                    if not text:
+                        continue
+                    words.append((
+                        float(word.get('xMin')), float(word.get('yMin')),
+                        float(word.get('xMax')), float(word.get('yMax')),
+                        text, block_num, line_num,
+                    ))
+        pages[page_number] = {
+            'width': float(page.get('width')),
+            'height': float(page.get('height')),
+            'words': words,
+        }
+    return pages
+
+
+def read_text_layer(pdf_path, first_page=None, last_page=None):
+    """PDF의 텍스트 레이어를 페이지별로 읽음 (pdftotext 한 번 호출)"""
+    return parse_bbox_layout(run_pdftotext_bbox(pdf_path, first_page, last_page), first_page or 1)
+
+
+def is_valid_char(ch):
+    code = ord(ch)
+    return ch != '�' and code >= 0x20 and not (0xE000 <= code <= 0xF8FF)
+
+
+def is_usable_text_layer(page_layer, min_words=TEXT_LAYER_MIN_WORDS, min_valid_ratio=TEXT_LAYER_MIN_VALID_RATIO):
+    """페이지 텍스트 레이어를 OCR 대신 쓸 수 있는지 판단 (단어 수와 깨진 글자 비율)"""
+    words = page_layer['words']
+    if len(words) < min_words:
+        return False
+    chars = "".join(word[4] for word in words)
+    valid = sum(1 for ch in chars if is_valid_char(ch))
+    return valid / len(chars) >= min_valid_ratio
+
+
+def union_box(boxes):
+    return min(b[0] for b in boxes), min(b[1] for b in boxes), max(b[2] for b in boxes), max(b[3] for b in boxes)
+
+
+def text_layer_to_data(page_layer, dpi):
+    """페이지 텍스트 레이어를 image_to_data 형태로 변환 (dpi 기준 픽셀 좌표, 단어 conf=100)
+
+    tesseract 결과처럼 페이지/블록/문단/줄/단어 행을 모두 만들며, 문단은 블록과 같게 둡니다.
+    """
+    scale = dpi / PDF_POINTS_PER_INCH
+    data = od.empty_ocr_data()
+
+    def add_row(level, block_num, par_num, line_num, word_num, box, conf, text):
+        left, top, right, bottom = (int(round(v * scale)) for v in box)
+        for column, value in zip(TSV_COLUMNS, (
+            level, 1, block_num, par_num, line_num, word_num,
+            left, top, right - left, bottom - top, conf, text,
+        )):
+            data[column].append(value)
+
+    add_row(1, 0, 0, 0, 0, (0, 0, page_layer['width'], page_layer['height']), -1, "")
+
+    blocks = {}
+    for word in page_layer['words']:
+        blocks.setdefault(word[5], {}).setdefault(word[6], []).append(word)
+
+    for block_idx, lines in enumerate(blocks.values(), 1):
+        block_box = union_box([word[:4] for line in lines.values() for word in line])
+        add_row(2, block_idx, 0, 0, 0, block_box, -1, "")
+        add_row(3, block_idx, 1, 0, 0, block_box, -1, "")
+        for line_idx, words in enumerate(lines.values(), 1):
+            add_row(4, block_idx, 1, line_idx, 0, union_box([word[:4] for word in words]), -1, "")
+            for word_idx, word in enumerate(words, 1):
+                add_row(od.WORD_LEVEL, block_idx, 1, line_idx, word_idx, word[:4], TEXT_LAYER_CONF, word[4])
+    return data
+
+
+def list_image_pages(pdf_path):
+    """pdfimages -list로 이미지가 들어 있는 페이지 번호 집합을 구함"""
+    completed = subprocess.run(["pdfimages", "-list", pdf_path], check=True, capture_output=True)
+    pages = set()
+    for line in completed.stdout.decode('utf-8', errors='replace').splitlines()[2:]:
+        fields = line.split()
+        if fields and fields[0].isdigit():
+            pages.add(int(fields[0]))
+    return pages
+
+
+def find_image_regions(pdf_path, page_number, page_layer, dpi):
+    """텍스트 레이어 단어가 없는 잉크 영역(이미지 등)을 dpi 기준 픽셀 박스 목록으로 반환
+
+    저해상도로 래스터화한 뒤 텍스트 단어 박스를 지우고, 남은 잉크 덩어리 중
+    충분히 크고 속이 찬 영역만 고릅니다.
+    """
+    pages = convert_from_path(
+        pdf_path, dpi=IMAGE_REGION_DPI, fmt='RGB', first_page=page_number, last_page=page_number,
+    )
+    if not pages:
+        return []
+    gray = cv2.cvtColor(np.asarray(pages[0]), cv2.COLOR_RGB2GRAY)
+    ink = (gray < IMAGE_REGION_INK_THRESHOLD).astype(np.uint8)
+
+    scale = IMAGE_REGION_DPI / PDF_POINTS_PER_INCH
+    pad = IMAGE_REGION_TEXT_PADDING
+    for x0, y0, x1, y1, *_ in page_layer['words']:
+        ink[max(0, int(y0 * scale) - pad):int(y1 * scale) + pad + 1,
+            max(0, int(x0 * scale) - pad):int(x1 * scale) + pad + 1] = 0
+
+    height, width = ink.shape
+    min_area = IMAGE_REGION_MIN_AREA_RATIO * width * height
+    dilated = cv2.dilate(ink, np.ones((5, 5), np.uint8))
+    contours, _ = cv2.findContours(dilated, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+
+    to_dpi = dpi / IMAGE_REGION_DPI
+    regions = []
+    for contour in contours:
+        x, y, w, h = cv2.boundingRect(contour)
+        if w * h < min_area or ink[y:y + h, x:x + w].mean() < IMAGE_REGION_MIN_FILL:
+            continue
+        regions.append(tuple(int(round(v * to_dpi)) for v in (x, y, x + w, y + h)))
+    return regions
+
+
+def ocr_image_regions(data, pdf_path, page_number, regions, dpi, ocr_region):
+    """이미지 영역만 dpi로 래스터화/OCR하여 텍스트 레이어 결과에 이어 붙임 (단어와 블록/문단/줄 행)"""
+    for region in regions:
+        try:
+            region_image = rasterize_pdf_region(pdf_path, page_number, dpi, region)
+            region_data = ocr_region(region_image)
+        except Exception as e:
+            print(f"⚠️ 이미지 영역 OCR 실패 (페이지 {page_number}, {region}): {e}")
+            continue
+        words = od.select_words_with_structure(region_data, od.word_indices(region_data))
+        max_block = max([b for b in data['block_num'] if isinstance(b, int)] or [0])
+        placed = od.transform_boxes(words, offset=region[:2])
+        data = od.concat_ocr_data(data, od.offset_block_numbers(placed, max_block))
+    return data
+
+
+def extract_text_layer_page(pdf_path, page_number, page_layer, dpi, has_images=False, ocr_region=None):
+    """텍스트 레이어 페이지 하나를 image_to_data 형태로 만듦
+
+    has_images이고 ocr_region(영역 이미지 -> image_to_data 결과)이 주어지면
+    글자가 없는 이미지 영역만 OCR하여 병합합니다.
+
+    Returns:
+        (image_to_data 결과, OCR한 이미지 영역 수)
+    """
+    data = text_layer_to_data(page_layer, dpi)
+    if not has_images or ocr_region is None:
+        return data, 0
+    regions = find_image_regions(pdf_path, page_number, page_layer, dpi)
+    if not regions:
+        return data, 0
+    return ocr_image_regions(data, pdf_path, page_number, regions, dpi, ocr_region), len(regions)
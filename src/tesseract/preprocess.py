@@ -0,0 +1,133 @@
+"""OCR 전처리 파이프라인 모듈
+
+단계(stage)를 선언적으로 구성하고, 스레드별로 CLAHE 객체와 중간 버퍼를 재사용합니다.
+중간 단계는 OpenCV의 dst= 인자로 미리 할당한 버퍼 두 개를 번갈아 쓰고,
+마지막 단계만 호출자에게 돌려줄 새 배열에 기록합니다.
+"""
+import threading
+import cv2  # type: ignore
+import numpy as np
+from PIL import Image  # type: ignore
+
+SHARPEN_KERNEL = np.array([[-1, -1, -1], [-1, 9, -1], [-1, -1, -1]], dtype=np.float32)
+
+# 그레이스케일 변환 이후에 적용할 (단계 이름, 파라미터) 목록
+# 기존 enhance_image_quality와 같은 순서/값
+DEFAULT_STAGES = [
+    ("median", {"ksize": 3}),
+    ("clahe", {"clip_limit": 2.0, "tile_grid_size": (8, 8)}),
+    ("sharpen", {}),
+]
+
+# 이미 깨끗하게 이진화된 페이지에서는 생략할 단계
+SKIPPABLE_WHEN_CLEAN = {"median", "clahe", "sharpen"}
+
+CLEAN_SAMPLE_STEP = 4        # 이진화 판정 시 샘플링 간격 (픽셀)
+CLEAN_MIDTONE_RATIO = 0.01   # 중간 밝기 픽셀 비율이 이 값 미만이면 이진화된 페이지로 판단
+
+_thread_state = threading.local()
+
+
+def _get_clahe(clip_limit, tile_grid_size):
+    """현재 스레드의 CLAHE 객체를 재사용 (파라미터별 캐시)"""
+    cache = getattr(_thread_state, 'clahe', None)
+    if cache is None:
+        cache = _thread_state.clahe = {}
+    key = (clip_limit, tuple(tile_grid_size))
+    clahe = cache.get(key)
+    if clahe is None:
+        clahe = cv2.createCLAHE(clipLimit=clip_limit, tileGridSize=tuple(tile_grid_size))  # type: ignore
+        cache[key] = clahe
+    return clahe
+
+
+def _get_scratch(slot, shape):
+    """현재 스레드의 중간 버퍼를 반환 (크기가 바뀌면 새로 할당)"""
+    buffers = getattr(_thread_state, 'buffers', None)
+    if buffers is None or buffers['shape'] != shape:
+        buffers = _thread_state.buffers = {
+            'shape': shape,
+            'slots': [np.empty(shape, dtype=np.uint8), np.empty(shape, dtype=np.uint8)],
+        }
+    return buffers['slots'][slot]
+
+
+def to_gray_source(image):
+    """입력을 OpenCV에 넘길 numpy 배열로 변환
+
+    컬러 PIL 이미지는 RGB 배열로 두고 그레이스케일 변환은 run()에서 cv2.COLOR_RGB2GRAY로 합니다.
+    (PIL convert('L')은 반올림이 달라 샤프닝 후 결과가 바뀌므로 쓰지 않음)
+    """
+    if isinstance(image, Image.Image):
+        if image.mode not in ('L', 'RGB'):
+            image = image.convert('RGB')
+        return np.asarray(image)
+    return image
+
+
+def is_clean_binary(gray, midtone_ratio=CLEAN_MIDTONE_RATIO, step=CLEAN_SAMPLE_STEP):
+    """샘플링한 픽셀 중 중간 밝기 비율로 이미 이진화된 깨끗한 페이지인지 판단"""
+    sample = gray[::step, ::step]
+    midtones = np.count_nonzero((sample > 32) & (sample < 224))
+    return midtones < midtone_ratio * sample.size
+
+
+def _run_stage(name, params, src, dst):
+    """단일 단계를 실행하여 dst에 기록"""
+    if name == "median":
+        return cv2.medianBlur(src, params.get("ksize", 3), dst=dst)  # type: ignore
+    if name == "clahe":
+        clahe = _get_clahe(params.get("clip_limit", 2.0), params.get("tile_grid_size", (8, 8)))
+        return clahe.apply(src, dst=dst)
+    if name == "sharpen":
+        return cv2.filter2D(src, -1, SHARPEN_KERNEL, dst=dst)  # type: ignore
+    if name == "binarize":
+        cv2.threshold(src, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU, dst=dst)  # type: ignore
+        return dst
+    raise ValueError(f"지원하지 않는 전처리 단계: {name}")
+
+
+class PreprocessPipeline:
+    """선언적으로 구성하는 전처리 파이프라인
+
+    Args:
+        stages: 그레이스케일 변환 뒤에 적용할 (단계 이름, 파라미터 dict) 목록
+            지원 단계: median, clahe, sharpen, binarize
+        skip_if_clean: 이미 이진화된 깨끗한 페이지면 SKIPPABLE_WHEN_CLEAN 단계를 생략
+    """
+
+    def __init__(self, stages=None, skip_if_clean=True):
+        self.stages = [(name, dict(params)) for name, params in (stages or DEFAULT_STAGES)]
+        self.skip_if_clean = skip_if_clean
+
+    def signature(self):
+        """캐시 키 등에 사용할 파이프라인 설정 문자열"""
+        parts = [f"{name}{sorted(params.items())}" for name, params in self.stages]
+        return "|".join(parts) + f"|skip_if_clean={self.skip_if_clean}"
+
+    def run(self, image):
+        """이미지를 전처리하여 그레이스케일 numpy 배열로 반환"""
+        current = to_gray_source(image)
+        owned = False  # current가 스레드 중간 버퍼인지 여부
+
+        # 컬러 배열(cv2.imread 결과 등)은 중간 버퍼로 그레이스케일 변환
+        if current.ndim == 3:
+            current = cv2.cvtColor(current, cv2.COLOR_RGB2GRAY, dst=_get_scratch(1, current.shape[:2]))  # type: ignore
+            owned = True
+
+        stages = self.stages
+        if self.skip_if_clean and is_clean_binary(current):
+            stages = [s for s in stages if s[0] not in SKIPPABLE_WHEN_CLEAN]
+
+        if not stages:
+            # 중간 버퍼는 다음 페이지에서 덮어쓰이므로 복사해서 반환
+            return current.copy() if owned else current
+
+        shape = current.shape[:2]
+        for k, (name, params) in enumerate(stages):
+            if k == len(stages) - 1:
+                dst = np.empty(shape, dtype=np.uint8)  # 호출자에게 돌려줄 결과
+            else:
+                dst = _get_scratch(k % 2, shape)
+            current = _run_stage(name, params, current, dst)
+        return current
@@ -0,0 +1,256 @@
+"""필드 템플릿 기반 영역(ROI) OCR 모듈
+
+고정 양식 문서에서 페이지 전체 대신 이름 붙은 필드 사각형만 잘라 전처리/OCR합니다.
+필드마다 알맞은 Tesseract 페이지 분할 모드(PSM)를 쓰고, 필드들은 스레드 풀에서 병렬로 처리합니다.
+PDF는 필드 영역만 pdftoppm으로 래스터화하므로 고해상도 페이지 전체를 만들지 않습니다.
+
+템플릿 JSON 형식 (box는 페이지 크기에 대한 비율 [left, top, width, height] → 해상도와 무관):
+    {
+      "name": "invoice",
+      "fields": [
+        {"name": "invoice_no", "box": [0.62, 0.08, 0.25, 0.03], "kind": "line"},
+        {"name": "shipper", "box": [0.05, 0.15, 0.40, 0.12], "kind": "block", "psm": 6}
+      ]
+    }
+
+빨강/파랑 테두리로 추출 영역을 표시한 PDF(예: 인보이스_추출영역_빨파.pdf)에서 템플릿을 만들 수도 있습니다.
+"""
+import json
+import argparse
+import cv2  # type: ignore
+import numpy as np  # type: ignore
+from concurrent.futures import ThreadPoolExecutor
+from PIL import Image  # type: ignore
+from pdf2image import convert_from_path, pdfinfo_from_path  # type: ignore
+from src.tesseract import ocr_data as od
+from src.tesseract.adaptive_dpi import rasterize_pdf_region
+from src.tesseract.run_tesseract import ocr_region_data, warm_up_ocr_backend
+
+# 필드 종류별 PSM (8: 단어 하나, 7: 한 줄, 6: 텍스트 블록, 11: 흩어진 텍스트)
+FIELD_KIND_PSM = {"word": 8, "line": 7, "block": 6, "sparse": 11}
+DEFAULT_FIELD_KIND = "block"
+ROI_PADDING_RATIO = 0.004   # 필드 박스 여백 (페이지 크기 대비)
+ROI_MAX_WORKERS = 4
+
+# 표시 PDF에서 영역을 찾을 때 쓰는 설정
+MARK_DPI = 100              # 표시 영역 검출용 래스터화 DPI (좌표는 비율로 저장하므로 낮아도 됨)
+MARK_MIN_AREA_RATIO = 0.0002  # 이보다 작은 표시는 무시 (페이지 면적 대비)
+# 테두리 선이 OCR되지 않도록 안쪽으로 줄이는 비율
+# (필드는 ROI_PADDING_RATIO만큼 넓혀 자르므로 그 여백에 선 두께(약 0.3%)를 더함)
+MARK_INSET_RATIO = ROI_PADDING_RATIO + 0.003
+MARK_COLOR_HSV_RANGES = {
+    "red": [((0, 120, 80), (10, 255, 255)), ((170, 120, 80), (180, 255, 255))],
+    "blue": [((100, 120, 80), (130, 255, 255))],
+}
+
+PDF_POINTS_PER_INCH = 72
+
+
+def field_psm(field):
+    """필드의 PSM (명시한 psm 우선, 없으면 kind에 따라)"""
+    if field.get('psm') is not None:
+        return int(field['psm'])
+    return FIELD_KIND_PSM[field.get('kind', DEFAULT_FIELD_KIND)]
+
+
+def load_template(template_path):
+    """템플릿 JSON을 읽고 필드 형식을 확인"""
+    with open(template_path, 'r', encoding='utf-8') as f:
+        template = json.load(f)
+
+    names = set()
+    for field in template.get('fields', []):
+        if field.get('name') in names:
+            raise ValueError(f"필드 이름이 중복되었습니다: {field.get('name')}")
+        names.add(field.get('name'))
+        if len(field.get('box', ())) != 4:
+            raise ValueError(f"필드 box는 [left, top, width, height] 비율이어야 합니다: {field.get('name')}")
+        if field.get('kind', DEFAULT_FIELD_KIND) not in FIELD_KIND_PSM:
+            raise ValueError(f"지원하지 않는 필드 종류: {field.get('kind')} (지원: {list(FIELD_KIND_PSM)})")
+    return template
+
+
+def save_template(template, template_path):
+    with open(template_path, 'w', encoding='utf-8') as f:
+        json.dump(template, f, ensure_ascii=False, indent=2)
+
+
+def field_pixel_box(field, page_size, padding_ratio=ROI_PADDING_RATIO):
+    """비율 박스를 페이지 픽셀 좌표 (left, top, right, bottom)로 변환 (여백 포함, 페이지 안으로 제한)"""
+    width, height = page_size
+    left, top, box_width, box_height = field['box']
+    pad_x, pad_y = padding_ratio * width, padding_ratio * height
+    return (
+        max(0, int((left * width) - pad_x)),
+        max(0, int((top * height) - pad_y)),
+        min(width, int(round((left + box_width) * width + pad_x))),
+        min(height, int(round((top + box_height) * height + pad_y))),
+    )
+
+
+def template_area_ratio(template):
+    """템플릿 필드들이 차지하는 페이지 면적 비율 (겹침 무시, 최대 1)"""
+    return min(1.0, sum(field['box'][2] * field['box'][3] for field in template.get('fields', [])))
+
+
+def ocr_field(image, field):
+    """필드 영역 이미지 하나를 필드 PSM으로 OCR하여 {'text', 'conf'} 반환"""
+    data = ocr_region_data(image, psm=field_psm(field))
+    words = od.word_indices(data, min_conf=0)
+    conf = sum(float(data['conf'][i]) for i in words) / len(words) if words else 0.0
+    return {'text': od.data_to_text(data, min_conf=0), 'conf': round(conf, 2)}
+
+
+def crop_field(image, box):
+    """PIL 이미지 또는 numpy 배열에서 박스 영역을 잘라냄 (numpy는 복사 없이 뷰로)"""
+    left, top, right, bottom = box
+    if isinstance(image, Image.Image):
+        return image.crop(box)
+    return image[top:bottom, left:right]
+
+
+def image_size_of(image):
+    if isinstance(image, Image.Image):
+        return image.size
+    return image.shape[1], image.shape[0]
+
+
+def collect_fields(futures):
+    """{필드 이름: future} → {필드 이름: {'text', 'conf'}} (실패한 필드는 'error' 포함)"""
+    results = {}
+    for name, future in futures.items():
+        try:
+            results[name] = future.result()
+        except Exception as e:
+            results[name] = {'text': "", 'conf': 0.0, 'error': str(e)}
+    return results
+
+
+def ocr_template_fields(image, template, executor=None):
+    """페이지 이미지에서 템플릿 필드 영역만 잘라 병렬로 OCR
+
+    Args:
+        image: 페이지 이미지 (PIL 또는 OpenCV numpy 배열)
+        template: load_template 결과
+        executor: 필드 작업을 넣을 스레드 풀 (None이면 이 호출 동안만 생성)
+
+    Returns:
+        {필드 이름: {'text', 'conf'}}
+    """
+    if executor is None:
+        with ThreadPoolExecutor(max_workers=ROI_MAX_WORKERS, initializer=warm_up_ocr_backend) as own_executor:
+            return ocr_template_fields(image, template, own_executor)
+    return collect_fields(submit_template_fields(executor, image, template))
+
+
+def submit_template_fields(executor, image, template):
+    """페이지 이미지의 필드별 OCR 작업을 스레드 풀에 넣고 {필드 이름: future} 반환"""
+    page_size = image_size_of(image)
+    return {
+        field['name']: executor.submit(ocr_field, crop_field(image, field_pixel_box(field, page_size)), field)
+        for field in template['fields']
+    }
+
+
+def pdf_page_pixel_size(pdf_path, page_number, dpi):
+    """pdfinfo의 페이지 크기(pt)로 dpi 해상도 기준 픽셀 크기 계산"""
+    info = pdfinfo_from_path(pdf_path, first_page=page_number, last_page=page_number)
+    width_pt, _, height_pt = info["Page size"].split()[:3]
+    scale = dpi / PDF_POINTS_PER_INCH
+    return int(round(float(width_pt) * scale)), int(round(float(height_pt) * scale))
+
+
+def ocr_pdf_field(pdf_path, page_number, dpi, box, field):
+    """PDF 페이지의 필드 영역만 래스터화하여 OCR"""
+    return ocr_field(rasterize_pdf_region(pdf_path, page_number, dpi, box), field)
+
+
+def ocr_pdf_template_fields(pdf_path, page_number, template, dpi, executor=None, page_size=None):
+    """PDF 페이지에서 템플릿 필드 영역만 래스터화/OCR (고해상도 페이지 전체를 만들지 않음)
+
+    page_size는 dpi 기준 페이지 픽셀 크기이며, 없으면 pdfinfo로 구합니다.
+    """
+    if executor is None:
+        with ThreadPoolExecutor(max_workers=ROI_MAX_WORKERS, initializer=warm_up_ocr_backend) as own_executor:
+            return ocr_pdf_template_fields(pdf_path, page_number, template, dpi, own_executor, page_size)
+    return collect_fields(submit_pdf_template_fields(executor, pdf_path, page_number, template, dpi, page_size))
+
+
+def submit_pdf_template_fields(executor, pdf_path, page_number, template, dpi, page_size=None):
+    """PDF 페이지의 필드별 래스터화/OCR 작업을 스레드 풀에 넣고 {필드 이름: future} 반환"""
+    page_size = page_size or pdf_page_pixel_size(pdf_path, page_number, dpi)
+    return {
+        field['name']: executor.submit(
+            ocr_pdf_field, pdf_path, page_number, dpi, field_pixel_box(field, page_size), field,
+        )
+        for field in template['fields']
+    }
+
+
+def find_marked_boxes(image, color):
+    """지정한 색으로 표시된 사각형들의 픽셀 박스 (left, top, right, bottom) 목록"""
+    rgb = np.asarray(image.convert('RGB')) if isinstance(image, Image.Image) else cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+    hsv = cv2.cvtColor(rgb, cv2.COLOR_RGB2HSV)
+    mask = np.zeros(hsv.shape[:2], dtype=np.uint8)
+    for lower, upper in MARK_COLOR_HSV_RANGES[color]:
+        mask |= cv2.inRange(hsv, np.array(lower, dtype=np.uint8), np.array(upper, dtype=np.uint8))
+
+    height, width = mask.shape
+    min_area = MARK_MIN_AREA_RATIO * width * height
+    contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    boxes = []
+    for contour in contours:
+        x, y, w, h = cv2.boundingRect(contour)
+        if w * h >= min_area:
+            boxes.append((x, y, x + w, y + h))
+    return boxes
+
+
+def derive_template_from_marks(image, colors=tuple(MARK_COLOR_HSV_RANGES), name="marked"):
+    """색 테두리로 영역을 표시한 페이지 이미지에서 템플릿 생성
+
+    필드 이름은 "{색}_{번호}" (위→아래, 왼쪽→오른쪽 순)이며, 생성 후 JSON에서 알맞게 바꿔 씁니다.
+    """
+    width, height = image_size_of(image)
+    inset_x, inset_y = MARK_INSET_RATIO * width, MARK_INSET_RATIO * height
+    fields = []
+    for color in colors:
+        boxes = sorted(find_marked_boxes(image, color), key=lambda box: (box[1], box[0]))
+        for idx, (left, top, right, bottom) in enumerate(boxes, 1):
+            left, top = left + inset_x, top + inset_y
+            right, bottom = max(left + 1, right - inset_x), max(top + 1, bottom - inset_y)
+            fields.append({
+                'name': f"{color}_{idx:02d}",
+                'box': [round(left / width, 5), round(top / height, 5),
+                        round((right - left) / width, 5), round((bottom - top) / height, 5)],
+                'kind': DEFAULT_FIELD_KIND,
+                'color': color,
+            })
+    return {'name': name, 'fields': fields}
+
+
+def derive_template_from_pdf(pdf_path, page_number=1, dpi=MARK_DPI, colors=tuple(MARK_COLOR_HSV_RANGES)):
+    """표시 PDF의 한 페이지를 낮은 DPI로 래스터화하여 템플릿 생성"""
+    pages = convert_from_path(pdf_path, dpi=dpi, fmt='RGB', first_page=page_number, last_page=page_number)
+    if not pages:
+        raise ValueError(f"페이지를 변환할 수 없습니다: {pdf_path} 페이지 {page_number}")
+    return derive_template_from_marks(pages[0], colors, name=f"{pdf_path}#{page_number}")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="색 테두리로 영역을 표시한 PDF/이미지에서 필드 템플릿 JSON 생성")
+    parser.add_argument('input', help="표시 PDF 또는 이미지 (예: assets/인보이스_추출영역_빨파.pdf)")
+    parser.add_argument('-o', '--output', default="roi_template.json", help="템플릿 JSON 저장 경로")
+    parser.add_argument('--page', type=int, default=1, help="PDF에서 사용할 페이지 번호")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.input.lower().endswith('.pdf'):
+        marked_template = derive_template_from_pdf(args.input, args.page)
+    else:
+        with Image.open(args.input) as marked_image:
+            marked_template = derive_template_from_marks(marked_image.convert('RGB'), name=args.input)
+    save_template(marked_template, args.output)
+    print(f"✅ 필드 {len(marked_template['fields'])}개 템플릿 저장: {args.output}")
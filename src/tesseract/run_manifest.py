@@ -0,0 +1,196 @@
+"""실행 매니페스트 모듈
+
+일괄 처리 결과를 입력 파일(경로, 크기, 수정 시간, SHA-256)과 페이지별로 기록해 두고,
+다음 실행에서 내용과 OCR 설정이 그대로인 페이지는 다시 처리하지 않고 이전 결과 파일을 참조합니다.
+- 크기와 수정 시간이 같은 파일은 해시를 다시 계산하지 않음 (변경되지 않은 입력은 파일을 읽지도 않음)
+- 페이지 항목은 입력 해시와 OCR 설정(DPI, 모드, 언어, 전처리 등)으로 만든 키가 같고
+  이전 결과 파일이 남아 있을 때만 재사용
+OCR 결과 캐시(ocr_cache)와 달리 결과를 다시 쓰지 않으므로 실행 시간이 변경된 페이지 수에 비례합니다.
+
+변경 사항은 일어나는 대로 옆의 로그 파일(.log, JSON Lines)에 한 줄씩 추가하므로 중간에 중단되어도
+완료된 페이지 기록이 남고, save()가 매니페스트 JSON을 다시 쓰면서 로그를 비웁니다.
+"""
+import os
+import json
+import shutil
+import threading
+from datetime import datetime
+from src.tesseract.ocr_cache import hash_file
+
+RUN_MANIFEST_PATH = os.path.join("test_result", "run_manifest.json")
+RUN_MANIFEST_VERSION = 2  # 2: 일괄 처리 출력 디렉토리에 경로 해시 추가 (이전 기록은 덮어쓴 경로일 수 있음)
+RUN_MANIFEST_LOG_SUFFIX = ".log"
+RUN_MANIFEST_LINK_OUTPUTS = False  # True면 재사용한 결과 파일을 이번 실행 출력 디렉토리에 하드 링크
+ARTIFACT_FIELDS = ('output_file', 'original_image', 'processed_image', 'boxed_image')
+
+
+def page_id(page_number):
+    """매니페스트 페이지 항목 이름 (이미지 파일은 'image')"""
+    return "image" if page_number is None else str(page_number)
+
+
+def link_artifact(path, output_dir):
+    """이전 결과 파일을 output_dir에 하드 링크 (다른 파일 시스템이면 복사)하고 새 경로를 반환"""
+    os.makedirs(output_dir, exist_ok=True)
+    target = os.path.join(output_dir, os.path.basename(path))
+    if os.path.exists(target):
+        return target
+    try:
+        os.link(path, target)
+    except OSError:
+        shutil.copy2(path, target)
+    return target
+
+
+class RunManifest:
+    """입력 파일/페이지별 처리 기록 (스레드 안전, 변경은 로그에 바로 추가하고 save()로 정리)"""
+
+    def __init__(self, path=RUN_MANIFEST_PATH):
+        self.path = path
+        self.log_path = path + RUN_MANIFEST_LOG_SUFFIX
+        self.reused = 0
+        self.recorded = 0
+        self._lock = threading.Lock()
+        self._files = {}
+        self._log = None
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == RUN_MANIFEST_VERSION:
+                self._files = data.get('files', {})
+        except (OSError, ValueError):
+            pass
+        self._replay_log()
+
+    def _entry(self, file_path):
+        return self._files.get(os.path.abspath(file_path))
+
+    def _apply(self, change):
+        """변경 하나를 메모리 기록에 반영 (self._lock 보유 상태 또는 로드 중에 호출)"""
+        kind, key = change['op'], change['file']
+        if kind == "file":
+            entry = self._files.get(key)
+            if not entry or entry['sha256'] != change['sha256']:
+                entry = self._files[key] = {'sha256': change['sha256'], 'pdf_info': None, 'pages': {}}
+            entry.update(size=change['size'], mtime_ns=change['mtime_ns'])
+            return
+        entry = self._files.get(key)
+        if entry is None:
+            return
+        if kind == "pdf_info":
+            entry['pdf_info'] = change['pdf_info']
+        elif kind == "page":
+            entry['pages'][change['page']] = change['entry']
+
+    def _replay_log(self):
+        """이전 실행이 save() 전에 중단되어 남은 로그를 반영 (덜 쓰인 마지막 줄은 무시)"""
+        try:
+            with open(self.log_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        self._apply(json.loads(line))
+                    except (ValueError, KeyError):
+                        continue
+        except OSError:
+            pass
+
+    def _change(self, change):
+        """변경을 메모리에 반영하고 로그에 한 줄 추가 (self._lock 보유 상태에서 호출)"""
+        self._apply(change)
+        if self._log is None:
+            directory = os.path.dirname(self.log_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._log = open(self.log_path, 'a', encoding='utf-8')
+        self._log.write(json.dumps(change, ensure_ascii=False) + "\n")
+        self._log.flush()
+
+    def file_digest(self, file_path):
+        """파일 SHA-256 (크기와 수정 시간이 기록과 같으면 다시 읽지 않음)
+
+        내용이 바뀐 파일은 이전 페이지 기록을 지웁니다.
+        """
+        stat = os.stat(file_path)
+        key = os.path.abspath(file_path)
+        with self._lock:
+            entry = self._files.get(key)
+            if entry and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+                return entry['sha256']
+
+        digest = hash_file(file_path)
+        with self._lock:
+            self._change({'op': "file", 'file': key, 'sha256': digest,
+                          'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns})
+        return digest
+
+    def pdf_info(self, file_path):
+        """기록된 PDF 정보 {'Pages', 'Page size'} (없으면 None, file_digest 이후에 호출)"""
+        with self._lock:
+            entry = self._entry(file_path)
+            return entry.get('pdf_info') if entry else None
+
+    def set_pdf_info(self, file_path, info):
+        """pdfinfo 결과 중 페이지 수와 페이지 크기(작업 비용 추정용)를 기록"""
+        with self._lock:
+            if self._entry(file_path) is not None:
+                self._change({'op': "pdf_info", 'file': os.path.abspath(file_path),
+                              'pdf_info': {name: info[name] for name in ("Pages", "Page size") if name in info}})
+
+    def lookup(self, file_path, page_number, key):
+        """같은 키로 처리한 기록이 있고 결과 파일이 남아 있으면 그 항목을 반환 (없으면 None)"""
+        with self._lock:
+            entry = self._entry(file_path)
+            page = entry['pages'].get(page_id(page_number)) if entry else None
+        if not page or page['key'] != key or not os.path.exists(page['outputs'].get('output_file') or ""):
+            return None
+        return page
+
+    def record(self, file_path, page_number, key, params, result):
+        """성공한 페이지 결과의 출력 파일과 사용한 설정을 기록"""
+        if not result.get('success'):
+            return
+        with self._lock:
+            if self._entry(file_path) is None:
+                return
+            self._change({'op': "page", 'file': os.path.abspath(file_path), 'page': page_id(page_number), 'entry': {
+                'key': key,
+                'params': params,
+                'outputs': {field: result.get(field) for field in ARTIFACT_FIELDS if result.get(field)},
+                'updated': datetime.now().isoformat(timespec='seconds'),
+            }})
+            self.recorded += 1
+
+    def reuse_result(self, page, page_info, output_dir=None, link=RUN_MANIFEST_LINK_OUTPUTS):
+        """기록된 항목으로 페이지 결과 dict를 만듦 (link면 output_dir에 결과 파일을 링크)"""
+        outputs = dict(page['outputs'])
+        if link and output_dir:
+            outputs = {field: link_artifact(path, output_dir) for field, path in outputs.items() if os.path.exists(path)}
+        with self._lock:
+            self.reused += 1
+        return {
+            'success': True,
+            **{field: outputs.get(field) for field in ARTIFACT_FIELDS},
+            'manifest_reused': True,
+            'page_info': page_info,
+        }
+
+    def save(self):
+        """임시 파일에 쓴 뒤 교체하여 저장하고, 반영된 로그를 지움"""
+        with self._lock:
+            data = {'version': RUN_MANIFEST_VERSION, 'files': self._files}
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            temp_path = f"{self.path}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, indent=1)
+            os.replace(temp_path, self.path)
+            if self._log is not None:
+                self._log.close()
+                self._log = None
+            if os.path.exists(self.log_path):
+                os.remove(self.log_path)
+        return self.path
+
+    def summary(self):
+        return f"재사용 {self.reused}페이지 / 새로 기록 {self.recorded}페이지"
@@ -3,8 +3,18 @@ import os
 import json
 import cv2  # type: ignore
 import pytesseract  # type: ignore
-from PIL import Image, ImageDraw, ImageFont  # type: ignore
+from PIL import Image  # type: ignore
 import numpy as np
+from src.tesseract.ocr_backend import get_ocr_backend
+from src.tesseract.preprocess import PreprocessPipeline
+from src.tesseract.artifacts import get_artifact_writer, ARTIFACT_MAX_DIMENSION
+from src.tesseract.columnar import save_columnar_result
+from src.tesseract.metrics import StageTimer, peak_rss_mb, image_megabytes
+from src.tesseract.page_triage import triage_page, needs_correction, correct_page
+from src.tesseract.tiling import should_tile, ocr_tiled, get_tile_executor
+from src.tesseract.multipass import second_pass_ocr
+from src.tesseract.page_buffer import AttachedPage
+from src.tesseract import ocr_data as od
 
 # Set tesseract path if needed (common Windows paths)
 if os.name == 'nt':  # Windows
@@ -19,43 +29,73 @@ if os.name == 'nt':  # Windows
 # LANGUAGE = "kor+eng"
 LANGUAGE = "eng"
 
-def enhance_image_quality(image):
-    """이미지 품질을 향상시키는 함수"""
-    # PIL Image를 numpy array로 변환
-    if isinstance(image, Image.Image):
-        image = np.array(image)
-    
-    # 그레이스케일 변환
-    if len(image.shape) == 3:
-        gray = cv2.cvtColor(image, cv2.COLOR_RGB2GRAY)  # type: ignore
-    else:
-        gray = image
-    
-    # 노이즈 제거
-    denoised = cv2.medianBlur(gray, 3)  # type: ignore
-    
-    # 대비 향상 (CLAHE)
-    clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))  # type: ignore
-    enhanced = clahe.apply(denoised)
-    
-    # 샤프닝
-    kernel = np.array([[-1, -1, -1], [-1, 9, -1], [-1, -1, -1]])
-    sharpened = cv2.filter2D(enhanced, -1, kernel)  # type: ignore
-    
-    return sharpened
+# OCR 백엔드: "auto"는 tesserocr가 있으면 사용하고 없으면 pytesseract 사용
+OCR_BACKEND = "auto"
+
+# image_to_data 결과 저장 형식 (columnar는 단어 행만 남기는 COLUMNAR_PRUNE 적용)
+DATA_OUTPUT_FORMAT_LIST = ["json", "columnar", "both"]
+DATA_OUTPUT_FORMAT = "json"
+COLUMNAR_PRUNE = True
 
+# 기본 전처리 파이프라인 (단계 구성은 src/tesseract/preprocess.py의 DEFAULT_STAGES)
+PREPROCESS_PIPELINE = PreprocessPipeline()
+
+# 전처리 전 사전 판정: 빈 페이지는 OCR 생략, 돌아가거나 기울어진 페이지는 한 번 보정 후 OCR
+# 방향 검출(OSD)로 페이지마다 OCR 호출이 하나 늘고(pytesseract 백엔드는 프로세스 하나),
+# 보정한 페이지는 결과 좌표가 원본과 달라지므로 기본은 끔 (판정 기준은 src/tesseract/page_triage.py)
+PAGE_TRIAGE_ENABLED = False
+
+# 타일 OCR: 큰 페이지(image_to_data 모드)를 겹치는 타일로 나눠 페이지 안에서도 병렬로 OCR
+# (타일 크기/겹침/여백 기준 분할은 src/tesseract/tiling.py)
+TILED_OCR_ENABLED = False
+
+# 다중 패스 OCR: LANGUAGE(eng)로 1차 OCR 후 신뢰도가 낮거나 한글처럼 보이는 줄만
+# kor+eng 또는 다른 PSM으로 다시 읽어 단어별로 신뢰도가 높은 쪽을 남김 (image_to_data 모드 전용)
+# (판정 기준/2차 언어는 src/tesseract/multipass.py)
+MULTIPASS_ENABLED = False
+
+
+def warm_up_ocr_backend(backend=OCR_BACKEND, lang=LANGUAGE):
+    """워커 초기화용: 현재 스레드의 OCR 엔진을 미리 로드"""
+    try:
+        get_ocr_backend(backend).warm_up(lang)
+    except Exception as e:
+        # 초기화 실패 시에도 실제 OCR 호출에서 오류가 보고되도록 워커는 유지
+        print(f"⚠️ OCR 백엔드 초기화 실패: {e}")
 
-def ocr_with_string_mode(image, lang=LANGUAGE):
+def ocr_page_data(image):
+    """페이지 전체를 image_to_data 모드로 OCR (큰 페이지는 타일 OCR) -> (결과, 타일 수)"""
+    if TILED_OCR_ENABLED and should_tile(image):
+        return ocr_tiled(image, ocr_with_data_mode, get_tile_executor(initializer=warm_up_ocr_backend))
+    return ocr_with_data_mode(image), 0
+
+
+def ocr_second_pass_region(image, lang=None, psm=None):
+    """다중 패스 2차 OCR용: 영역 이미지를 지정한 언어(기본: LANGUAGE)/PSM으로 OCR"""
+    return ocr_with_data_mode(image, lang=lang or LANGUAGE, psm=psm)
+
+
+def enhance_image_quality(image, pipeline=None):
+    """이미지 품질을 향상시키는 함수 (그레이스케일 → 노이즈 제거 → CLAHE → 샤프닝)"""
+    return (pipeline or PREPROCESS_PIPELINE).run(image)
+
+
+def ocr_with_string_mode(image, lang=LANGUAGE, backend=OCR_BACKEND, psm=None):
     """image_to_string 모드로 OCR 수행"""
-    return pytesseract.image_to_string(image, lang=lang)
+    return get_ocr_backend(backend).image_to_string(image, lang, psm=psm)
 
 
-def ocr_with_data_mode(image, lang=LANGUAGE):
+def ocr_with_data_mode(image, lang=LANGUAGE, backend=OCR_BACKEND, psm=None):
     """image_to_data 모드로 OCR 수행"""
-    data = pytesseract.image_to_data(image, lang=lang, output_type=pytesseract.Output.DICT)
+    data = get_ocr_backend(backend).image_to_data(image, lang, psm=psm)
     return data
 
 
+def ocr_region_data(image, psm=None, lang=LANGUAGE):
+    """영역 이미지를 전처리한 뒤 image_to_data 모드로 OCR 수행"""
+    return ocr_with_data_mode(enhance_image_quality(image), lang=lang, psm=psm)
+
+
 def save_string_result(text, output_file, page_info=""):
     """문자열 결과를 파일로 저장"""
     with open(output_file, 'w', encoding='utf-8') as f:
@@ -63,159 +103,407 @@ def save_string_result(text, output_file, page_info=""):
         f.write(text)
 
 
-def save_data_result(data, output_file, page_info=""):
-    """데이터 결과를 파일로 저장"""
-    # JSON 형태로 저장
-    json_file = output_file.replace('.txt', '_data.json')
-    with open(json_file, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
-    
+def save_data_result(data, output_file, page_info="", output_format=None):
+    """데이터 결과를 파일로 저장
+
+    output_format(기본: DATA_OUTPUT_FORMAT)
+        json: 기존 pretty-print JSON
+        columnar: 컬럼형 바이너리(.npy + 문자열 테이블, src/tesseract/columnar.py)
+        both: 둘 다 저장
+    """
+    output_format = output_format or DATA_OUTPUT_FORMAT
+    if output_format not in DATA_OUTPUT_FORMAT_LIST:
+        raise ValueError(f"지원하지 않는 결과 저장 형식: {output_format}")
+
+    detail_files = []
+    if output_format in ("json", "both"):
+        # JSON 형태로 저장
+        json_file = output_file.replace('.txt', '_data.json')
+        with open(json_file, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        detail_files.append(json_file)
+    if output_format in ("columnar", "both"):
+        npy_file, _ = save_columnar_result(data, output_file.replace('.txt', '_data'), prune=COLUMNAR_PRUNE)
+        detail_files.append(npy_file)
+
+    # 신뢰도가 0 초과이고 텍스트가 있는 단어만 numpy로 선별
+    confidences = np.asarray(data['conf'], dtype=np.float32)
+    rows = select_box_rows(data, min_conf=0)
+    words = data['text']
+    texts = [f"[신뢰도: {data['conf'][i]}] {words[i]}" for i in rows.tolist()]
+    mean_conf = float(confidences.mean()) if confidences.size else 0.0
+
     # 텍스트 형태로도 저장 (가독성을 위해)
     with open(output_file, 'w', encoding='utf-8') as f:
         f.write(f"=== {page_info} OCR 결과 (Data Mode) ===\n\n")
-        
-        # 신뢰도가 높은 텍스트만 추출
-        texts = []
-        confidences = data['conf']
-        words = data['text']
-        
-        for i, (conf, word) in enumerate(zip(confidences, words)):
-            if conf > 0 and word.strip():  # 신뢰도 30 이상인 단어만
-                texts.append(f"[신뢰도: {conf}] {word}")
-        
         f.write("=== 추출된 텍스트 (신뢰도 30 이상) ===\n")
         f.write('\n'.join(texts))
         
         f.write(f"\n\n=== 상세 데이터 ===\n")
-        f.write(f"총 감지된 요소 수: {len(data['text'])}\n")
-        f.write(f"평균 신뢰도: {sum(confidences)/len(confidences):.2f}\n")
-        f.write(f"상세 데이터는 {json_file} 파일을 참조하세요.\n")
+        f.write(f"총 감지된 요소 수: {len(words)}\n")
+        f.write(f"평균 신뢰도: {mean_conf:.2f}\n")
+        f.write(f"상세 데이터는 {', '.join(detail_files)} 파일을 참조하세요.\n")
+
+
+# 바운딩 박스 색상 기준: None이면 전부 빨간색, 그 외에는 해당 단위마다 색을 바꿈
+BOX_COLOR_BY_LIST = [None, "block", "paragraph", "line"]
+BOX_MIN_CONF = 30
+BOX_COLOR = (255, 0, 0)        # RGB 빨간색
+BOX_LABEL_COLOR = (0, 0, 255)  # RGB 파란색
+BOX_PALETTE = np.array([
+    (230, 25, 75), (60, 180, 75), (0, 130, 200), (245, 130, 48), (145, 30, 180),
+    (70, 240, 240), (240, 50, 230), (128, 128, 0), (0, 128, 128), (170, 110, 40),
+], dtype=np.int32)
+
+
+def select_box_rows(ocr_data, min_conf=BOX_MIN_CONF):
+    """신뢰도가 min_conf 초과이고 텍스트가 있는 행의 인덱스를 numpy로 계산"""
+    conf = np.asarray(ocr_data['conf'], dtype=np.float32)
+    texts = np.asarray(ocr_data['text'], dtype=str)
+    has_text = np.char.str_len(np.char.strip(texts)) > 0
+    return np.flatnonzero((conf > min_conf) & has_text)
 
 
-def draw_bounding_boxes(image, ocr_data):
-    """OCR 결과에 바운딩 박스를 그리는 함수"""
-    # PIL Image로 변환 (이미 PIL Image인 경우 그대로 사용)
+def box_group_ids(ocr_data, rows, color_by):
+    """color_by 단위(block/paragraph/line)별 그룹 번호"""
+    columns = {"block": ["block_num"], "paragraph": ["block_num", "par_num"],
+               "line": ["block_num", "par_num", "line_num"]}[color_by]
+    keys = np.stack([np.asarray(ocr_data[c], dtype=np.int64)[rows] for c in columns], axis=1)
+    _, group_ids = np.unique(keys, axis=0, return_inverse=True)
+    return group_ids.reshape(-1)
+
+
+def to_rgb_canvas(image, scale):
+    """그리기용 RGB numpy 캔버스 생성 (scale < 1이면 축소한 뒤 복사)"""
     if isinstance(image, np.ndarray):
+        if scale < 1:
+            height, width = image.shape[:2]
+            image = cv2.resize(image, (max(1, int(width * scale)), max(1, int(height * scale))),
+                               interpolation=cv2.INTER_AREA)  # type: ignore
         if len(image.shape) == 3:
             # BGR to RGB 변환 (OpenCV는 BGR, PIL은 RGB)
-            image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-        else:
-            image_rgb = cv2.cvtColor(image, cv2.COLOR_GRAY2RGB)
-        pil_image = Image.fromarray(image_rgb)
+            return cv2.cvtColor(image, cv2.COLOR_BGR2RGB)  # type: ignore
+        return cv2.cvtColor(image, cv2.COLOR_GRAY2RGB)  # type: ignore
+
+    if scale < 1:
+        width, height = image.size
+        image = image.resize((max(1, int(width * scale)), max(1, int(height * scale))),
+                             Image.BILINEAR, reducing_gap=2.0)
+    if image.mode != 'RGB':
+        image = image.convert('RGB')
+    return np.array(image)
+
+
+def draw_bounding_boxes(image, ocr_data, max_dimension=None, color_by=None,
+                        min_conf=BOX_MIN_CONF, draw_labels=True):
+    """OCR 결과에 바운딩 박스를 그리는 함수
+
+    필터링과 좌표 계산은 numpy로 한 번에 하고, 박스는 색상별로 cv2.polylines
+    한 번의 호출로 그립니다. (OpenCV 호출 중에는 GIL이 해제됨)
+
+    Args:
+        max_dimension: 지정하면 긴 변이 이 값이 되도록 축소한 캔버스에 그림
+        color_by: None, "block", "paragraph", "line" 중 하나
+        draw_labels: 박스 위에 신뢰도 숫자를 표시할지 여부
+    """
+    if color_by not in BOX_COLOR_BY_LIST:
+        raise ValueError(f"지원하지 않는 색상 기준: {color_by}")
+
+    width, height = (image.shape[1], image.shape[0]) if isinstance(image, np.ndarray) else image.size
+    scale = 1.0
+    if max_dimension is not None and max(width, height) > max_dimension:
+        scale = max_dimension / max(width, height)
+    canvas = to_rgb_canvas(image, scale)
+
+    # 신뢰도가 30 이상이고 텍스트가 있는 경우만 박스 그리기
+    rows = select_box_rows(ocr_data, min_conf)
+    if rows.size == 0:
+        return Image.fromarray(canvas)
+
+    left = np.asarray(ocr_data['left'], dtype=np.float32)[rows] * scale
+    top = np.asarray(ocr_data['top'], dtype=np.float32)[rows] * scale
+    right = left + np.asarray(ocr_data['width'], dtype=np.float32)[rows] * scale
+    bottom = top + np.asarray(ocr_data['height'], dtype=np.float32)[rows] * scale
+
+    # (N, 4, 2) 꼭짓점 배열
+    corners = np.stack([
+        np.stack([left, top], axis=1), np.stack([right, top], axis=1),
+        np.stack([right, bottom], axis=1), np.stack([left, bottom], axis=1),
+    ], axis=1).round().astype(np.int32)
+
+    thickness = max(1, int(round(4 * scale)))
+    if color_by is None:
+        cv2.polylines(canvas, corners, True, BOX_COLOR, thickness)  # type: ignore
     else:
-        pil_image = image.copy()
-    
-    draw = ImageDraw.Draw(pil_image)
-    
-    # 폰트 설정 (기본 폰트 사용)
-    try:
-        font = ImageFont.truetype("arial.ttf", 12)
-    except:
-        font = ImageFont.load_default()
-    
-    # 바운딩 박스 그리기
-    n_boxes = len(ocr_data['level'])
-    for i in range(n_boxes):
-        # 신뢰도가 30 이상이고 텍스트가 있는 경우만 박스 그리기
-        if int(ocr_data['conf'][i]) > 30 and ocr_data['text'][i].strip():
-            x = ocr_data['left'][i]
-            y = ocr_data['top'][i]
-            w = ocr_data['width'][i]
-            h = ocr_data['height'][i]
-            
-            # 바운딩 박스 그리기 (빨간색)
-            draw.rectangle([x, y, x + w, y + h], outline='red', width=4)
-            
-            # 신뢰도 텍스트 추가 (작은 글씨로)
-            conf_text = f"{ocr_data['conf'][i]}"
-            draw.text((x, y - 15), conf_text, fill='blue', font=font)
-    
-    return pil_image
+        colors = box_group_ids(ocr_data, rows, color_by) % len(BOX_PALETTE)
+        for color_idx in np.unique(colors):
+            color = tuple(int(c) for c in BOX_PALETTE[color_idx])
+            cv2.polylines(canvas, corners[colors == color_idx], True, color, thickness)  # type: ignore
 
+    # 신뢰도 텍스트 추가 (작은 글씨로)
+    if draw_labels:
+        font_scale = max(0.3, 0.4 * scale)
+        label_offset = max(2, int(round(4 * scale)))
+        confs = np.asarray(ocr_data['conf'])[rows]
+        for x, y, conf in zip(corners[:, 0, 0].tolist(), corners[:, 0, 1].tolist(), confs.tolist()):
+            cv2.putText(canvas, f"{conf}", (x, max(0, y - label_offset)), cv2.FONT_HERSHEY_SIMPLEX,
+                        font_scale, BOX_LABEL_COLOR, 1, cv2.LINE_AA)  # type: ignore
+
+    return Image.fromarray(canvas)
+
+
+def save_original_and_boxed_images(image_input, output_dir, file_prefix, ocr_data=None, writer=None):
+    """원본 이미지와 바운딩 박스가 그려진 이미지를 저장하는 함수
+
+    저장 정책/백그라운드 인코딩은 writer(기본: 공용 ArtifactWriter)를 따르며,
+    반환하는 경로는 저장이 예약된 경로입니다. (저장하지 않으면 None)
+    """
+    writer = writer or get_artifact_writer()
+    if not (writer.wants("original") or (ocr_data is not None and writer.wants("boxed"))):
+        return None, None
 
-def save_original_and_boxed_images(image_input, output_dir, file_prefix, ocr_data=None):
-    """원본 이미지와 바운딩 박스가 그려진 이미지를 저장하는 함수"""
-    
-    # 원본 이미지 저장
-    original_image_file = os.path.join(output_dir, f"{file_prefix}_original.png")
-    
     if isinstance(image_input, str):
-        # 파일 경로인 경우
+        # 파일 경로인 경우 (백그라운드 스레드들이 함께 읽으므로 미리 디코딩)
         original_image = Image.open(image_input)
+        original_image.load()
     else:
         # PIL Image 객체인 경우
         original_image = image_input
-    
+
     # 원본 이미지 저장
-    original_image.save(original_image_file)
-    
-    # 바운딩 박스가 그려진 이미지 저장 (OCR 데이터가 있는 경우)
+    original_image_file = writer.submit(
+        "original", original_image, os.path.join(output_dir, f"{file_prefix}_original")
+    )
+
+    # 바운딩 박스가 그려진 이미지 저장 (OCR 데이터가 있는 경우, 그리기도 백그라운드에서 수행)
     boxed_image_file = None
     if ocr_data is not None:
-        boxed_image = draw_bounding_boxes(original_image, ocr_data)
-        boxed_image_file = os.path.join(output_dir, f"{file_prefix}_with_boxes.png")
-        boxed_image.save(boxed_image_file)
-    
+        # 썸네일 정책이면 처음부터 축소한 캔버스에 그림
+        max_dimension = ARTIFACT_MAX_DIMENSION if writer.policy == "thumbnail" else None
+        boxed_image_file = writer.submit(
+            "boxed",
+            lambda: draw_bounding_boxes(original_image, ocr_data, max_dimension=max_dimension),
+            os.path.join(output_dir, f"{file_prefix}_with_boxes"),
+        )
+
     return original_image_file, boxed_image_file
 
 
-def process_single_image(image_input, output_dir, ocr_mode, page_info="", file_prefix="image"):
-    """단일 이미지에 대해 OCR을 수행하는 함수"""
+def save_ocr_result(result, output_dir, ocr_mode, page_info="", file_prefix="image"):
+    """OCR 모드에 맞는 형식으로 결과를 저장하고 출력 파일 경로를 반환"""
+    if ocr_mode == "image_to_string":
+        output_file = os.path.join(output_dir, f"{file_prefix}_string.txt")
+        save_string_result(result, output_file, page_info)
+    elif ocr_mode == "image_to_data":
+        output_file = os.path.join(output_dir, f"{file_prefix}_data.txt")
+        save_data_result(result, output_file, page_info)
+    else:
+        raise ValueError(f"지원하지 않는 OCR 모드: {ocr_mode}")
+    return output_file
+
+
+def empty_ocr_result(ocr_mode):
+    """빈 페이지에 쓸 OCR 모드별 빈 결과"""
+    return od.empty_ocr_data() if ocr_mode == "image_to_data" else ""
+
+
+def page_metrics(timer, image=None):
+    """페이지 결과에 담을 지표 (단계별 시간, 이미지 버퍼 크기, 프로세스 최대 메모리)"""
+    return {
+        'stages': timer.as_dict(),
+        'image_mb': image_megabytes(image) if image is not None else None,
+        'peak_rss_mb': peak_rss_mb(),
+    }
+
+
+def process_cached_result(cached, output_dir, ocr_mode, page_info="", file_prefix="image", keep_result=False):
+    """캐시된 OCR 결과로 결과 파일만 다시 쓰는 함수 (래스터화/OCR/이미지 저장 생략)
+
+    keep_result가 True면 반환 dict의 'ocr_result'에 OCR 결과를 함께 담습니다.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    timer = StageTimer()
+    try:
+        with timer.stage("save_result"):
+            output_file = save_ocr_result(cached['result'], output_dir, ocr_mode, page_info, file_prefix)
+        page_result = {
+            'success': True,
+            'output_file': output_file,
+            'processed_image': None,
+            'original_image': None,
+            'boxed_image': None,
+            'cache_hit': True,
+            'metrics': page_metrics(timer),
+            'page_info': page_info
+        }
+        if keep_result:
+            page_result['ocr_result'] = cached['result']
+        return page_result
+    except Exception as e:
+        return {
+            'success': False,
+            'error': str(e),
+            'page_info': page_info
+        }
+
+
+def blank_page_result(triage, timer, image, output_dir, ocr_mode, page_info, file_prefix,
+                      cache=None, cache_key=None, keep_result=False):
+    """빈 페이지는 전처리/OCR/이미지 저장 없이 빈 결과 파일만 남김"""
+    result = empty_ocr_result(ocr_mode)
+    with timer.stage("save_result"):
+        output_file = save_ocr_result(result, output_dir, ocr_mode, page_info, file_prefix)
+        if cache is not None and cache_key is not None:
+            cache.put(cache_key, {'ocr_mode': ocr_mode, 'result': result})
+    page_result = {
+        'success': True,
+        'output_file': output_file,
+        'processed_image': None,
+        'original_image': None,
+        'boxed_image': None,
+        'blank_page': True,
+        'page_triage': triage,
+        'metrics': page_metrics(timer, image),
+        'page_info': page_info
+    }
+    if keep_result:
+        page_result['ocr_result'] = result
+    return page_result
+
+
+def process_single_image(image_input, output_dir, ocr_mode, page_info="", file_prefix="image",
+                         refine_data=None, cache=None, cache_key=None, keep_result=False):
+    """단일 이미지에 대해 OCR을 수행하는 함수
+
+    refine_data가 주어지면 image_to_data 결과를 저장하기 전에
+    refine_data(data) -> (data, 재인식 영역 수)로 보정합니다. (다중 해상도 모드)
+    cache와 cache_key가 주어지면 OCR 결과를 캐시에 저장합니다. (조회는 호출자가 담당)
+    keep_result가 True면 반환 dict의 'ocr_result'에 OCR 결과를 함께 담습니다. (후속 단계로 바로 넘길 때)
+    반환 dict의 'metrics'에는 단계별 소요 시간(초)과 메모리 지표가 들어갑니다.
+
+    PAGE_TRIAGE_ENABLED면 전처리 전에 축소 사본으로 페이지를 판정하여(반환 dict의 'page_triage')
+    빈 페이지는 빈 결과만 저장하고, 돌아가거나 기울어진 페이지는 보정한 이미지로 OCR합니다.
+    보정한 페이지는 좌표가 PDF와 맞지 않으므로 refine_data를 적용하지 않습니다.
+    """
     
     # 출력 디렉토리 생성
     os.makedirs(output_dir, exist_ok=True)
+    timer = StageTimer()
+    image = None
     
     try:
         # 이미지 처리
-        if isinstance(image_input, str):
-            # 이미지 파일 경로인 경우
-            image = cv2.imread(image_input)  # type: ignore
-            if image is None:
-                raise ValueError(f"이미지를 로드할 수 없습니다: {image_input}")
-        else:
-            # PIL Image 객체인 경우 (PDF 페이지)
-            image = image_input
+        with timer.stage("load"):
+            if isinstance(image_input, str):
+                # 이미지 파일 경로인 경우
+                image = cv2.imread(image_input)  # type: ignore
+                if image is None:
+                    raise ValueError(f"이미지를 로드할 수 없습니다: {image_input}")
+            else:
+                # PIL Image 객체인 경우 (PDF 페이지)
+                image = image_input
+
+        # 빈 페이지/방향/기울기 사전 판정
+        triage = None
+        artifact_source = image_input
+        if PAGE_TRIAGE_ENABLED:
+            with timer.stage("triage"):
+                triage = triage_page(image, OCR_BACKEND, LANGUAGE)
+            if triage['blank']:
+                return blank_page_result(triage, timer, image, output_dir, ocr_mode, page_info, file_prefix,
+                                         cache, cache_key, keep_result)
+            if needs_correction(triage):
+                with timer.stage("correct"):
+                    image = artifact_source = correct_page(image, triage)
+                if refine_data is not None:
+                    print(f"⚠️ {page_info} 방향/기울기를 보정하여 좌표가 PDF와 맞지 않으므로 다중 해상도 보정을 건너뜁니다.")
+                    refine_data = None
         
         # 이미지 품질 향상
-        enhanced_image = enhance_image_quality(image)
+        with timer.stage("enhance"):
+            enhanced_image = enhance_image_quality(image)
         
         # OCR 모드에 따라 처리
         ocr_data = None
+        refined_regions = 0
+        tiles = 0
+        second_pass = None
         if ocr_mode == "image_to_string":
-            result = ocr_with_string_mode(enhanced_image)
-            output_file = os.path.join(output_dir, f"{file_prefix}_string.txt")
-            save_string_result(result, output_file, page_info)
+            with timer.stage("ocr"):
+                result = ocr_with_string_mode(enhanced_image)
             
         elif ocr_mode == "image_to_data":
-            result = ocr_with_data_mode(enhanced_image)
+            with timer.stage("ocr"):
+                result, tiles = ocr_page_data(enhanced_image)
+            if MULTIPASS_ENABLED:
+                with timer.stage("second_pass"):
+                    result, second_pass = second_pass_ocr(result, enhanced_image, ocr_second_pass_region)
+            if refine_data is not None:
+                with timer.stage("refine"):
+                    result, refined_regions = refine_data(result)
             ocr_data = result  # 바운딩 박스 그리기용으로 저장
-            output_file = os.path.join(output_dir, f"{file_prefix}_data.txt")
-            save_data_result(result, output_file, page_info)
             
         else:
             raise ValueError(f"지원하지 않는 OCR 모드: {ocr_mode}")
+
+        with timer.stage("save_result"):
+            output_file = save_ocr_result(result, output_dir, ocr_mode, page_info, file_prefix)
+            if cache is not None and cache_key is not None:
+                cache.put(cache_key, {'ocr_mode': ocr_mode, 'result': result})
         
-        # 처리된 이미지 저장
-        processed_image_file = os.path.join(output_dir, f"{file_prefix}_processed.png")
-        cv2.imwrite(processed_image_file, enhanced_image)  # type: ignore
-        
-        # 원본 이미지와 바운딩 박스가 그려진 이미지 저장
-        original_image_file, boxed_image_file = save_original_and_boxed_images(
-            image_input, output_dir, file_prefix, ocr_data
-        )
+        # 처리된 이미지 저장 (부산물 저장 정책에 따라 백그라운드에서 인코딩)
+        # 백그라운드 인코딩 시간은 실행 지표의 artifact_* 단계로 따로 합산됨
+        with timer.stage("artifacts"):
+            processed_image_file = get_artifact_writer().submit(
+                "processed", enhanced_image, os.path.join(output_dir, f"{file_prefix}_processed")
+            )
+            
+            # 원본 이미지와 바운딩 박스가 그려진 이미지 저장
+            original_image_file, boxed_image_file = save_original_and_boxed_images(
+                artifact_source, output_dir, file_prefix, ocr_data
+            )
         
-        return {
+        page_result = {
             'success': True,
             'output_file': output_file,
             'processed_image': processed_image_file,
             'original_image': original_image_file,
             'boxed_image': boxed_image_file,
+            'refined_regions': refined_regions,
+            'tiles': tiles,
+            'second_pass': second_pass,
+            'page_triage': triage,
+            'metrics': page_metrics(timer, image),
             'page_info': page_info
         }
+        if keep_result:
+            page_result['ocr_result'] = result
+        return page_result
         
     except Exception as e:
         return {
             'success': False,
             'error': str(e),
+            'metrics': page_metrics(timer, image),
             'page_info': page_info
-        }
\ No newline at end of file
+        }
+
+
+def process_page_buffer(description, output_dir, ocr_mode, page_info="", file_prefix="image", refine_data=None):
+    """공유 페이지 버퍼에 붙어 복사 없이 OCR하는 함수 (프로세스 워커용)
+
+    description은 PageBuffer.describe()의 반환값이며, 버퍼(그레이스케일 또는 래스터화 때 BGR로 바꿔 둔 컬러)를
+    그대로 process_single_image에 넘깁니다. (전처리 단계에서 만드는 사본은 별도)
+    호출자가 반환 직후 버퍼를 재사용하므로 부산물 이미지 저장까지 끝낸 뒤 반환하며,
+    호출자가 캐시에 넣을 수 있도록 OCR 결과를 'ocr_result'에 담습니다.
+    """
+    page = AttachedPage(description)
+    try:
+        view = page.open()
+        result = process_single_image(view, output_dir, ocr_mode, page_info, file_prefix,
+                                      refine_data=refine_data, keep_result=True)
+        del view
+        get_artifact_writer().flush()
+        return result
+    finally:
+        page.close()
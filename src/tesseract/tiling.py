@@ -0,0 +1,160 @@
+"""타일 OCR 모듈
+
+1200 DPI 같은 큰 페이지는 한 장을 OCR하는 동안 워커 하나만 일하므로,
+페이지를 겹치는 타일로 나눠 병렬로 OCR한 뒤 image_to_data 결과를 페이지 좌표로 이어 붙입니다.
+
+- 타일 경계는 기본적으로 가로 띠(strip)이며, 목표 위치 근처에서 잉크가 가장 적은 행(여백)을 골라 자릅니다.
+  (TILE_COLUMNS > 1이면 세로 경계도 같은 방식으로 정함)
+- 타일마다 '담당 영역(core)'과 그 바깥으로 overlap/2씩 넓힌 '잘라낼 영역(crop)'이 있고,
+  겹친 부분의 중복 단어는 단어 중심이 담당 영역 안에 있는 타일의 것만 남깁니다.
+"""
+import math
+import threading
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from src.tesseract import ocr_data as od
+from src.tesseract.ocr_backend import TSV_COLUMNS
+from src.tesseract.page_triage import downsample_gray, ink_mask
+
+TILE_MIN_PIXELS = 24_000_000     # 이보다 큰 페이지만 타일로 나눔 (600 DPI A4/Letter 정도부터)
+TILE_TARGET_PIXELS = 12_000_000  # 타일 하나의 목표 픽셀 수
+TILE_MAX_TILES = 16
+TILE_COLUMNS = 1                 # 1이면 가로 띠로만 나눔 (단어가 세로 경계에 잘릴 일이 없음)
+TILE_OVERLAP_RATIO = 0.02        # 경계 양쪽으로 겹칠 폭 (페이지 높이/너비 대비, 한 줄 높이보다 커야 함)
+TILE_MIN_OVERLAP = 64            # 겹침 폭 하한 (픽셀)
+TILE_SPLIT_ON_WHITESPACE = True  # False면 고정 격자로 자름
+TILE_SEARCH_RATIO = 0.25         # 여백을 찾을 범위 (타일 길이 대비, 목표 경계 위아래)
+TILE_WORKERS = max(1, multiprocessing.cpu_count())
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_tile_executor(initializer=None):
+    """타일 OCR 전용 스레드 풀 (페이지 워커와 분리하여 페이지 워커가 타일을 기다려도 교착되지 않음)"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=TILE_WORKERS, initializer=initializer,
+                                           thread_name_prefix="ocr-tile")
+    return _executor
+
+
+def image_dimensions(image):
+    """(너비, 높이) (numpy 배열 또는 PIL 이미지)"""
+    if isinstance(image, np.ndarray):
+        return image.shape[1], image.shape[0]
+    return image.size
+
+
+def should_tile(image, min_pixels=TILE_MIN_PIXELS):
+    width, height = image_dimensions(image)
+    return width * height >= min_pixels
+
+
+def split_positions(profile, length, parts, whitespace=TILE_SPLIT_ON_WHITESPACE, search_ratio=TILE_SEARCH_RATIO):
+    """길이 length를 parts개로 나누는 경계 위치 목록 (양 끝 포함)
+
+    profile(축소 사본의 행/열별 잉크 픽셀 수)이 있으면 균등 경계 근처에서 잉크가 가장 적은 위치를 고릅니다.
+    """
+    step = length / parts
+    cuts = [0]
+    for k in range(1, parts):
+        ideal = int(round(k * step))
+        cut = ideal
+        if whitespace and profile is not None and profile.size:
+            scale = profile.size / length
+            lo = max(0, int((ideal - step * search_ratio) * scale))
+            hi = min(profile.size, int((ideal + step * search_ratio) * scale) + 1)
+            window = profile[lo:hi]
+            if window.size:
+                # 잉크가 가장 적은 위치 중 균등 경계에 가장 가까운 곳
+                candidates = np.flatnonzero(window == window.min()) + lo
+                best = candidates[np.argmin(np.abs(candidates - ideal * scale))]
+                cut = int(round((best + 0.5) / scale))
+        cuts.append(min(max(cut, cuts[-1] + 1), length - 1))
+    cuts.append(length)
+    return cuts
+
+
+def plan_tiles(image, rows=None, columns=TILE_COLUMNS, overlap_ratio=TILE_OVERLAP_RATIO,
+               whitespace=TILE_SPLIT_ON_WHITESPACE):
+    """페이지를 나눌 타일 목록 [{'crop': 박스, 'core': 박스}] (박스는 (left, top, right, bottom))"""
+    width, height = image_dimensions(image)
+    if rows is None:
+        total = min(TILE_MAX_TILES, max(2, math.ceil(width * height / TILE_TARGET_PIXELS)))
+        rows = max(1, math.ceil(total / columns))
+
+    row_profile = column_profile = None
+    if whitespace:
+        ink = ink_mask(downsample_gray(image), denoise=True)
+        row_profile, column_profile = ink.sum(axis=1), ink.sum(axis=0)
+
+    row_cuts = split_positions(row_profile, height, rows, whitespace)
+    column_cuts = split_positions(column_profile, width, columns, whitespace)
+    half_y = max(TILE_MIN_OVERLAP, int(height * overlap_ratio)) // 2
+    half_x = max(TILE_MIN_OVERLAP, int(width * overlap_ratio)) // 2
+
+    tiles = []
+    for top, bottom in zip(row_cuts, row_cuts[1:]):
+        for left, right in zip(column_cuts, column_cuts[1:]):
+            tiles.append({
+                'core': (left, top, right, bottom),
+                'crop': (max(0, left - half_x), max(0, top - half_y),
+                         min(width, right + half_x), min(height, bottom + half_y)),
+            })
+    return tiles
+
+
+def crop_tile(image, box):
+    left, top, right, bottom = box
+    if isinstance(image, np.ndarray):
+        return image[top:bottom, left:right]
+    return image.crop(box)
+
+
+def stitch_tiles(tiles, tile_datas, page_size):
+    """타일별 결과를 페이지 좌표로 옮기고 겹친 부분의 중복을 제거하여 하나의 결과로 합침
+
+    단어는 중심이 담당 영역(core) 안에 있을 때만 남기고, 블록/문단/줄 행은
+    남은 단어가 있는 것만 유지합니다. 블록 번호는 타일 순서대로 이어지게 다시 매깁니다.
+    """
+    width, height = page_size
+    page = od.empty_ocr_data()
+    for column, value in zip(TSV_COLUMNS, (1, 1, 0, 0, 0, 0, 0, 0, width, height, -1, "")):
+        page[column].append(value)
+
+    merged = [page]
+    block_offset = 0
+    for tile, data in zip(tiles, tile_datas):
+        placed = od.transform_boxes(data, offset=tile['crop'][:2])
+        keep_words = set()
+        for i in od.word_indices(placed):
+            left, top, right, bottom = od.row_box(placed, i)
+            if od.box_contains_point(tile['core'], (left + right) / 2, (top + bottom) / 2):
+                keep_words.add(i)
+
+        if not keep_words:
+            continue
+
+        selected = od.select_words_with_structure(placed, keep_words)
+        merged.append(od.offset_block_numbers(selected, block_offset))
+        block_offset += max(selected['block_num'])
+    return od.concat_ocr_data(*merged)
+
+
+def ocr_tiled(image, ocr_region, executor=None, tiles=None):
+    """페이지를 타일로 나눠 병렬 OCR한 뒤 이어 붙인 image_to_data 결과와 타일 수를 반환
+
+    Args:
+        image: 전처리된 페이지 이미지 (numpy 배열 또는 PIL 이미지)
+        ocr_region: 타일 이미지 -> image_to_data 결과 (타일 스레드에서 호출됨)
+        executor: 타일을 실행할 스레드 풀 (기본: get_tile_executor())
+        tiles: plan_tiles 결과 (기본: 페이지 크기로 계산)
+    """
+    tiles = tiles or plan_tiles(image)
+    executor = executor or get_tile_executor()
+    futures = [executor.submit(ocr_region, crop_tile(image, tile['crop'])) for tile in tiles]
+    tile_datas = [future.result() for future in futures]
+    return stitch_tiles(tiles, tile_datas, image_dimensions(image)), len(tiles)
@@ -0,0 +1,94 @@
+"""테스트용 로컬 Chat Completions 모의(mock) HTTP 서버
+
+표준 라이브러리 http.server만 사용합니다. 요청마다 script에서 다음 동작을 꺼내 응답하며,
+script가 비면 정상(200) 응답을 돌려줍니다.
+- ("status", 코드, retry_after): 오류 응답 (retry_after가 있으면 Retry-After 헤더)
+- ("sleep", 초): 그만큼 기다린 뒤 정상 응답 (타임아웃 테스트용)
+동시에 처리 중인 요청 수의 최댓값(max_in_flight)과 받은 요청 수(requests)를 기록합니다.
+"""
+import json
+import time
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+
+class MockLLMServer:
+    """with 문으로 시작/종료하는 모의 서버 (base_url을 AsyncLLMClient에 넘김)"""
+
+    def __init__(self, script=None, delay=0.0):
+        self.script = list(script or [])
+        self.delay = delay  # 정상 응답 전 기본 대기 시간(초)
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self._server.server_address[1]}/v1"
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+        return False
+
+    def next_action(self):
+        with self._lock:
+            self.requests += 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            return self.script.pop(0) if self.script else None
+
+    def done(self):
+        with self._lock:
+            self.in_flight -= 1
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def send_json(self, status, payload, headers=None):
+                data = json.dumps(payload).encode('utf-8')
+                try:
+                    self.send_response(status)
+                    self.send_header('Content-Type', 'application/json')
+                    self.send_header('Content-Length', str(len(data)))
+                    for name, value in (headers or {}).items():
+                        self.send_header(name, value)
+                    self.end_headers()
+                    self.wfile.write(data)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass  # 클라이언트가 타임아웃으로 연결을 끊은 경우
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+                action = server.next_action()
+                try:
+                    if action and action[0] == "status":
+                        _, status, retry_after = action
+                        headers = {'Retry-After': str(retry_after)} if retry_after is not None else None
+                        self.send_json(status, {'error': {'message': f"mock {status}"}}, headers)
+                        return
+                    time.sleep(action[1] if action and action[0] == "sleep" else server.delay)
+                    prompt = body['messages'][-1]['content']
+                    self.send_json(200, {
+                        'id': f"mock-{server.requests}", 'object': "chat.completion", 'created': 0,
+                        'model': body['model'],
+                        'choices': [{'index': 0, 'finish_reason': "stop",
+                                     'message': {'role': "assistant", 'content': f"echo: {prompt}"}}],
+                        'usage': {'prompt_tokens': 10, 'completion_tokens': 5, 'total_tokens': 15},
+                    })
+                finally:
+                    server.done()
+
+        return Handler
@@ -0,0 +1,84 @@
+"""AsyncLLMClient를 로컬 모의 서버로 검증하는 테스트 (재시도, 타임아웃, 동시 요청 수 제한)
+
+실행: python -m unittest discover -s tests -t .
+"""
+import os
+import sys
+import asyncio
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from openai import APITimeoutError, BadRequestError  # noqa: E402
+from src.llm import llm_client  # noqa: E402
+from src.llm.llm_client import AsyncLLMClient, RateLimiter  # noqa: E402
+from tests.mock_llm_server import MockLLMServer  # noqa: E402
+
+
+def make_client(server, **options):
+    options.setdefault('rate_limiter', RateLimiter(None, None))
+    return AsyncLLMClient(api_key="test", model="mock-model", system_prompt="system",
+                          base_url=server.base_url, **options)
+
+
+def run(client, coroutine):
+    async def main():
+        try:
+            return await coroutine
+        finally:
+            await client.close()
+    return asyncio.run(main())
+
+
+@mock.patch.object(llm_client, 'backoff_delay', lambda attempt: 0.01)
+class AsyncLLMClientTest(unittest.TestCase):
+
+    def test_retries_rate_limit_and_server_errors(self):
+        script = [("status", 429, 0.01), ("status", 503, None)]
+        with MockLLMServer(script) as server:
+            client = make_client(server, max_retries=3)
+            text, usage = run(client, client.complete("hello", return_usage=True))
+        self.assertEqual(text, "echo: hello")
+        self.assertEqual(usage, {'prompt_tokens': 10, 'completion_tokens': 5})
+        self.assertEqual(server.requests, 3)
+        self.assertEqual(client.usage['retries'], 2)
+        self.assertEqual(client.usage['requests'], 1)
+
+    def test_does_not_retry_client_errors(self):
+        with MockLLMServer([("status", 400, None)]) as server:
+            client = make_client(server, max_retries=3)
+            with self.assertRaises(BadRequestError):
+                run(client, client.complete("hello"))
+        self.assertEqual(server.requests, 1)
+
+    def test_gives_up_after_max_retries(self):
+        with MockLLMServer([("status", 500, None)] * 5) as server:
+            client = make_client(server, max_retries=2)
+            results = run(client, client.complete_many(["hello"]))
+        self.assertIsInstance(results[0], Exception)
+        self.assertEqual(server.requests, 3)
+
+    def test_retries_timeout(self):
+        with MockLLMServer([("sleep", 1.0)]) as server:
+            client = make_client(server, max_retries=1, timeout=0.2)
+            self.assertEqual(run(client, client.complete("hello")), "echo: hello")
+        self.assertEqual(client.usage['retries'], 1)
+
+    def test_timeout_raises_when_retries_exhausted(self):
+        with MockLLMServer([("sleep", 1.0)] * 2) as server:
+            client = make_client(server, max_retries=1, timeout=0.2)
+            with self.assertRaises(APITimeoutError):
+                run(client, client.complete("hello"))
+
+    def test_limits_concurrent_requests(self):
+        with MockLLMServer(delay=0.1) as server:
+            client = make_client(server, max_concurrency=3)
+            prompts = [f"p{i}" for i in range(12)]
+            results = run(client, client.complete_many(prompts))
+        self.assertEqual(results, [f"echo: {prompt}" for prompt in prompts])
+        self.assertEqual(server.max_in_flight, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+"""다중 패스 OCR 병합 테스트
+
+실행: python -m unittest discover -s tests -t .
+"""
+import os
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.tesseract import ocr_data as od  # noqa: E402
+from src.tesseract.ocr_backend import TSV_COLUMNS  # noqa: E402
+from src.tesseract.multipass import second_pass_ocr  # noqa: E402
+
+
+def make_data(words, width=600, height=200):
+    """[(block, par, line, left, top, width, height, conf, text), ...]로 image_to_data 형태 결과 생성"""
+    data = od.empty_ocr_data()
+
+    def add(*values):
+        for column, value in zip(TSV_COLUMNS, values):
+            data[column].append(value)
+
+    add(1, 1, 0, 0, 0, 0, 0, 0, width, height, -1, "")
+    seen = set()
+    for word_num, (block, par, line, left, top, w, h, conf, text) in enumerate(words, 1):
+        for level, key in ((2, (block, 0, 0)), (3, (block, par, 0)), (4, (block, par, line))):
+            if (level, key) not in seen:
+                seen.add((level, key))
+                add(level, 1, *key, 0, left, top, w, h, -1, "")
+        add(od.WORD_LEVEL, 1, block, par, line, word_num, left, top, w, h, conf, text)
+    return data
+
+
+def words_of(data):
+    return [(data['block_num'][i], data['text'][i]) for i in od.word_indices(data)]
+
+
+class SecondPassMergeTest(unittest.TestCase):
+
+    def setUp(self):
+        # 흰 페이지: 한글 판정은 모두 False, 신뢰도만으로 2차 패스 줄을 고름
+        self.image = np.full((200, 600), 255, dtype=np.uint8)
+
+    def test_confident_word_inside_merged_region_is_not_duplicated(self):
+        # 신뢰도 낮은 두 줄(블록 1) 사이에 신뢰도 높은 표 칸 C(블록 2)가 있어 병합 영역 안에 들어감
+        data = make_data([
+            (1, 1, 1, 10, 10, 60, 20, 30, "A1"),
+            (1, 1, 1, 300, 10, 60, 20, 35, "A2"),
+            (1, 1, 2, 10, 38, 60, 20, 30, "B1"),
+            (1, 1, 2, 300, 38, 60, 20, 35, "B2"),
+            (2, 1, 1, 160, 30, 40, 14, 95, "C"),
+        ])
+
+        def ocr_region(region, lang, psm):
+            # 영역 좌표 (left, top) = (5, 5): 줄 단어는 더 높은 신뢰도로, 표 칸은 C2로 다시 읽힘
+            return make_data([
+                (1, 1, 1, 5, 5, 60, 20, 90, "a1"),
+                (1, 1, 1, 295, 5, 60, 20, 90, "a2"),
+                (1, 1, 2, 155, 25, 40, 14, 90, "C2"),
+                (1, 1, 3, 5, 33, 60, 20, 90, "b1"),
+                (1, 1, 3, 295, 33, 60, 20, 90, "b2"),
+            ])
+
+        merged, stats = second_pass_ocr(data, self.image, ocr_region)
+        self.assertEqual(stats['second_pass_lines'], 2)
+        self.assertEqual(stats['regions'], 1)
+        self.assertEqual(words_of(merged), [(1, "a1"), (1, "a2"), (1, "b1"), (1, "b2"), (2, "C")])
+
+    def test_words_outside_flagged_lines_are_dropped(self):
+        data = make_data([
+            (1, 1, 1, 10, 10, 60, 20, 30, "A1"),
+            (2, 1, 1, 10, 150, 60, 20, 96, "Z"),
+        ])
+
+        def ocr_region(region, lang, psm):
+            # 영역 아래 가장자리에 걸친 잡음 단어는 줄 박스 밖이므로 추가하지 않음
+            return make_data([
+                (1, 1, 1, 4, 4, 60, 20, 88, "a1"),
+                (1, 1, 2, 100, 27, 20, 4, 70, "~"),
+            ])
+
+        merged, stats = second_pass_ocr(data, self.image, ocr_region)
+        self.assertEqual(words_of(merged), [(1, "a1"), (2, "Z")])
+        self.assertEqual(stats['changed_words'], 1)
+
+    def test_lower_confidence_second_pass_keeps_first_pass(self):
+        data = make_data([(1, 1, 1, 10, 10, 60, 20, 40, "A1")])
+
+        def ocr_region(region, lang, psm):
+            return make_data([(1, 1, 1, 4, 4, 60, 20, 20, "xx")])
+
+        merged, stats = second_pass_ocr(data, self.image, ocr_region)
+        self.assertIs(merged, data)
+        self.assertEqual(stats['changed_words'], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
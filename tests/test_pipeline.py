@@ -0,0 +1,114 @@
+"""OCR → LLM 추출 파이프라인 테스트 (가짜 OCR 결과와 주입한 가짜 LLM 사용)
+
+실행: python -m unittest discover -s tests -t .
+"""
+import os
+import re
+import sys
+import json
+import time
+import asyncio
+import threading
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import OCR_pipeline  # noqa: E402
+
+SCHEMA = {'invoice': {'number': None}, 'line_items': [{'name': None}], 'totals': {'total': None}}
+
+
+def make_items(page_count):
+    return [{'file_path': "doc.pdf", 'page_number': n, 'page_info': f"doc.pdf 페이지 {n}"}
+            for n in range(1, page_count + 1)]
+
+
+class PipelineTest(unittest.TestCase):
+    """OCR은 페이지별 지연/오류를 정한 가짜 함수, LLM은 프롬프트의 페이지 번호로 응답하는 가짜 함수"""
+
+    def setUp(self):
+        self.events = []
+        self._events_lock = threading.Lock()
+        self.ocr_delays = {}
+        self.ocr_errors = {}
+        self.llm_errors = set()
+        self.llm_delay = 0.0
+
+    def log(self, *event):
+        with self._events_lock:
+            self.events.append((time.perf_counter(), *event))
+
+    def fake_ocr_work_item(self, item, ocr_mode):
+        page_number = item['page_number']
+        self.log("ocr_start", page_number)
+        time.sleep(self.ocr_delays.get(page_number, 0.0))
+        self.log("ocr_end", page_number)
+        if page_number in self.ocr_errors:
+            raise self.ocr_errors[page_number]
+        return {'success': True, 'ocr_result': f"PAGE {page_number} 품목 item{page_number}",
+                'ocr_seconds': self.ocr_delays.get(page_number, 0.0), 'page_info': item['page_info']}
+
+    async def fake_llm(self, prompt):
+        page_number = int(re.search(r"PAGE (\d+)", prompt).group(1))
+        self.log("llm_start", page_number)
+        await asyncio.sleep(self.llm_delay)
+        if page_number in self.llm_errors:
+            raise RuntimeError(f"llm failed on {page_number}")
+        page = {'line_items': [{'name': f"item{page_number}"}], 'totals': {'total': page_number}}
+        if page_number == 1:
+            page['invoice'] = {'number': "INV-1"}
+        return json.dumps(page)
+
+    def run_pipeline(self, page_count, max_workers=3):
+        with mock.patch.object(OCR_pipeline, 'build_work_items', lambda files, mode: make_items(page_count)), \
+                mock.patch.object(OCR_pipeline, 'ocr_work_item', self.fake_ocr_work_item), \
+                mock.patch.object(OCR_pipeline, 'report_page_result', lambda *args: None), \
+                mock.patch.object(OCR_pipeline, 'warm_up_ocr_backend', lambda: None):
+            return OCR_pipeline.run_pipeline("doc.pdf", self.fake_llm, "image_to_string", max_workers, SCHEMA)
+
+    def time_of(self, kind, page_number):
+        return next(t for t, k, n in self.events if k == kind and n == page_number)
+
+    def test_llm_starts_while_later_pages_are_still_in_ocr(self):
+        self.ocr_delays = {1: 0.05, 2: 0.4, 3: 0.4}
+        self.llm_delay = 0.1
+        outcome = self.run_pipeline(3)
+        self.assertEqual(outcome['errors'], {})
+        self.assertLess(self.time_of("llm_start", 1), self.time_of("ocr_end", 2))
+        self.assertLess(self.time_of("llm_start", 1), self.time_of("ocr_end", 3))
+
+    def test_document_is_merged_in_page_order(self):
+        # OCR이 3 → 2 → 1 순서로 끝나도 문서는 페이지 순서로 합침
+        self.ocr_delays = {1: 0.3, 2: 0.15, 3: 0.0}
+        outcome = self.run_pipeline(3)
+        self.assertEqual(sorted(outcome['pages']), [1, 2, 3])
+        document = outcome['document']
+        self.assertEqual([item['name'] for item in document['line_items']], ["item1", "item2", "item3"])
+        self.assertEqual(document['totals'], {'total': 3})  # 합계는 마지막 페이지 값
+        self.assertEqual(document['invoice'], {'number': "INV-1"})
+
+    def test_ocr_and_llm_errors_are_isolated_per_page(self):
+        self.ocr_errors = {2: RuntimeError("rasterize failed")}
+        self.llm_errors = {3}
+        outcome = self.run_pipeline(4)
+        self.assertEqual(sorted(outcome['pages']), [1, 4])
+        self.assertEqual(outcome['errors'], {2: "rasterize failed", 3: "llm failed on 3"})
+        self.assertEqual([item['name'] for item in outcome['document']['line_items']], ["item1", "item4"])
+
+    def test_failed_page_result_skips_llm(self):
+        original = self.fake_ocr_work_item
+
+        def ocr_with_failed_page(item, ocr_mode):
+            if item['page_number'] == 1:
+                return {'success': False, 'error': "OCR 실패", 'ocr_seconds': 0.0, 'page_info': item['page_info']}
+            return original(item, ocr_mode)
+
+        self.fake_ocr_work_item = ocr_with_failed_page
+        outcome = self.run_pipeline(2)
+        self.assertEqual(outcome['errors'], {1: "OCR 실패"})
+        self.assertEqual([n for _, kind, n in self.events if kind == "llm_start"], [2])
+
+
+if __name__ == "__main__":
+    unittest.main()